@@ -15,6 +15,9 @@ from models.user import UserModel
 from models.compliance_task import ComplianceTaskModel
 from models.business import BusinessModel
 from models.license import LicenseModel
+from models.sent_reminder import SentReminderModel
+from models.archive import LicenseArchiveModel, ComplianceTaskArchiveModel
+from models.revoked_token import RevokedTokenModel
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
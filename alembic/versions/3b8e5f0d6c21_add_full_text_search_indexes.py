@@ -0,0 +1,71 @@
+"""Add full-text search indexes
+
+Revision ID: 3b8e5f0d6c21
+Revises: 7d2f91c3a8b4
+Create Date: 2026-10-18 13:40:02.511379
+
+GIN expression indexes over each model's text columns, backing GET /api/search.
+The expressions must stay identical to models.base.search_document or the planner
+will not use them. SQLite builds an FTS5 table at runtime instead (services/search.py).
+
+Run with `alembic -x concurrently=true upgrade head` on a live database to
+build the indexes with CREATE INDEX CONCURRENTLY instead of locking writes.
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import context, op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8e5f0d6c21'
+down_revision: Union[str, Sequence[str], None] = '7d2f91c3a8b4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, title column)
+SEARCH_INDEXES = [
+    ('ix_businesses_search', 'businesses', 'name'),
+    ('ix_licenses_search', 'licenses', 'name'),
+    ('ix_compliance_tasks_search', 'compliance_tasks', 'title'),
+]
+
+
+def _concurrently() -> bool:
+    return context.get_x_argument(as_dictionary=True).get('concurrently', '').lower() in ('1', 'true', 'yes')
+
+
+def _index_block():
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside the migration transaction
+    return op.get_context().autocommit_block() if _concurrently() else nullcontext()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    concurrently = _concurrently()
+    with _index_block():
+        for name, table, column in SEARCH_INDEXES:
+            op.create_index(
+                name, table,
+                [sa.text(f"to_tsvector('english', (coalesce({column}, '') || ' ') || coalesce(description, ''))")],
+                unique=False,
+                postgresql_using='gin',
+                postgresql_concurrently=concurrently,
+            )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'postgresql':
+        return
+
+    concurrently = _concurrently()
+    with _index_block():
+        for name, table, _ in reversed(SEARCH_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
@@ -0,0 +1,50 @@
+"""Add sent_reminders table and date indexes
+
+Revision ID: 5e1a7c9b2d40
+Revises: 3b8e5f0d6c21
+Create Date: 2026-10-18 15:02:47.906114
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1a7c9b2d40'
+down_revision: Union[str, Sequence[str], None] = '3b8e5f0d6c21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sent_reminders',
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('record_type', sa.String(length=20), nullable=False),
+    sa.Column('record_id', sa.Integer(), nullable=False),
+    sa.Column('window_days', sa.Integer(), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('user_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['user_id'], ['users.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('record_type', 'record_id', 'window_days', 'due_date', name='uq_sent_reminders_record_window')
+    )
+    op.create_index(op.f('ix_sent_reminders_id'), 'sent_reminders', ['id'], unique=False)
+    op.create_index('ix_sent_reminders_due_date', 'sent_reminders', ['due_date'], unique=False)
+
+    # The reminder scheduler scans each window across every business, so it needs the date leading the index
+    op.create_index('ix_licenses_expiry_date', 'licenses', ['expiry_date'], unique=False)
+    op.create_index('ix_compliance_tasks_due_date', 'compliance_tasks', ['due_date'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_compliance_tasks_due_date', table_name='compliance_tasks')
+    op.drop_index('ix_licenses_expiry_date', table_name='licenses')
+    op.drop_index('ix_sent_reminders_due_date', table_name='sent_reminders')
+    op.drop_index(op.f('ix_sent_reminders_id'), table_name='sent_reminders')
+    op.drop_table('sent_reminders')
@@ -0,0 +1,82 @@
+"""Add foreign key, filter and trigram indexes
+
+Revision ID: 7d2f91c3a8b4
+Revises: c4605537f605
+Create Date: 2026-10-18 09:12:40.218734
+
+Run with `alembic -x concurrently=true upgrade head` on a live database to
+build every index with CREATE INDEX CONCURRENTLY instead of locking writes.
+
+"""
+from contextlib import nullcontext
+from typing import Sequence, Union
+
+from alembic import context, op
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7d2f91c3a8b4'
+down_revision: Union[str, Sequence[str], None] = 'c4605537f605'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (index name, table, columns) - composite indexes matching the controllers' filters and page order
+BTREE_INDEXES = [
+    ('ix_businesses_user_id_created_at', 'businesses', ['user_id', 'created_at', 'id']),
+    ('ix_businesses_user_id_industry', 'businesses', ['user_id', 'industry']),
+    ('ix_licenses_business_id_expiry_date', 'licenses', ['business_id', 'expiry_date', 'id']),
+    ('ix_licenses_business_id_status_expiry_date', 'licenses', ['business_id', 'status', 'expiry_date']),
+    ('ix_compliance_tasks_business_id_due_date', 'compliance_tasks', ['business_id', 'due_date', 'id']),
+    ('ix_compliance_tasks_business_id_status_due_date', 'compliance_tasks', ['business_id', 'status', 'due_date']),
+]
+
+# (index name, table, column) - trigram indexes backing the ilike('%term%') filters
+TRIGRAM_INDEXES = [
+    ('ix_businesses_name_trgm', 'businesses', 'name'),
+    ('ix_licenses_name_trgm', 'licenses', 'name'),
+    ('ix_compliance_tasks_title_trgm', 'compliance_tasks', 'title'),
+]
+
+
+def _concurrently() -> bool:
+    return context.get_x_argument(as_dictionary=True).get('concurrently', '').lower() in ('1', 'true', 'yes')
+
+
+def _index_block():
+    # CREATE/DROP INDEX CONCURRENTLY cannot run inside the migration transaction
+    return op.get_context().autocommit_block() if _concurrently() else nullcontext()
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    concurrently = _concurrently()
+    is_postgres = op.get_context().dialect.name == 'postgresql'
+
+    with _index_block():
+        for name, table, columns in BTREE_INDEXES:
+            op.create_index(name, table, columns, unique=False, postgresql_concurrently=concurrently)
+
+        if is_postgres:
+            op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+            for name, table, column in TRIGRAM_INDEXES:
+                op.create_index(
+                    name, table, [column], unique=False,
+                    postgresql_using='gin',
+                    postgresql_ops={column: 'gin_trgm_ops'},
+                    postgresql_concurrently=concurrently,
+                )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    concurrently = _concurrently()
+    is_postgres = op.get_context().dialect.name == 'postgresql'
+
+    with _index_block():
+        if is_postgres:
+            for name, table, _ in reversed(TRIGRAM_INDEXES):
+                op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
+
+        for name, table, _ in reversed(BTREE_INDEXES):
+            op.drop_index(name, table_name=table, postgresql_concurrently=concurrently)
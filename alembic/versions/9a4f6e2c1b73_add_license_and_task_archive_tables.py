@@ -0,0 +1,67 @@
+"""Add license and compliance task archive tables
+
+Revision ID: 9a4f6e2c1b73
+Revises: 5e1a7c9b2d40
+Create Date: 2026-10-18 16:20:11.482093
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '9a4f6e2c1b73'
+down_revision: Union[str, Sequence[str], None] = '5e1a7c9b2d40'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _status_enum(*values, name):
+    # The live tables already created these types on Postgres, so the archives reuse them
+    return sa.Enum(*values, name=name).with_variant(postgresql.ENUM(*values, name=name, create_type=False), 'postgresql')
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('licenses_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('name', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=True),
+    sa.Column('issue_date', sa.DateTime(), nullable=False),
+    sa.Column('expiry_date', sa.DateTime(), nullable=False),
+    sa.Column('status', _status_enum('VALID', 'EXPIRED', 'PENDING_RENEWAL', name='license_status_enum'), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_licenses_archive_business_id_expiry_date', 'licenses_archive', ['business_id', 'expiry_date', 'id'], unique=False)
+
+    op.create_table('compliance_tasks_archive',
+    sa.Column('id', sa.Integer(), autoincrement=False, nullable=False),
+    sa.Column('title', sa.String(length=255), nullable=False),
+    sa.Column('description', sa.Text(), nullable=False),
+    sa.Column('due_date', sa.DateTime(), nullable=False),
+    sa.Column('submission_date', sa.DateTime(), nullable=True),
+    sa.Column('status', _status_enum('PENDING', 'SUBMITTED', 'LATE', name='task_status_enum'), nullable=False),
+    sa.Column('archived_at', sa.DateTime(), nullable=False),
+    sa.Column('business_id', sa.Integer(), nullable=False),
+    sa.Column('created_at', sa.DateTime(), nullable=True),
+    sa.Column('updated_at', sa.DateTime(), nullable=True),
+    sa.ForeignKeyConstraint(['business_id'], ['businesses.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_compliance_tasks_archive_business_id_due_date', 'compliance_tasks_archive', ['business_id', 'due_date', 'id'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_compliance_tasks_archive_business_id_due_date', table_name='compliance_tasks_archive')
+    op.drop_table('compliance_tasks_archive')
+    op.drop_index('ix_licenses_archive_business_id_expiry_date', table_name='licenses_archive')
+    op.drop_table('licenses_archive')
@@ -0,0 +1,66 @@
+"""Never reuse license and compliance task ids on SQLite
+
+Revision ID: d3c7a9e1f5b2
+Revises: b6e8d1f4a2c9
+Create Date: 2026-10-18 18:12:47.903415
+
+Archived rows keep their live id, so a live id must never be handed out twice.
+Postgres sequences never go back, but a SQLite INTEGER PRIMARY KEY without
+AUTOINCREMENT reuses the highest id once that row has been deleted, and the next
+archive run then collides with the archived copy. Rebuilds both tables with
+AUTOINCREMENT and starts their sequences past every archived id.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd3c7a9e1f5b2'
+down_revision: Union[str, Sequence[str], None] = 'b6e8d1f4a2c9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# (live table, archive table)
+ARCHIVED_TABLES = [
+    ('licenses', 'licenses_archive'),
+    ('compliance_tasks', 'compliance_tasks_archive'),
+]
+
+
+def _rebuild(table: str, autoincrement: bool):
+    # SQLite can't alter a primary key in place, so batch mode copies the table.
+    # The referenced tables aren't reflected: users is created by the app rather than by a migration.
+    with op.batch_alter_table(
+        table,
+        recreate='always',
+        table_kwargs={'sqlite_autoincrement': autoincrement},
+        reflect_kwargs={'resolve_fks': False},
+    ):
+        pass
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    if op.get_context().dialect.name != 'sqlite':
+        return
+
+    for table, archive in ARCHIVED_TABLES:
+        _rebuild(table, autoincrement=True)
+        # The copy leaves the sequence at the highest live id, which may be below an archived one
+        op.execute(f"DELETE FROM sqlite_sequence WHERE name = '{table}'")
+        op.execute(
+            f"INSERT INTO sqlite_sequence (name, seq) SELECT '{table}', max(coalesce(max(id), 0), "
+            f"(SELECT coalesce(max(id), 0) FROM {archive})) FROM {table}"
+        )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    if op.get_context().dialect.name != 'sqlite':
+        return
+
+    for table, _ in ARCHIVED_TABLES:
+        _rebuild(table, autoincrement=False)
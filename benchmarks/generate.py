@@ -0,0 +1,179 @@
+# benchmarks/generate.py
+#
+# Bulk-generates a synthetic dataset for load testing, using chunked Core inserts
+# instead of ORM objects so millions of rows stay fast and memory stays flat:
+#
+#     python -m benchmarks.generate --users 10000 --businesses 100000 --licenses 1000000 --tasks 1000000 --reset
+#
+# Every generated user logs in with BENCHMARK_PASSWORD; row contents repeat for a given --seed.
+
+import argparse
+import random
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import insert
+
+from database import engine
+from models.base import Base
+from models.user import UserModel, pwd_context
+from models.business import BusinessModel, IndustryEnum
+from models.license import LicenseModel, LicenseStatusEnum
+from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from models.sent_reminder import SentReminderModel
+from models.archive import LicenseArchiveModel, ComplianceTaskArchiveModel
+from models.revoked_token import RevokedTokenModel
+
+# Every table --reset drops and recreates
+SCHEMA_MODELS = [
+    UserModel, BusinessModel, LicenseModel, ComplianceTaskModel, SentReminderModel,
+    LicenseArchiveModel, ComplianceTaskArchiveModel, RevokedTokenModel,
+]
+
+BENCHMARK_PASSWORD = 'benchmark-password'
+
+LICENSE_NAMES = ['Commercial Registration', 'Health & Safety', 'Fire Safety', 'Food Handling', 'Trade',
+                 'Signage', 'Environmental', 'Import', 'Municipality', 'Professional Practice']
+TASK_TITLES = ['VAT return', 'Annual audit', 'Labour report', 'Insurance renewal', 'Fire drill',
+               'Social insurance filing', 'Waste disposal report', 'Board minutes', 'Data protection review']
+WORDS = ['quarterly', 'annual', 'renewal', 'inspection', 'submission', 'branch', 'warehouse', 'retail',
+         'kitchen', 'office', 'bahrain', 'manama', 'muharraq', 'riffa', 'permit', 'certificate']
+
+
+def _sentence(rng, words=6):
+    return ' '.join(rng.choice(WORDS) for _ in range(words)).capitalize()
+
+
+def _insert_in_chunks(connection, model, rows, chunk_size, returning_ids=False):
+    ids = []
+    chunk = []
+
+    def flush():
+        statement = insert(model)
+        if returning_ids:
+            result = connection.execute(statement.returning(model.id, sort_by_parameter_order=True), chunk)
+            ids.extend(result.scalars())
+        else:
+            connection.execute(statement, chunk)
+        chunk.clear()
+
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            flush()
+    if chunk:
+        flush()
+
+    return ids
+
+
+def _users(rng, count, password_hash, run_tag):
+    for index in range(count):
+        yield {
+            'username': f'bench_{run_tag}_{index}',
+            'email': f'bench_{run_tag}_{index}@example.com',
+            'password_hash': password_hash,
+        }
+
+
+def _businesses(rng, count, user_ids, run_tag, now):
+    industries = list(IndustryEnum)
+    for index in range(count):
+        yield {
+            'name': f'{rng.choice(WORDS).capitalize()} {rng.choice(WORDS).capitalize()} {index}',
+            'description': _sentence(rng, 10),
+            'cr_number': f'B{run_tag}-{index}',
+            'industry': rng.choice(industries),
+            'user_id': rng.choice(user_ids),
+            'created_at': now - timedelta(days=rng.randint(0, 1500)),
+        }
+
+
+def _licenses(rng, count, business_ids, now):
+    for _ in range(count):
+        issue_date = now - timedelta(days=rng.randint(0, 1500))
+        expiry_date = issue_date + timedelta(days=rng.choice((365, 730, 1095)))
+        yield {
+            'name': f'{rng.choice(LICENSE_NAMES)} License',
+            'description': _sentence(rng),
+            'issue_date': issue_date,
+            'expiry_date': expiry_date,
+            'status': LicenseStatusEnum.EXPIRED if expiry_date < now else rng.choice(
+                (LicenseStatusEnum.VALID, LicenseStatusEnum.VALID, LicenseStatusEnum.PENDING_RENEWAL)
+            ),
+            'business_id': rng.choice(business_ids),
+        }
+
+
+def _tasks(rng, count, business_ids, now):
+    for _ in range(count):
+        due_date = now + timedelta(days=rng.randint(-365, 365))
+        submitted = due_date < now and rng.random() < 0.7
+        yield {
+            'title': rng.choice(TASK_TITLES),
+            'description': _sentence(rng),
+            'due_date': due_date,
+            'submission_date': due_date - timedelta(days=rng.randint(0, 10)) if submitted else None,
+            'status': TaskStatusEnum.SUBMITTED if submitted else (
+                TaskStatusEnum.LATE if due_date < now else TaskStatusEnum.PENDING
+            ),
+            'business_id': rng.choice(business_ids),
+        }
+
+
+def generate(users: int, businesses: int, licenses: int, tasks: int, seed: int = 1, chunk_size: int = 5000) -> dict:
+    """Insert a synthetic dataset and return the number of rows created per table"""
+    rng = random.Random(seed)
+    now = datetime.now(timezone.utc).replace(microsecond=0)
+    run_tag = f'{seed}{int(time.time())}'  # Keeps usernames and CR numbers unique across runs
+
+    # One bcrypt hash shared by every user, so generating 10k users doesn't take 10k hashes
+    password_hash = pwd_context.hash(BENCHMARK_PASSWORD)
+
+    with engine.begin() as connection:
+        user_ids = _insert_in_chunks(
+            connection, UserModel, _users(rng, users, password_hash, run_tag), chunk_size, returning_ids=True
+        )
+        business_ids = _insert_in_chunks(
+            connection, BusinessModel, _businesses(rng, businesses, user_ids, run_tag, now), chunk_size, returning_ids=True
+        )
+        if business_ids:
+            _insert_in_chunks(connection, LicenseModel, _licenses(rng, licenses, business_ids, now), chunk_size)
+            _insert_in_chunks(connection, ComplianceTaskModel, _tasks(rng, tasks, business_ids, now), chunk_size)
+
+    return {
+        'users': len(user_ids),
+        'businesses': len(business_ids),
+        'licenses': licenses if business_ids else 0,
+        'compliance_tasks': tasks if business_ids else 0,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Bulk-generate a synthetic CompliTrack dataset for benchmarks')
+    parser.add_argument('--users', type=int, default=1000)
+    parser.add_argument('--businesses', type=int, default=10000)
+    parser.add_argument('--licenses', type=int, default=100000)
+    parser.add_argument('--tasks', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=1, help='Random seed, for repeatable datasets')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='Rows per INSERT batch')
+    parser.add_argument('--reset', action='store_true', help='Drop and recreate every table first')
+    args = parser.parse_args()
+
+    if args.reset:
+        print("Recreating database...")
+        tables = [model.__table__ for model in SCHEMA_MODELS]
+        Base.metadata.drop_all(bind=engine, tables=tables)
+        Base.metadata.create_all(bind=engine, tables=tables)
+
+    started = time.perf_counter()
+    counts = generate(args.users, args.businesses, args.licenses, args.tasks, args.seed, args.chunk_size)
+    elapsed = time.perf_counter() - started
+
+    for table, count in counts.items():
+        print(f"{table}: {count}")
+    print(f"Generated in {elapsed:.1f}s - every user's password is '{BENCHMARK_PASSWORD}'")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,369 @@
+# benchmarks/run.py
+#
+# Runs scripted workloads against every endpoint in-process (httpx over ASGI, no network)
+# and reports throughput and p50/p95/p99 latency per route as JSON, so runs can be
+# compared across commits:
+#
+#     python -m benchmarks.generate --reset
+#     python -m benchmarks.run --requests 200 --concurrency 8 --output bench.json
+#
+# Writes clean up after themselves, so repeated runs see the same dataset. Non-2xx
+# responses are reported as errors and left out of the throughput and latencies. Set
+# RESPONSE_CACHE_TTL=0 to measure the list endpoints without the response cache.
+
+import argparse
+import asyncio
+import json
+import random
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+
+import httpx
+from sqlalchemy import delete, func, select
+
+from database import async_engine
+from main import app
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel
+from models.revoked_token import RevokedTokenModel
+from dependencies.get_current_user import decode_token, invalidate_user
+from benchmarks.generate import BENCHMARK_PASSWORD
+
+
+class Actor:
+    """A sampled user with a token and one business, license and task they own"""
+
+    def __init__(self, user_id, username, business_id, license_id, task_id):
+        self.user_id = user_id
+        self.username = username
+        self.business_id = business_id
+        self.license_id = license_id
+        self.task_id = task_id
+        self.headers = {'Authorization': f'Bearer {self.new_token()}'}
+
+    @property
+    def key(self):
+        # A user owning several sampled businesses is several actors, each writing to its own business
+        return (self.username, self.business_id)
+
+    def new_token(self):
+        return UserModel(id=self.user_id, username=self.username).generate_token()
+
+
+async def _sample_actors(count: int, rng: random.Random) -> list:
+    async with async_engine.connect() as connection:
+        lowest_id, highest_id = (await connection.execute(
+            select(func.min(BusinessModel.id), func.max(BusinessModel.id))
+        )).one()
+        if lowest_id is None:
+            return []
+
+        candidate_ids = [rng.randint(lowest_id, highest_id) for _ in range(count * 4)]
+        first_license = select(LicenseModel.id).where(LicenseModel.business_id == BusinessModel.id).limit(1)
+        first_task = select(ComplianceTaskModel.id).where(ComplianceTaskModel.business_id == BusinessModel.id).limit(1)
+        result = await connection.execute(
+            select(
+                UserModel.id, UserModel.username, BusinessModel.id,
+                first_license.scalar_subquery(), first_task.scalar_subquery(),
+            )
+            .join(UserModel, UserModel.id == BusinessModel.user_id)
+            .where(BusinessModel.id.in_(candidate_ids))
+        )
+        rows = [row for row in result if row[3] is not None and row[4] is not None]
+
+    return [Actor(*row) for row in rows[:count]]
+
+
+def _percentile(sorted_values, percent):
+    # Nearest-rank percentile
+    index = max(0, int(round(percent / 100 * len(sorted_values))) - 1)
+    return sorted_values[min(index, len(sorted_values) - 1)]
+
+
+def _summarize(latencies, errors, elapsed):
+    # Only 2xx responses are timed; the rest are counted in errors and left out of the statistics
+    latencies = sorted(latencies)
+    if not latencies:
+        return {'requests': 0, 'errors': errors}
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput_rps': round(len(latencies) / elapsed, 2),
+        'mean_ms': round(sum(latencies) / len(latencies) * 1000, 3),
+        'p50_ms': round(_percentile(latencies, 50) * 1000, 3),
+        'p95_ms': round(_percentile(latencies, 95) * 1000, 3),
+        'p99_ms': round(_percentile(latencies, 99) * 1000, 3),
+    }
+
+
+class Workload:
+    """One route: how to build each request, and what to remember from its response"""
+
+    def __init__(self, method, route, build, record=None, requests=None):
+        self.method = method
+        self.route = route
+        self.build = build  # (actor, index, state) -> (url, request kwargs), or None to skip
+        self.record = record  # (actor, response json, state) -> None
+        self.requests = requests  # Overrides --requests, for deliberately slow routes
+
+    @property
+    def name(self):
+        return f'{self.method} {self.route}'
+
+
+def _pop(state, key, actor):
+    pool = state[key][actor.key]
+    return pool.pop() if pool else None
+
+
+def _push(key, extract=lambda body: [body['id']]):
+    def record(actor, body, state):
+        state[key][actor.key].extend(extract(body))
+    return record
+
+
+def _logout(actor, index, state):
+    # Each logout revokes a token of its own, so the actor's main token keeps working
+    token = actor.new_token()
+    state['revoked'][actor.key].append(decode_token(token)['jti'])
+    return '/api/auth/logout', {'headers': {'Authorization': f'Bearer {token}'}}
+
+
+def _then(pool, make_request):
+    # Requests that need an id created by an earlier workload, skipped once the pool runs dry
+    def build(actor, index, state):
+        row_id = _pop(state, pool, actor)
+        return make_request(actor, row_id, index) if row_id is not None else None
+    return build
+
+
+def _then_many(pool, count, make_request):
+    # Like _then, for batch requests that consume up to `count` ids at once
+    def build(actor, index, state):
+        row_ids = [row_id for row_id in (_pop(state, pool, actor) for _ in range(count)) if row_id is not None]
+        return make_request(actor, row_ids, index) if row_ids else None
+    return build
+
+
+def _license_body(index):
+    return {
+        'name': f'Benchmark License {index}', 'description': 'Created by benchmarks.run',
+        'issue_date': '2025-01-01T00:00:00Z', 'expiry_date': '2027-01-01T00:00:00Z', 'status': 'Valid',
+    }
+
+
+def _task_body(index):
+    return {'title': f'Benchmark Task {index}', 'description': 'Created by benchmarks.run', 'due_date': '2027-01-01T00:00:00Z'}
+
+
+def workloads(run_tag: str, auth_requests: int) -> list:
+    business_path = '/api/businesses/{business_id}'
+    return [
+        Workload('POST', '/api/auth/login', lambda actor, index, state: (
+            '/api/auth/login', {'json': {'username': actor.username, 'password': BENCHMARK_PASSWORD}}
+        ), requests=auth_requests),
+        Workload('POST', '/api/auth/register', lambda actor, index, state: (
+            '/api/auth/register',
+            {'json': {'username': f'bench_reg_{run_tag}_{index}', 'email': f'bench_reg_{run_tag}_{index}@example.com',
+                      'password': BENCHMARK_PASSWORD}},
+        ), record=_push('usernames', lambda body: [body['username']]), requests=auth_requests),
+        Workload('POST', '/api/auth/logout', _logout),
+        # Lists every user, so it runs as few times as the password-hashing routes
+        Workload('GET', '/api/auth/users', lambda actor, index, state: ('/api/auth/users', {}), requests=auth_requests),
+        Workload('GET', '/metrics', lambda actor, index, state: ('/metrics', {})),
+
+        Workload('GET', '/api/businesses', lambda actor, index, state: ('/api/businesses', {})),
+        Workload('GET', business_path, lambda actor, index, state: (f'/api/businesses/{actor.business_id}', {})),
+        Workload('GET', business_path + '/licenses', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/licenses', {}
+        )),
+        Workload('GET', business_path + '/licenses/{license_id}', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/licenses/{actor.license_id}', {}
+        )),
+        Workload('GET', business_path + '/compliance-tasks', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks', {}
+        )),
+        Workload('GET', business_path + '/compliance-tasks/{task_id}', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks/{actor.task_id}', {}
+        )),
+        Workload('GET', '/api/dashboard', lambda actor, index, state: ('/api/dashboard', {})),
+        Workload('GET', '/api/search', lambda actor, index, state: ('/api/search', {'params': {'q': 'renewal license'}})),
+        Workload('GET', '/api/timeline', lambda actor, index, state: ('/api/timeline', {})),
+        Workload('GET', '/api/export', lambda actor, index, state: ('/api/export', {})),
+
+        Workload('POST', '/api/businesses', lambda actor, index, state: (
+            '/api/businesses',
+            {'json': {'name': f'Benchmark Business {index}', 'cr_number': f'BR{run_tag}-{index}', 'industry': 'Retail'}},
+        ), record=_push('businesses')),
+        Workload('PUT', business_path, _then('businesses', lambda actor, business_id, index: (
+            f'/api/businesses/{business_id}', {'json': {'description': f'Updated {index}'}}
+        )), record=_push('businesses')),
+
+        Workload('POST', business_path + '/licenses', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/licenses', {'json': _license_body(index)}
+        ), record=_push('licenses')),
+        Workload('POST', business_path + '/licenses:batch', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/licenses:batch', {'json': {'items': [_license_body(index)] * 10}}
+        ), record=_push('licenses', lambda body: [row['id'] for row in body])),
+        Workload('PUT', business_path + '/licenses/{license_id}', _then('licenses', lambda actor, license_id, index: (
+            f'/api/businesses/{actor.business_id}/licenses/{license_id}', {'json': _license_body(index)}
+        )), record=_push('licenses')),
+        Workload('DELETE', business_path + '/licenses/{license_id}', _then('licenses', lambda actor, license_id, index: (
+            f'/api/businesses/{actor.business_id}/licenses/{license_id}', {}
+        ))),
+        Workload('POST', business_path + '/licenses:batch-delete', _then_many('licenses', 10, lambda actor, license_ids, index: (
+            f'/api/businesses/{actor.business_id}/licenses:batch-delete', {'json': {'ids': license_ids}}
+        ))),
+
+        Workload('POST', business_path + '/compliance-tasks', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks', {'json': _task_body(index)}
+        ), record=_push('tasks')),
+        Workload('POST', business_path + '/compliance-tasks:batch', lambda actor, index, state: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks:batch', {'json': {'items': [_task_body(index)] * 10}}
+        ), record=_push('tasks', lambda body: [row['id'] for row in body])),
+        Workload('PUT', business_path + '/compliance-tasks/{task_id}', _then('tasks', lambda actor, task_id, index: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks/{task_id}', {'json': _task_body(index)}
+        )), record=_push('tasks')),
+        Workload('POST', '/api/compliance-tasks:batch-status', _then_many('tasks', 10, lambda actor, task_ids, index: (
+            '/api/compliance-tasks:batch-status', {'json': {'status': 'Submitted', 'ids': task_ids}}
+        )), record=_push('tasks', lambda body: [row['id'] for row in body])),
+        Workload('DELETE', business_path + '/compliance-tasks/{task_id}', _then('tasks', lambda actor, task_id, index: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks/{task_id}', {}
+        ))),
+        Workload('POST', business_path + '/compliance-tasks:batch-delete', _then_many('tasks', 10, lambda actor, task_ids, index: (
+            f'/api/businesses/{actor.business_id}/compliance-tasks:batch-delete', {'json': {'ids': task_ids}}
+        ))),
+
+        Workload('DELETE', business_path, _then('businesses', lambda actor, business_id, index: (
+            f'/api/businesses/{business_id}', {}
+        ))),
+    ]
+
+
+async def _run_workload(client, workload, actors, requests, concurrency, state):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one(index):
+        nonlocal errors
+        actor = actors[index % len(actors)]
+        request = workload.build(actor, index, state)
+        if request is None:
+            return
+        url, kwargs = request
+        headers = {**actor.headers, **kwargs.pop('headers', {})}
+        async with semaphore:
+            started = time.perf_counter()
+            response = await client.request(workload.method, url, headers=headers, **kwargs)
+            elapsed = time.perf_counter() - started
+        if not response.is_success:
+            errors += 1
+            return
+        latencies.append(elapsed)
+        if workload.record:
+            workload.record(actor, response.json(), state)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(index) for index in range(requests)))
+    return _summarize(latencies, errors, time.perf_counter() - started)
+
+
+async def _cleanup(state):
+    # Rows a write workload created and no later workload deleted
+    async with async_engine.begin() as connection:
+        for key, column in (('licenses', LicenseModel.id), ('tasks', ComplianceTaskModel.id),
+                            ('businesses', BusinessModel.id), ('usernames', UserModel.username),
+                            ('revoked', RevokedTokenModel.jti)):
+            keys = [value for pool in state[key].values() for value in pool]
+            for start in range(0, len(keys), 1000):
+                statement = delete(column.table).where(column.in_(keys[start:start + 1000]))
+                if column.table is UserModel.__table__:
+                    # A Core delete skips the ORM after_delete hook that forgets deleted users' tokens
+                    deleted_ids = (await connection.execute(statement.returning(UserModel.id))).scalars().all()
+                    for user_id in deleted_ids:
+                        invalidate_user(user_id)
+                else:
+                    await connection.execute(statement)
+
+
+async def _dataset_counts():
+    async with async_engine.connect() as connection:
+        counts = {}
+        for model in (UserModel, BusinessModel, LicenseModel, ComplianceTaskModel):
+            counts[model.__tablename__] = (await connection.execute(select(func.count()).select_from(model))).scalar_one()
+        return counts
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(requests: int, concurrency: int, actor_count: int, auth_requests: int, seed: int, only=None) -> dict:
+    rng = random.Random(seed)
+    actors = await _sample_actors(actor_count, rng)
+    if not actors:
+        raise SystemExit('No businesses with licenses and tasks found - run python -m benchmarks.generate first')
+
+    state = defaultdict(lambda: defaultdict(list))
+    routes = {}
+    try:
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url='http://benchmark', timeout=None) as client:
+            for workload in workloads(f'{seed}{int(time.time())}', auth_requests):
+                if only and only not in workload.name:
+                    continue
+                routes[workload.name] = await _run_workload(
+                    client, workload, actors, workload.requests or requests, concurrency, state
+                )
+                print(f"{workload.name}: {routes[workload.name]}", file=sys.stderr)
+    finally:
+        await _cleanup(state)
+
+    return {
+        'generated_at': datetime.now(timezone.utc).isoformat(),
+        'git_commit': _git_commit(),
+        'database': async_engine.dialect.name,
+        'dataset': await _dataset_counts(),
+        'settings': {'requests': requests, 'concurrency': concurrency, 'actors': len(actors), 'seed': seed},
+        'routes': routes,
+    }
+
+
+async def _run_once(args) -> dict:
+    try:
+        return await run(args.requests, args.concurrency, args.actors, args.auth_requests, args.seed, args.only)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark every endpoint in-process and report latency per route')
+    parser.add_argument('--requests', type=int, default=200, help='Requests per route')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requests in flight at once')
+    parser.add_argument('--actors', type=int, default=50, help='Distinct users the requests are spread over')
+    parser.add_argument('--auth-requests', type=int, default=20, help='Requests for login/register, which hash passwords')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--only', help='Only run routes whose "METHOD /path" contains this text')
+    parser.add_argument('--output', help='Write the JSON report here instead of stdout')
+    args = parser.parse_args()
+
+    report = asyncio.run(_run_once(args))
+    body = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w') as file:
+            file.write(body + '\n')
+    else:
+        print(body)
+
+
+if __name__ == "__main__":
+    main()
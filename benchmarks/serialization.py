@@ -0,0 +1,114 @@
+# benchmarks/serialization.py
+#
+# Compares the two ways of producing a license/task list page from the same rows:
+#
+#   orm  - ORM instances validated through the Page[...] schema, then JSONResponse (the previous path)
+#   rows - column tuples encoded straight to JSON by the endpoint's RowSerializer (the current path)
+#
+#     python -m benchmarks.serialization --limit 200 --iterations 200
+#
+# Both include running the query, so the numbers are what a list request pays after its ownership check.
+
+import argparse
+import asyncio
+import json
+import time
+
+from fastapi.responses import JSONResponse
+from sqlalchemy import func, select
+
+from database import AsyncSessionLocal, async_engine
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel
+from serializers.license import LicenseSchema
+from serializers.compliance_task import ComplianceTaskSchema
+from serializers.pagination import Page
+from controllers.licenses import license_rows
+from controllers.compliance_tasks import task_rows
+
+# (name, model, schema, row serializer, sort column)
+TARGETS = [
+    ('licenses', LicenseModel, LicenseSchema, license_rows, LicenseModel.expiry_date),
+    ('compliance_tasks', ComplianceTaskModel, ComplianceTaskSchema, task_rows, ComplianceTaskModel.due_date),
+]
+
+
+async def _busiest_business(model) -> int:
+    # The business with the most rows, so a page is as full as the limit allows
+    async with AsyncSessionLocal() as db:
+        result = await db.execute(
+            select(model.business_id).group_by(model.business_id).order_by(func.count().desc()).limit(1)
+        )
+        return result.scalar()
+
+
+async def _orm_page(model, schema, sort_column, business_id, limit) -> bytes:
+    async with AsyncSessionLocal() as db:
+        rows = (await db.scalars(
+            select(model).filter(model.business_id == business_id).order_by(sort_column, model.id).limit(limit)
+        )).all()
+    page = {'items': rows, 'next_cursor': None, 'total_estimate': None}
+    body = Page[schema].model_validate(page, from_attributes=True).model_dump(mode='json')
+    return JSONResponse(content=body).body
+
+
+async def _row_page(model, serializer, sort_column, business_id, limit) -> bytes:
+    async with AsyncSessionLocal() as db:
+        rows = (await db.execute(
+            serializer.select().filter(model.business_id == business_id).order_by(sort_column, model.id).limit(limit)
+        )).all()
+    return serializer.encode_page({'items': rows, 'next_cursor': None, 'total_estimate': None})
+
+
+async def _measure(make_page, iterations: int) -> dict:
+    await make_page()  # Warm up statement caches and the connection pool
+    started = time.perf_counter()
+    for _ in range(iterations):
+        await make_page()
+    elapsed = time.perf_counter() - started
+    return {'pages_per_second': round(iterations / elapsed, 1), 'mean_ms': round(elapsed / iterations * 1000, 3)}
+
+
+async def run(limit: int, iterations: int) -> dict:
+    report = {'database': async_engine.dialect.name, 'limit': limit, 'iterations': iterations, 'targets': {}}
+
+    for name, model, schema, serializer, sort_column in TARGETS:
+        business_id = await _busiest_business(model)
+        if business_id is None:
+            raise SystemExit('No rows found - run python -m benchmarks.generate first')
+
+        orm_body = await _orm_page(model, schema, sort_column, business_id, limit)
+        row_body = await _row_page(model, serializer, sort_column, business_id, limit)
+        # Both paths must produce the same document, or the comparison means nothing
+        assert json.loads(orm_body) == json.loads(row_body), f'{name}: fast path output differs'
+
+        orm = await _measure(lambda: _orm_page(model, schema, sort_column, business_id, limit), iterations)
+        rows = await _measure(lambda: _row_page(model, serializer, sort_column, business_id, limit), iterations)
+        report['targets'][name] = {
+            'rows_per_page': len(json.loads(row_body)['items']),
+            'orm': orm,
+            'rows': rows,
+            'speedup': round(rows['pages_per_second'] / orm['pages_per_second'], 2),
+        }
+
+    return report
+
+
+async def _run_once(args) -> dict:
+    try:
+        return await run(args.limit, args.iterations)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare ORM and row-tuple serialization of list pages')
+    parser.add_argument('--limit', type=int, default=200, help='Rows per page (the API allows up to 200)')
+    parser.add_argument('--iterations', type=int, default=200, help='Pages built per path')
+    args = parser.parse_args()
+
+    print(json.dumps(asyncio.run(_run_once(args)), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -4,4 +4,67 @@ from dotenv import load_dotenv
 load_dotenv()
 
 db_URI = os.getenv('DATABASE_URL')
-secret = os.getenv('JWT_SECRET')
\ No newline at end of file
+secret = os.getenv('JWT_SECRET')
+
+# Async driver URL for the request path; derived from DATABASE_URL unless set explicitly
+ASYNC_DRIVERS = {
+    'postgresql': 'postgresql+asyncpg',
+    'postgresql+psycopg2': 'postgresql+asyncpg',
+    'postgres': 'postgresql+asyncpg',
+    'sqlite': 'sqlite+aiosqlite',
+}
+
+def to_async_uri(uri):
+    if not uri or '://' not in uri:
+        return uri
+    scheme, rest = uri.split('://', 1)
+    return f"{ASYNC_DRIVERS.get(scheme, scheme)}://{rest}"
+
+async_db_URI = os.getenv('ASYNC_DATABASE_URL') or to_async_uri(db_URI)
+
+# Build the current user from token claims plus a short-lived existence cache instead of a DB lookup per request
+auth_stateless = os.getenv('AUTH_STATELESS', 'false').lower() in ('1', 'true', 'yes')
+auth_cache_ttl = int(os.getenv('AUTH_CACHE_TTL', '60'))  # Seconds a cached user lookup stays valid
+auth_cache_size = int(os.getenv('AUTH_CACHE_SIZE', '10000'))
+
+# Logged-out tokens: how often each node pulls new revocations into memory (0 disables), and how far back each pull re-reads
+token_revocation_refresh = int(os.getenv('TOKEN_REVOCATION_REFRESH', '5'))  # Seconds
+token_revocation_overlap = int(os.getenv('TOKEN_REVOCATION_OVERLAP', '60'))  # Seconds
+
+# Password hashing: bcrypt cost and the bounded pool that runs it off the event loop
+bcrypt_rounds = int(os.getenv('BCRYPT_ROUNDS', '12'))
+password_hash_workers = int(os.getenv('PASSWORD_HASH_WORKERS', str(os.cpu_count() or 2)))
+password_hash_queue_size = int(os.getenv('PASSWORD_HASH_QUEUE_SIZE', '32'))  # Waiting hashes allowed before answering 503
+
+# Background sweeper that expires licenses and marks overdue tasks late (0 disables the in-process schedule)
+status_sweep_interval = int(os.getenv('STATUS_SWEEP_INTERVAL', '900'))
+status_sweep_chunk_size = int(os.getenv('STATUS_SWEEP_CHUNK_SIZE', '5000'))  # Rows per id range, keeps each UPDATE's locks short
+
+# Per-user cache of list responses (a TTL of 0 disables it)
+response_cache_ttl = int(os.getenv('RESPONSE_CACHE_TTL', '30'))
+response_cache_size = int(os.getenv('RESPONSE_CACHE_SIZE', '5000'))
+response_cache_backend = os.getenv('RESPONSE_CACHE_BACKEND')  # Optional "module:factory" returning a custom backend
+
+# Reminder digests sent ahead of license expiries and task due dates (an interval of 0 disables the in-process schedule)
+reminder_interval = int(os.getenv('REMINDER_INTERVAL', '3600'))
+reminder_windows = sorted(int(days) for days in os.getenv('REMINDER_WINDOWS', '30,7,1').split(','))  # Days before the date
+reminder_sink = os.getenv('REMINDER_SINK', 'log')  # "log", "file", or "module:factory" returning a custom sink
+reminder_sink_path = os.getenv('REMINDER_SINK_PATH', 'reminders.ndjson')  # Used by the file sink
+
+# Moves expired licenses and submitted tasks older than the horizon into *_archive tables (an interval of 0 disables the in-process schedule)
+archive_interval = int(os.getenv('ARCHIVE_INTERVAL', '86400'))
+archive_after_days = int(os.getenv('ARCHIVE_AFTER_DAYS', '365'))  # Days past expiry_date / due_date before a row is archived
+archive_chunk_size = int(os.getenv('ARCHIVE_CHUNK_SIZE', '5000'))  # Rows per id range, keeps each move's locks short
+
+# Connection pool for server databases (SQLite keeps SQLAlchemy's default pool)
+db_pool_size = int(os.getenv('DB_POOL_SIZE', '5'))
+db_max_overflow = int(os.getenv('DB_MAX_OVERFLOW', '10'))
+db_pool_timeout = int(os.getenv('DB_POOL_TIMEOUT', '30'))  # Seconds to wait for a free connection before erroring
+db_pool_recycle = int(os.getenv('DB_POOL_RECYCLE', '1800'))  # Replace connections older than this many seconds (-1 never)
+db_pool_pre_ping = os.getenv('DB_POOL_PRE_PING', 'true').lower() in ('1', 'true', 'yes')
+db_statement_timeout = int(os.getenv('DB_STATEMENT_TIMEOUT', '0'))  # Milliseconds, Postgres only (0 disables)
+
+# Optional read replica for GET endpoints; a user's reads stay on the primary for a while after they write
+replica_db_URI = os.getenv('DATABASE_REPLICA_URL')
+async_replica_db_URI = os.getenv('ASYNC_DATABASE_REPLICA_URL') or to_async_uri(replica_db_URI)
+replica_read_after_write = int(os.getenv('REPLICA_READ_AFTER_WRITE', '5'))  # Seconds, tracked per worker process
@@ -1,20 +1,49 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
-from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import joinedload, selectinload
+from typing import Optional
 
 from models.business import BusinessModel, IndustryEnum
 from models.user import UserModel
-from serializers.business import BusinessCreate, BusinessUpdate, BusinessSchema
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel
+from serializers.business import BusinessCreate, BusinessUpdate, BusinessSchema, BusinessFieldsetSchema
+from serializers.pagination import Page
 from database import get_db
 from dependencies.get_current_user import get_current_user
+from dependencies.get_read_db import get_read_db, get_current_read_user
+from dependencies.pagination import PageParams, paginate
+from dependencies.conditional import collection_version, conditional_response
+from dependencies.fieldsets import BusinessFieldset
+from services.response_cache import response_cache, cached_response
+from services.query_budget import query_budget
 
 # Create the router
 router = APIRouter()
 
+# BusinessSchema nests the owner and licenses, and lazy loads can't run on the event loop
+def select_business_with_relations():
+    return select(BusinessModel).options(
+        joinedload(BusinessModel.user),
+        selectinload(BusinessModel.licenses)  # A collection join would multiply rows and break LIMIT
+    )
+
+def version_sources(businesses, fieldset: BusinessFieldset):
+    # The businesses plus whichever collections are nested in the response, for versioning together
+    sources = [(businesses, BusinessModel)]
+    business_ids = businesses.with_only_columns(BusinessModel.id)
+    if 'licenses' in fieldset.expand:
+        sources.append((select(LicenseModel).filter(LicenseModel.business_id.in_(business_ids)), LicenseModel))
+    if 'compliance_tasks' in fieldset.expand:
+        sources.append((select(ComplianceTaskModel).filter(ComplianceTaskModel.business_id.in_(business_ids)), ComplianceTaskModel))
+    return sources
+
 @router.post('/businesses', response_model=BusinessSchema, status_code=status.HTTP_201_CREATED)
-def create_business(
+@query_budget(5)
+async def create_business(
     business: BusinessCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     # Create new business instance
@@ -28,9 +57,10 @@ def create_business(
     )
 
     # Check if business with the same CR number exists
-    existing_business = db.query(BusinessModel).filter(
+    result = await db.execute(select(BusinessModel).filter(
         BusinessModel.cr_number == business.cr_number
-    ).first()
+    ))
+    existing_business = result.scalars().first()
 
     if existing_business:
         raise HTTPException(
@@ -40,102 +70,160 @@ def create_business(
 
     # Add to database
     db.add(new_business)
-    db.commit()
-    db.refresh(new_business) # Refresh to get the generated id and created_at
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    # Reload with the owner and licenses so the response can be serialized
+    result = await db.execute(
+        select_business_with_relations()
+        .filter(BusinessModel.id == new_business.id)
+        .execution_options(populate_existing=True)
+    )
 
-    return new_business
+    return result.scalars().one()
 
-@router.get('/businesses', response_model=List[BusinessSchema])
-def get_businesses(
+@router.get('/businesses', response_model=Page[BusinessFieldsetSchema], response_model_exclude_unset=True)
+@query_budget(6)
+async def get_businesses(
+    request: Request,
+    response: Response,
     name: Optional[str] = Query(None, description='Filter by business name'),
     industry: Optional[IndustryEnum] = Query(None, description='Filter by business industry'),
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    page: PageParams = Depends(),
+    fieldset: BusinessFieldset = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
     ):
-    filtered_businesses = db.query(BusinessModel).options(
-        joinedload(BusinessModel.user),
-        joinedload(BusinessModel.licenses)
-    ).filter(BusinessModel.user_id == current_user.id)
+    cache_key = response_cache.key_for(current_user.id, request)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return cached_response(request, cached)
+
+    filtered_businesses = select(BusinessModel).filter(BusinessModel.user_id == current_user.id)
 
     if name:
         filtered_businesses = filtered_businesses.filter(BusinessModel.name.ilike(f"%{name}%"))
     if industry:
         filtered_businesses = filtered_businesses.filter(BusinessModel.industry == industry)
 
-    all_businesses = filtered_businesses.all()
+    # Answer 304 from an aggregate over the businesses and their nested collections before loading any rows
+    etag, last_modified = await collection_version(db, request, *version_sources(filtered_businesses, fieldset))
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+
+    # Page ordered by (created_at, id), loading only the requested columns and relations
+    businesses_page = await paginate(
+        db, filtered_businesses.options(*fieldset.loader_options()), page, BusinessModel.created_at, BusinessModel.id
+    )
+
+    body = {**businesses_page, 'items': [fieldset.serialize(business) for business in businesses_page['items']]}
+    response_cache.set(cache_key, body, etag, last_modified)
 
-    return all_businesses
+    return body
 
-@router.get('/businesses/{business_id}', response_model=BusinessSchema)
-def get_single_business(
+@router.get('/businesses/{business_id}', response_model=BusinessFieldsetSchema, response_model_exclude_unset=True)
+@query_budget(5)
+async def get_single_business(
     business_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    request: Request,
+    response: Response,
+    fieldset: BusinessFieldset = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
 ):
-    business = db.query(BusinessModel).filter(
+    owned_business = select(BusinessModel).filter(
         BusinessModel.id == business_id,
         BusinessModel.user_id == current_user.id
-        ).first()
+        )
+
+    # Answer 304 from an aggregate before loading the business and whatever it nests,
+    # which also tells us whether the caller owns a business with this id
+    version = await collection_version(db, request, *version_sources(owned_business, fieldset), require_rows=True)
+    if version is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Business not found'
+        )
+
+    not_modified = conditional_response(request, response, *version)
+    if not_modified:
+        return not_modified
+
+    result = await db.execute(owned_business.options(*fieldset.loader_options()))
+    business = result.scalars().first()
 
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Business not found'
         )
-    
-    return business
+
+    return fieldset.serialize(business)
 
 @router.put('/businesses/{business_id}', response_model=BusinessSchema)
-def update_business(
+@query_budget(5)
+async def update_business(
     business_id: int,
     business_update: BusinessUpdate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    business = db.query(BusinessModel).filter(BusinessModel.id == business_id).first()
+    result = await db.execute(select(BusinessModel).filter(BusinessModel.id == business_id))
+    business = result.scalars().first()
 
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Business not found'
         )
-    
+
     if business.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail='Not authorized to update this business'
         )
-    
-    update_data = business_update.dict(exclude_unset=True)
+
+    update_data = business_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(business, key, value)
-    
-    db.commit()
-    db.refresh(business)
 
-    return business
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    # Reload with the owner and licenses so the response can be serialized
+    result = await db.execute(
+        select_business_with_relations()
+        .filter(BusinessModel.id == business_id)
+        .execution_options(populate_existing=True)
+    )
+
+    return result.scalars().one()
 
 @router.delete('/businesses/{business_id}')
-def delete_business(
+@query_budget(3)  # Licenses and tasks go with the ON DELETE CASCADE foreign keys, not row by row
+async def delete_business(
     business_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    business = db.query(BusinessModel).filter(BusinessModel.id == business_id).first()
+    result = await db.execute(select(BusinessModel).filter(BusinessModel.id == business_id))
+    business = result.scalars().first()
 
     if not business:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail='Business not found'
         )
-    
+
     if business.user_id != current_user.id:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN,
             detail='Not authorized to delete this business'
         )
-    
-    db.delete(business)
-    db.commit()
 
-    return {"message": f"Business with id {business_id} has been deleted successfully"}
\ No newline at end of file
+    await db.delete(business)
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    return {"message": f"Business with id {business_id} has been deleted successfully"}
@@ -1,37 +1,40 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import delete, func, insert, literal, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from datetime import datetime
+from datetime import datetime, timezone
 
 from models.user import UserModel
 from models.business import BusinessModel
 from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
-from serializers.compliance_task import ComplianceTaskCreate, ComplianceTaskUpdate, ComplianceTaskSchema
+from models.archive import ComplianceTaskArchiveModel
+from serializers.compliance_task import ComplianceTaskCreate, ComplianceTaskBatchCreate, ComplianceTaskBatchDelete, ComplianceTaskStatusTransition, ComplianceTaskUpdate, ComplianceTaskSchema
+from serializers.pagination import Page
+from serializers.rows import RowSerializer
 from database import get_db
 from dependencies.get_current_user import get_current_user
+from dependencies.get_read_db import get_read_db, get_current_read_user
+from dependencies.business_scope import get_owned_business_id, get_owned_compliance_task, get_readable_business_id, get_readable_compliance_task
+from dependencies.pagination import PageParams, paginate
+from dependencies.conditional import collection_version, conditional_response, row_version
+from services.response_cache import response_cache, cached_response, encoded_response
+from services.query_budget import query_budget
+from services.archive import with_archive
 
 router=APIRouter()
 
+# The list endpoint encodes column tuples straight to JSON instead of hydrating ORM instances
+task_rows = RowSerializer(ComplianceTaskModel, ComplianceTaskSchema)
+
 @router.post('/businesses/{business_id}/compliance-tasks', response_model=ComplianceTaskSchema, status_code=status.HTTP_201_CREATED)
-def create_compliance_task(
-    business_id: int,
+@query_budget(4)
+async def create_compliance_task(
     task: ComplianceTaskCreate,
-    db: Session = Depends(get_db),
+    business_id: int = Depends(get_owned_business_id),  # Checks the business exists and belongs to the user
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     
-    # Check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
-    
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
-        )
-    
     # Create new task for the business
     new_task = ComplianceTaskModel(
         title=task.title,
@@ -43,165 +46,234 @@ def create_compliance_task(
     )
     
     db.add(new_task)
-    db.commit()
-    db.refresh(new_task)
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+    await db.refresh(new_task)
     
     return new_task
     
 
-@router.get('/businesses/{business_id}/compliance-tasks', response_model=List[ComplianceTaskSchema])
-def get_compliance_tasks(
-    business_id: int,
+@router.post('/businesses/{business_id}/compliance-tasks:batch', response_model=List[ComplianceTaskSchema], status_code=status.HTTP_201_CREATED)
+@query_budget(3, sqlite=None)  # SQLite runs INSERT ... RETURNING once per row to keep the order
+async def create_compliance_tasks_batch(
+    batch: ComplianceTaskBatchCreate,
+    business_id: int = Depends(get_owned_business_id),  # Ownership is checked once for the whole batch
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+
+    # Items were validated per index by the schema; insert them with one multi-row INSERT ... RETURNING
+    result = await db.scalars(
+        insert(ComplianceTaskModel).returning(ComplianceTaskModel, sort_by_parameter_order=True),
+        [{**task.model_dump(), 'business_id': business_id} for task in batch.items]
+    )
+    new_tasks = result.all()
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    return new_tasks
+
+@router.get('/businesses/{business_id}/compliance-tasks', response_model=Page[ComplianceTaskSchema])
+@query_budget(5)
+async def get_compliance_tasks(
+    request: Request,
+    response: Response,
+    business_id: int = Depends(get_readable_business_id),  # Checks the business exists and belongs to the user
     title: Optional[str] = Query(None, description='Filter by task title'),
     task_status: Optional[TaskStatusEnum] = Query(None, description='Filter by task status'),
     due_before: Optional[datetime] = Query(None, description='Tasks due before this date'),
     due_after: Optional[datetime] = Query(None, description='Tasks due after this date'),
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+    include_archived: bool = Query(False, description='Also list tasks moved to the archive'),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
 ):
-    
-    # Check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
-    
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
-        )
-    # if exists run the query and show 
-    filtered_tasks = db.query(ComplianceTaskModel).options(
-        joinedload(ComplianceTaskModel.business)
-    ).filter(ComplianceTaskModel.business_id == business_id)
+    cache_key = response_cache.key_for(current_user.id, request)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return cached_response(request, cached)
 
-    if title:
-        filtered_tasks = filtered_tasks.filter(ComplianceTaskModel.title.ilike(f"%{title}%"))
+    # if exists run the query and show, on the live table and (when asked) the archive alike
+    def filter_tasks(model):
+        # Only ComplianceTaskSchema's columns are selected, as plain tuples
+        filtered = task_rows.select(model).filter(model.business_id == business_id)
 
-    if task_status:
-        filtered_tasks = filtered_tasks.filter(ComplianceTaskModel.status == task_status)
+        if title:
+            filtered = filtered.filter(model.title.ilike(f"%{title}%"))
 
-    if due_before:
-        filtered_tasks = filtered_tasks.filter(ComplianceTaskModel.due_date < due_before)
+        if task_status:
+            filtered = filtered.filter(model.status == task_status)
 
-    if due_after:
-        filtered_tasks = filtered_tasks.filter(ComplianceTaskModel.due_date > due_after)
+        if due_before:
+            filtered = filtered.filter(model.due_date < due_before)
 
-    all_tasks = filtered_tasks.all()
-    
-    return all_tasks
+        if due_after:
+            filtered = filtered.filter(model.due_date > due_after)
+
+        return filtered
+
+    filtered_tasks = filter_tasks(ComplianceTaskModel)
+    sources = [(filtered_tasks, ComplianceTaskModel)]
+    columns = ComplianceTaskModel
+
+    if include_archived:
+        archived_tasks = filter_tasks(ComplianceTaskArchiveModel)
+        sources.append((archived_tasks, ComplianceTaskArchiveModel))
+        filtered_tasks, columns = with_archive(filtered_tasks, archived_tasks)
+
+    # Answer 304 from an aggregate over the filtered rows before loading any of them
+    etag, last_modified = await collection_version(db, request, *sources)
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+
+    # Page ordered by (due_date, id) so the nearest deadlines come first
+    tasks_page = await paginate(db, filtered_tasks, page, columns.due_date, columns.id, rows=True)
+
+    body = task_rows.encode_page(tasks_page)
+    response_cache.set(cache_key, body, etag, last_modified)
+
+    return encoded_response(request, body, etag, last_modified)
 
 @router.get('/businesses/{business_id}/compliance-tasks/{task_id}', response_model=ComplianceTaskSchema)
-def get_single_compliance_task(
-    business_id: int,
-    task_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+@query_budget(2)
+async def get_single_compliance_task(
+    request: Request,
+    response: Response,
+    task: ComplianceTaskModel = Depends(get_readable_compliance_task)  # Ownership check and fetch in one query
 ):
     
-    # Check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
-    
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
-        )
-    
-    # if exists run the query and show one task
-    task = db.query(ComplianceTaskModel).filter(
-        ComplianceTaskModel.id == task_id,
-        ComplianceTaskModel.business_id == business_id
-    ).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Compliance task not found'
-        )
-    
+    not_modified = conditional_response(request, response, *row_version(request, task))
+    if not_modified:
+        return not_modified
+
     return task
 
 
 @router.put('/businesses/{business_id}/compliance-tasks/{task_id}', response_model=ComplianceTaskSchema)
-def update_compliance_task(
-    business_id: int,
-    task_id: int,
+@query_budget(4)
+async def update_compliance_task(
     task_update: ComplianceTaskUpdate,
-    db: Session = Depends(get_db),
+    task: ComplianceTaskModel = Depends(get_owned_compliance_task),  # Ownership check and fetch in one query
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     
-    # check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
-    
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
-        )
-    # if exists run the query 
-    task = db.query(ComplianceTaskModel).filter(
-        ComplianceTaskModel.id == task_id,
-        ComplianceTaskModel.business_id == business_id
-    ).first()
-    
-    if not task:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Compliance task not found'
-        )
-    
     # update only provided fields
-    update_data = task_update.dict(exclude_unset=True)
+    update_data = task_update.model_dump(exclude_unset=True)
     for key, value in update_data.items():
         setattr(task, key, value)
     
-    db.commit()
-    db.refresh(task)
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+    await db.refresh(task)
     
     return task
 
 @router.delete('/businesses/{business_id}/compliance-tasks/{task_id}')
-def delete_compliance_task(
-    business_id: int,
-    task_id: int,
-    db: Session = Depends(get_db),
+@query_budget(3)
+async def delete_compliance_task(
+    task: ComplianceTaskModel = Depends(get_owned_compliance_task),  # Ownership check and fetch in one query
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
     
-    # check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
+    await db.delete(task)
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
     
-    if not business:
+    return {"message": "Compliance task deleted successfully"}
+
+@router.post('/businesses/{business_id}/compliance-tasks:batch-delete')
+@query_budget(3)
+async def delete_compliance_tasks_batch(
+    batch: ComplianceTaskBatchDelete,
+    business_id: int = Depends(get_owned_business_id),  # Ownership is checked once for the whole batch
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # One DELETE ... RETURNING, scoped to the business so other owners' ids can't be touched
+    result = await db.execute(
+        delete(ComplianceTaskModel)
+        .where(ComplianceTaskModel.business_id == business_id, ComplianceTaskModel.id.in_(batch.ids))
+        .returning(ComplianceTaskModel.id)
+    )
+    deleted_ids = set(result.scalars())
+
+    # All-or-nothing, like batch creation
+    missing_ids = [task_id for task_id in dict.fromkeys(batch.ids) if task_id not in deleted_ids]
+    if missing_ids:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
+            detail=[{'id': task_id, 'detail': 'Compliance task not found'} for task_id in missing_ids],
         )
-    
-    # if exists run the query 
-    task = db.query(ComplianceTaskModel).filter(
-        ComplianceTaskModel.id == task_id,
-        ComplianceTaskModel.business_id == business_id
-    ).first()
-    
-    if not task:
+
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    return {"message": f"{len(deleted_ids)} compliance tasks deleted successfully"}
+
+@router.post('/compliance-tasks:batch-status', response_model=List[ComplianceTaskSchema])
+@query_budget(2)
+async def transition_compliance_tasks(
+    transition: ComplianceTaskStatusTransition,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # The ownership check is part of the UPDATE itself, so tasks of other users' businesses never match
+    owned_business_ids = select(BusinessModel.id).filter(BusinessModel.user_id == current_user.id)
+    conditions = [ComplianceTaskModel.business_id.in_(owned_business_ids)]
+
+    if transition.ids:
+        conditions.append(ComplianceTaskModel.id.in_(transition.ids))
+    if transition.business_id:
+        conditions.append(ComplianceTaskModel.business_id == transition.business_id)
+    if transition.current_status:
+        conditions.append(ComplianceTaskModel.status == transition.current_status)
+    if transition.due_before:
+        conditions.append(ComplianceTaskModel.due_date < transition.due_before)
+    if transition.due_after:
+        conditions.append(ComplianceTaskModel.due_date > transition.due_after)
+
+    # Without ids or a filter this would touch every task the user has
+    if len(conditions) == 1:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Provide ids or at least one filter'
+        )
+
+    values = {'status': transition.status}
+    if transition.submission_date:
+        values['submission_date'] = transition.submission_date
+    elif transition.status == TaskStatusEnum.SUBMITTED:
+        # Tasks that were already submitted keep their original date
+        values['submission_date'] = func.coalesce(
+            ComplianceTaskModel.submission_date,
+            literal(datetime.now(timezone.utc), ComplianceTaskModel.submission_date.type),  # Bound through UTCDateTime like a plain value
+        )
+
+    # One set-based UPDATE ... RETURNING in a single transaction
+    result = await db.scalars(
+        update(ComplianceTaskModel)
+        .where(*conditions)
+        .values(**values)
+        .returning(ComplianceTaskModel)
+        .execution_options(synchronize_session=False)  # Nothing else in this session holds these tasks
+    )
+    updated_tasks = result.all()
+
+    # All-or-nothing when ids are given, like the batch endpoints
+    updated_ids = {task.id for task in updated_tasks}
+    missing_ids = [task_id for task_id in dict.fromkeys(transition.ids or []) if task_id not in updated_ids]
+    if missing_ids:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail='Compliance task not found'
+            detail=[{'id': task_id, 'detail': 'Compliance task not found'} for task_id in missing_ids],
         )
-    
-    db.delete(task)
-    db.commit()
-    
-    return {"message": "Compliance task deleted successfully"}
+
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    return updated_tasks
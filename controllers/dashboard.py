@@ -0,0 +1,80 @@
+from fastapi import APIRouter, Depends
+from sqlalchemy import case, func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel, LicenseStatusEnum
+from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from serializers.dashboard import DashboardSchema
+from dependencies.get_read_db import get_read_db, get_current_read_user
+from services.query_budget import query_budget
+
+# Create the router
+router = APIRouter()
+
+@router.get('/dashboard', response_model=DashboardSchema)
+@query_budget(3)
+async def get_dashboard(
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
+):
+    now = datetime.now(timezone.utc)
+
+    # One grouped query per child table; the outer join keeps businesses that have no rows yet
+    license_counts = await db.execute(
+        select(
+            BusinessModel.id,
+            BusinessModel.name,
+            LicenseModel.status,
+            func.count(LicenseModel.id),
+            func.min(case((LicenseModel.expiry_date >= now, LicenseModel.expiry_date))),
+        )
+        .outerjoin(LicenseModel, LicenseModel.business_id == BusinessModel.id)
+        .filter(BusinessModel.user_id == current_user.id)
+        .group_by(BusinessModel.id, BusinessModel.name, LicenseModel.status)
+        .order_by(BusinessModel.id)
+    )
+
+    task_counts = await db.execute(
+        select(
+            BusinessModel.id,
+            ComplianceTaskModel.status,
+            func.count(ComplianceTaskModel.id),
+            func.min(case((
+                (ComplianceTaskModel.due_date >= now) & (ComplianceTaskModel.status != TaskStatusEnum.SUBMITTED),
+                ComplianceTaskModel.due_date
+            ))),
+        )
+        .outerjoin(ComplianceTaskModel, ComplianceTaskModel.business_id == BusinessModel.id)
+        .filter(BusinessModel.user_id == current_user.id)
+        .group_by(BusinessModel.id, ComplianceTaskModel.status)
+    )
+
+    # Fold the grouped rows into one summary per business
+    summaries = {}
+    for business_id, name, license_status, count, next_expiry in license_counts:
+        summary = summaries.setdefault(business_id, {
+            'business_id': business_id,
+            'name': name,
+            'licenses_by_status': {status: 0 for status in LicenseStatusEnum},
+            'tasks_by_status': {status: 0 for status in TaskStatusEnum},
+            'next_license_expiry': None,
+            'next_task_due': None,
+        })
+        if license_status is not None:
+            summary['licenses_by_status'][license_status] = count
+        if next_expiry and (summary['next_license_expiry'] is None or next_expiry < summary['next_license_expiry']):
+            summary['next_license_expiry'] = next_expiry
+
+    for business_id, task_status, count, next_due in task_counts:
+        summary = summaries.get(business_id)
+        if summary is None:
+            continue  # Business created between the two queries
+        if task_status is not None:
+            summary['tasks_by_status'][task_status] = count
+        if next_due and (summary['next_task_due'] is None or next_due < summary['next_task_due']):
+            summary['next_task_due'] = next_due
+
+    return {'businesses': list(summaries.values())}
@@ -0,0 +1,143 @@
+import csv
+import io
+import json
+from enum import Enum
+from typing import Literal
+
+from fastapi import APIRouter, Depends, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy import DateTime, cast, null, select
+
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel
+from models.archive import LicenseArchiveModel, ComplianceTaskArchiveModel
+from database import read_session_factory
+from dependencies.get_read_db import get_current_read_user
+from services.query_budget import query_budget
+from services.archive import with_archive
+
+# Create the router
+router = APIRouter()
+
+EXPORT_BATCH_SIZE = 1000  # Rows fetched from the server-side cursor per round trip
+
+# One flat column set for every record type, so NDJSON and CSV share the same shape
+EXPORT_COLUMNS = [
+    'record_type', 'id', 'business_id', 'name', 'description', 'cr_number', 'industry',
+    'status', 'issue_date', 'expiry_date', 'due_date', 'submission_date', 'created_at', 'archived_at',
+]
+
+
+def _archived_at(model):
+    # Live rows have no archived_at; the cast gives both sides of the union the same type
+    return model.archived_at if hasattr(model, 'archived_at') else cast(null(), DateTime).label('archived_at')
+
+
+def _license_rows(model, user_id: int):
+    return select(
+        model.id,
+        model.business_id,
+        model.name,
+        model.description,
+        model.status,
+        model.issue_date,
+        model.expiry_date,
+        model.created_at,
+        _archived_at(model),
+    ).join(BusinessModel, model.business_id == BusinessModel.id).filter(BusinessModel.user_id == user_id)
+
+
+def _compliance_task_rows(model, user_id: int):
+    return select(
+        model.id,
+        model.business_id,
+        model.title.label('name'),
+        model.description,
+        model.status,
+        model.due_date,
+        model.submission_date,
+        model.created_at,
+        _archived_at(model),
+    ).join(BusinessModel, model.business_id == BusinessModel.id).filter(BusinessModel.user_id == user_id)
+
+
+def _export_queries(user_id: int, include_archived: bool):
+    # Plain column tuples are streamed, so no ORM objects are built for the export
+    yield 'business', select(
+        BusinessModel.id,
+        BusinessModel.id.label('business_id'),
+        BusinessModel.name,
+        BusinessModel.description,
+        BusinessModel.cr_number,
+        BusinessModel.industry,
+        BusinessModel.created_at,
+    ).filter(BusinessModel.user_id == user_id).order_by(BusinessModel.id)
+
+    for record_type, rows, model, archive in (
+        ('license', _license_rows, LicenseModel, LicenseArchiveModel),
+        ('compliance_task', _compliance_task_rows, ComplianceTaskModel, ComplianceTaskArchiveModel),
+    ):
+        statement, columns = rows(model, user_id), model
+        # An audit export has to cover what the archiver moved out of the live tables too
+        if include_archived:
+            statement, columns = with_archive(statement, rows(archive, user_id))
+        yield record_type, statement.order_by(columns.business_id, columns.id)
+
+
+def _plain(value):
+    if isinstance(value, Enum):
+        return value.value
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+async def _stream_records(user_id: int, include_archived: bool):
+    # The export owns its session, so it stays open for as long as the response is streaming
+    async with read_session_factory(user_id)() as db:
+        for record_type, statement in _export_queries(user_id, include_archived):
+            result = await db.stream(statement.execution_options(yield_per=EXPORT_BATCH_SIZE))
+            async for partition in result.mappings().partitions():
+                yield [
+                    {'record_type': record_type, **{key: _plain(value) for key, value in row.items()}}
+                    for row in partition
+                ]
+
+
+async def _ndjson_lines(user_id: int, include_archived: bool):
+    async for records in _stream_records(user_id, include_archived):
+        yield ''.join(json.dumps(record) + '\n' for record in records)
+
+
+async def _csv_lines(user_id: int, include_archived: bool):
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=EXPORT_COLUMNS)
+    writer.writeheader()
+    yield buffer.getvalue()
+
+    async for records in _stream_records(user_id, include_archived):
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(records)
+        yield buffer.getvalue()
+
+
+@router.get('/export')
+@query_budget(4)
+async def export_data(
+    format: Literal['ndjson', 'csv'] = Query('ndjson', description='Export format'),
+    include_archived: bool = Query(True, description='Include licenses and tasks moved to the archive'),
+    current_user: UserModel = Depends(get_current_read_user)
+):
+    if format == 'csv':
+        body, media_type = _csv_lines(current_user.id, include_archived), 'text/csv'
+    else:
+        body, media_type = _ndjson_lines(current_user.id, include_archived), 'application/x-ndjson'
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={'Content-Disposition': f'attachment; filename="complitrack-export.{format}"'}
+    )
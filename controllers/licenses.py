@@ -1,35 +1,39 @@
-from fastapi import APIRouter, Depends, HTTPException, status, Query
-from sqlalchemy.orm import Session, joinedload
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, status, Query
+from sqlalchemy import delete, insert
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
 from datetime import datetime
 
 from models.user import UserModel
-from models.business import BusinessModel
 from models.license import LicenseModel, LicenseStatusEnum
-from serializers.license import LicenseCreate, LicenseSchema
+from models.archive import LicenseArchiveModel
+from serializers.license import LicenseCreate, LicenseBatchCreate, LicenseBatchDelete, LicenseSchema
+from serializers.pagination import Page
+from serializers.rows import RowSerializer
 from database import get_db
 from dependencies.get_current_user import get_current_user
+from dependencies.get_read_db import get_read_db, get_current_read_user
+from dependencies.business_scope import get_owned_business_id, get_owned_license, get_readable_business_id, get_readable_license
+from dependencies.pagination import PageParams, paginate
+from dependencies.conditional import collection_version, conditional_response, row_version
+from services.response_cache import response_cache, cached_response, encoded_response
+from services.query_budget import query_budget
+from services.archive import with_archive
 
 # Create the router
 router = APIRouter()
 
+# The list endpoint encodes column tuples straight to JSON instead of hydrating ORM instances
+license_rows = RowSerializer(LicenseModel, LicenseSchema)
+
 @router.post('/businesses/{business_id}/licenses', response_model=LicenseSchema, status_code=status.HTTP_201_CREATED)
-def create_license(
-    business_id: int,
+@query_budget(4)
+async def create_license(
     license: LicenseCreate,
-    db: Session = Depends(get_db),
+    business_id: int = Depends(get_owned_business_id),  # Checks the business exists and belongs to the user
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    # Check if business exists
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id,).first()
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found',
-        )
-    
     # Expiry date validation
     if license.expiry_date <= license.issue_date:
         raise HTTPException(
@@ -49,120 +53,115 @@ def create_license(
 
     # Add to database
     db.add(new_license)
-    db.commit()
-    db.refresh(new_license) # Refresh to get the generated id and created_at
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+    await db.refresh(new_license) # Refresh to get the generated id and created_at
 
     return new_license
 
-@router.get('/businesses/{business_id}/licenses', response_model=List[LicenseSchema])
-def get_licenses(
-    business_id: int,
+@router.post('/businesses/{business_id}/licenses:batch', response_model=List[LicenseSchema], status_code=status.HTTP_201_CREATED)
+@query_budget(3, sqlite=None)  # SQLite runs INSERT ... RETURNING once per row to keep the order
+async def create_licenses_batch(
+    batch: LicenseBatchCreate,
+    business_id: int = Depends(get_owned_business_id),  # Ownership is checked once for the whole batch
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # Items were validated per index by the schema; insert them with one multi-row INSERT ... RETURNING
+    result = await db.scalars(
+        insert(LicenseModel).returning(LicenseModel, sort_by_parameter_order=True),
+        [{**license.model_dump(), 'business_id': business_id} for license in batch.items]
+    )
+    new_licenses = result.all()
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    return new_licenses
+
+@router.get('/businesses/{business_id}/licenses', response_model=Page[LicenseSchema])
+@query_budget(5)
+async def get_licenses(
+    request: Request,
+    response: Response,
+    business_id: int = Depends(get_readable_business_id),  # Checks the business exists and belongs to the user
     name: Optional[str] = Query(None, description='Filter by license name'),
     license_status: Optional[LicenseStatusEnum] = Query(None, description='Filter by license status'),
     expiry_before: Optional[datetime] = Query(None, description='Licenses expiring before this date'),
     expiry_after: Optional[datetime] = Query(None, description='Licenses expiring after this date'),
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user),
+    include_archived: bool = Query(False, description='Also list licenses moved to the archive'),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
 ):
-    
-    # Check if business exists
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id,
-    ).first()
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found',
-        )
-    
-    # Apply query if exists
-    filtered_licenses = db.query(LicenseModel).options(
-        joinedload(LicenseModel.business)
-    ).filter(LicenseModel.business_id == business_id)
-    
-    if name:
-        filtered_licenses = filtered_licenses.filter(LicenseModel.name.ilike(f"%{name}%"))
+    cache_key = response_cache.key_for(current_user.id, request)
+    cached = response_cache.get(cache_key)
+    if cached:
+        return cached_response(request, cached)
+
+    # Apply query if exists, to the live table and (when asked) the archive alike
+    def filter_licenses(model):
+        # Only LicenseSchema's columns are selected, as plain tuples
+        filtered = license_rows.select(model).filter(model.business_id == business_id)
+
+        if name:
+            filtered = filtered.filter(model.name.ilike(f"%{name}%"))
 
-    if license_status:
-        filtered_licenses = filtered_licenses.filter(LicenseModel.status == license_status)
+        if license_status:
+            filtered = filtered.filter(model.status == license_status)
 
-    if expiry_before:
-        filtered_licenses = filtered_licenses.filter(LicenseModel.expiry_date < expiry_before)
+        if expiry_before:
+            filtered = filtered.filter(model.expiry_date < expiry_before)
 
-    if expiry_after:
-        filtered_licenses = filtered_licenses.filter(LicenseModel.expiry_date > expiry_after)
+        if expiry_after:
+            filtered = filtered.filter(model.expiry_date > expiry_after)
 
-    all_licenses = filtered_licenses.all()
+        return filtered
 
-    return all_licenses
+    filtered_licenses = filter_licenses(LicenseModel)
+    sources = [(filtered_licenses, LicenseModel)]
+    columns = LicenseModel
+
+    if include_archived:
+        archived_licenses = filter_licenses(LicenseArchiveModel)
+        sources.append((archived_licenses, LicenseArchiveModel))
+        filtered_licenses, columns = with_archive(filtered_licenses, archived_licenses)
+
+    # Answer 304 from an aggregate over the filtered rows before loading any of them
+    etag, last_modified = await collection_version(db, request, *sources)
+    not_modified = conditional_response(request, response, etag, last_modified)
+    if not_modified:
+        return not_modified
+
+    # Page ordered by (expiry_date, id) so the soonest expiries come first
+    licenses_page = await paginate(db, filtered_licenses, page, columns.expiry_date, columns.id, rows=True)
+
+    body = license_rows.encode_page(licenses_page)
+    response_cache.set(cache_key, body, etag, last_modified)
+
+    return encoded_response(request, body, etag, last_modified)
 
 @router.get('/businesses/{business_id}/licenses/{license_id}', response_model=LicenseSchema)
-def get_single_license(
-    business_id: int,
-    license_id: int,
-    db: Session = Depends(get_db),
-    current_user: UserModel = Depends(get_current_user)
+@query_budget(2)
+async def get_single_license(
+    request: Request,
+    response: Response,
+    license: LicenseModel = Depends(get_readable_license)  # Ownership check and fetch in one query
 ):
-    # Check if business exists
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id,
-    ).first()
+    not_modified = conditional_response(request, response, *row_version(request, license))
+    if not_modified:
+        return not_modified
 
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found',
-        )
-    
-    # Check if license exists
-    license = db.query(LicenseModel).filter(
-        LicenseModel.id == license_id,
-        LicenseModel.business_id == business_id,
-        ).first()
-    
-    if not license:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='License not found',
-        )
-    
     return license
 
 @router.put('/businesses/{business_id}/licenses/{license_id}', response_model=LicenseSchema)
-def update_license(
-    business_id: int,
-    license_id: int,
+@query_budget(4)
+async def update_license(
     license_update: LicenseCreate,
-    db: Session = Depends(get_db),
+    license: LicenseModel = Depends(get_owned_license),  # Ownership check and fetch in one query
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
-    
-    # check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
-    
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
-        )
-    
-    # check if the license exists
-    license = db.query(LicenseModel).filter(
-        LicenseModel.id == license_id,
-        LicenseModel.business_id == business_id
-    ).first()
-    
-    if not license:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='License not found'
-        )
-    
+
     # expiry date validation for the license
     if license_update.expiry_date <= license_update.issue_date:
         raise HTTPException(
@@ -177,44 +176,52 @@ def update_license(
     license.expiry_date = license_update.expiry_date
     license.status = license_update.status
     
-    db.commit()
-    db.refresh(license)
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+    await db.refresh(license)
     
     return license
 
 @router.delete('/businesses/{business_id}/licenses/{license_id}')
-def delete_license(
-    business_id: int,
-    license_id: int,
-    db: Session = Depends(get_db),
+@query_budget(3)
+async def delete_license(
+    license: LicenseModel = Depends(get_owned_license),  # Ownership check and fetch in one query
+    db: AsyncSession = Depends(get_db),
     current_user: UserModel = Depends(get_current_user)
 ):
+
+    await db.delete(license)
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
     
-    # check if the business exists and belongs to the user
-    business = db.query(BusinessModel).filter(
-        BusinessModel.id == business_id,
-        BusinessModel.user_id == current_user.id
-    ).first()
-    
-    if not business:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail='Business not found'
-        )
-    
-    # check if the license exists
-    license = db.query(LicenseModel).filter(
-        LicenseModel.id == license_id,
-        LicenseModel.business_id == business_id
-    ).first()
-    
-    if not license:
+    return {"message": "License deleted successfully"}
+
+@router.post('/businesses/{business_id}/licenses:batch-delete')
+@query_budget(3)
+async def delete_licenses_batch(
+    batch: LicenseBatchDelete,
+    business_id: int = Depends(get_owned_business_id),  # Ownership is checked once for the whole batch
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+):
+    # One DELETE ... RETURNING, scoped to the business so other owners' ids can't be touched
+    result = await db.execute(
+        delete(LicenseModel)
+        .where(LicenseModel.business_id == business_id, LicenseModel.id.in_(batch.ids))
+        .returning(LicenseModel.id)
+    )
+    deleted_ids = set(result.scalars())
+
+    # All-or-nothing, like batch creation
+    missing_ids = [license_id for license_id in dict.fromkeys(batch.ids) if license_id not in deleted_ids]
+    if missing_ids:
+        await db.rollback()
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
-            detail='License not found'
+            detail=[{'id': license_id, 'detail': 'License not found'} for license_id in missing_ids],
         )
-    
-    db.delete(license)
-    db.commit()
-    
-    return {"message": "License deleted successfully"}
+
+    await db.commit()
+    response_cache.invalidate_user(current_user.id)
+
+    return {"message": f"{len(deleted_ids)} licenses deleted successfully"}
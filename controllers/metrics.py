@@ -0,0 +1,19 @@
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from services.metrics import render_metrics
+from services.response_cache import response_cache
+from services.query_budget import query_budget
+
+# Create the router
+router = APIRouter()
+
+@router.get('/metrics', response_class=PlainTextResponse, include_in_schema=False)
+@query_budget(0)
+async def get_metrics():
+    cache_stats = response_cache.stats()
+    body = render_metrics([
+        ('response_cache_hits_total', 'List responses served from the response cache', cache_stats['hits']),
+        ('response_cache_misses_total', 'List responses that had to be built', cache_stats['misses']),
+    ])
+    return PlainTextResponse(body, media_type='text/plain; version=0.0.4')
@@ -0,0 +1,49 @@
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import UserModel
+from serializers.pagination import Page
+from serializers.search import SearchResultSchema
+from dependencies.get_read_db import get_read_db, get_current_read_user
+from dependencies.pagination import PageParams, decode_offset_cursor, encode_offset_cursor
+from services.search import search_matches
+from services.query_budget import query_budget
+
+# Create the router
+router = APIRouter()
+
+@router.get('/search', response_model=Page[SearchResultSchema])
+@query_budget(3, sqlite=None)  # The first search on SQLite also builds the FTS5 index
+async def search(
+    q: str = Query(..., min_length=1, max_length=200, description='Words to search for in names, titles and descriptions'),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
+):
+    matches = await search_matches(db, current_user.id, q)
+
+    # Every match has to be ranked before the first page is known, so pages are slices of the ranked list
+    offset = decode_offset_cursor(page.cursor) if page.cursor else 0
+    result = await db.execute(
+        select(matches)
+        .order_by(matches.c.rank.desc(), matches.c.record_type, matches.c.id)
+        .offset(offset)
+        .limit(page.limit + 1)
+    )
+    rows = result.mappings().all()
+
+    total_estimate = None
+    if page.include_total:
+        total_estimate = (await db.execute(select(func.count()).select_from(matches))).scalar_one()
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        next_cursor = encode_offset_cursor(offset + page.limit)
+
+    return {
+        'items': rows,
+        'next_cursor': next_cursor,
+        'total_estimate': total_estimate,
+    }
@@ -0,0 +1,118 @@
+from fastapi import APIRouter, Depends, HTTPException, status, Query
+from sqlalchemy import String, cast, literal_column, select, tuple_, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+from datetime import datetime, timezone
+from typing import Optional
+
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel, LicenseStatusEnum
+from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from serializers.pagination import Page
+from serializers.timeline import TimelineEventSchema
+from dependencies.get_read_db import get_read_db, get_current_read_user
+from dependencies.pagination import PageParams, decode_cursor, encode_cursor, estimate_total
+from services.query_budget import query_budget
+
+# Create the router
+router = APIRouter()
+
+# (event type, model, date column, title column, status enum) - event types sort in this order on equal dates
+TIMELINE_SOURCES = [
+    ('license_expiry', LicenseModel, LicenseModel.expiry_date, LicenseModel.name, LicenseStatusEnum),
+    ('task_due', ComplianceTaskModel, ComplianceTaskModel.due_date, ComplianceTaskModel.title, TaskStatusEnum),
+]
+
+def as_utc(value: datetime) -> datetime:
+    # Query values may come with or without an offset; one without is taken to be UTC, like the stored dates
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+def timeline_events(event_type, model, date_column, title_column, user_id, date_from, date_to, after=None):
+    events = (
+        select(
+            literal_column(f"'{event_type}'").label('event_type'),
+            date_column.label('date'),
+            model.id.label('id'),
+            title_column.label('title'),
+            cast(model.status, String).label('status'),  # The two status enums are different types
+            model.business_id.label('business_id'),
+            BusinessModel.name.label('business_name'),
+        )
+        .join(BusinessModel, BusinessModel.id == model.business_id)
+        .filter(BusinessModel.user_id == user_id, date_column >= date_from)
+    )
+    if date_to:
+        events = events.filter(date_column < date_to)
+
+    # The page continues after (date, event_type, id); event_type is constant here, so seek on the date alone
+    if after:
+        after_date, after_type, after_id = after
+        if event_type > after_type:
+            events = events.filter(date_column >= after_date)
+        elif event_type == after_type:
+            events = events.filter(tuple_(date_column, model.id) > (after_date, after_id))
+        else:
+            events = events.filter(date_column > after_date)
+
+    return events
+
+@router.get('/timeline', response_model=Page[TimelineEventSchema])
+@query_budget(3)
+async def get_timeline(
+    date_from: Optional[datetime] = Query(None, alias='from', description='Start of the window (default: now)'),
+    date_to: Optional[datetime] = Query(None, alias='to', description='End of the window, exclusive'),
+    page: PageParams = Depends(),
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
+):
+    date_from = as_utc(date_from) if date_from else datetime.now(timezone.utc)
+    date_to = as_utc(date_to) if date_to else None
+    if date_to and date_to <= date_from:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='to must be after from'
+        )
+
+    after = decode_cursor(page.cursor, (str, int)) if page.cursor else None
+
+    # Each branch reads its own date index in order and stops after a page, then the branches are merged
+    branches = []
+    for event_type, model, date_column, title_column, _ in TIMELINE_SOURCES:
+        events = timeline_events(event_type, model, date_column, title_column, current_user.id, date_from, date_to, after)
+        branches.append(select(
+            events.order_by(date_column, model.id).limit(page.limit + 1).subquery()
+        ))
+    timeline = union_all(*branches).subquery('timeline')
+
+    result = await db.execute(
+        select(timeline)
+        .order_by(timeline.c.date, timeline.c.event_type, timeline.c.id)
+        .limit(page.limit + 1)
+    )
+    rows = result.mappings().all()
+
+    total_estimate = None
+    if page.include_total:
+        total_estimate = await estimate_total(db, union_all(*(
+            timeline_events(event_type, model, date_column, title_column, current_user.id, date_from, date_to)
+            for event_type, model, date_column, title_column, _ in TIMELINE_SOURCES
+        )))
+
+    next_cursor = None
+    if len(rows) > page.limit:
+        rows = rows[:page.limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(last_row['date'], last_row['event_type'], last_row['id'])
+
+    # status comes back as the enum member name, so map it to the value the other endpoints return
+    status_enums = {event_type: enum for event_type, _, _, _, enum in TIMELINE_SOURCES}
+    items = [
+        {**row, 'status': status_enums[row['event_type']][row['status']].value}
+        for row in rows
+    ]
+
+    return {
+        'items': items,
+        'next_cursor': next_cursor,
+        'total_estimate': total_estimate,
+    }
@@ -1,49 +1,91 @@
+from datetime import datetime, timezone
 from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi.security import HTTPAuthorizationCredentials
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import UserModel
 from serializers.user import UserSchema, UserLogin, UserToken, UserResponseSchema
 from database import get_db
+from dependencies.get_current_user import get_current_user, decode_token, http_bearer
+from services.token_revocation import revoke_token
+from services.password_hasher import password_hasher
+from services.query_budget import query_budget
 from typing import List
 
 router = APIRouter()
 
 @router.post("/register", response_model=UserResponseSchema)
-def create_user(user: UserSchema, db: Session = Depends(get_db)):
+@query_budget(3)
+async def create_user(user: UserSchema, db: AsyncSession = Depends(get_db)):
     # Check if the username or email already exists
-    existing_user = db.query(UserModel).filter(
+    result = await db.execute(select(UserModel).filter(
         (UserModel.username == user.username) | (UserModel.email == user.email)
-    ).first()
+    ))
+    existing_user = result.scalars().first()
 
     if existing_user:
         raise HTTPException(status_code=400, detail="Username or email already exists")
 
     new_user = UserModel(username=user.username, email=user.email)
-    # Use the set_password method to hash the password
-    new_user.set_password(user.password)
+    # Hash the password on the bcrypt pool instead of the event loop
+    new_user.password_hash = await password_hasher.hash(user.password)
 
     db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
+    await db.flush()
+    # Their first reads go through the replica, which may not have the new row yet
+    db.info['user_id'] = new_user.id
+    await db.commit()
+    await db.refresh(new_user)
 
     return new_user
 
 @router.post("/login", response_model=UserToken)
-def login(user: UserLogin, db: Session = Depends(get_db)):
+@query_budget(2)
+async def login(user: UserLogin, db: AsyncSession = Depends(get_db)):
 
     # Find the user by username
-    db_user = db.query(UserModel).filter(UserModel.username == user.username).first()
+    result = await db.execute(select(UserModel).filter(UserModel.username == user.username))
+    db_user = result.scalars().first()
 
     # Check if the user exists and if the password is correct
-    if not db_user or not db_user.verify_password(user.password):
+    is_valid, new_hash = (False, None)
+    if db_user:
+        is_valid, new_hash = await password_hasher.verify_and_update(user.password, db_user.password_hash)
+
+    if not is_valid:
         raise HTTPException(status_code=400, detail="Invalid username or password")
 
+    # Transparently upgrade hashes made with an outdated bcrypt cost
+    if new_hash:
+        db_user.password_hash = new_hash
+        await db.commit()
+
     # Generate JWT token
     token = db_user.generate_token()
 
     # Return token and a success message
     return {"token": token, "message": "Login successful"}
 
+@router.post("/logout")
+@query_budget(2)
+async def logout(
+    token: HTTPAuthorizationCredentials = Depends(http_bearer),
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)  # Rejects tokens that are invalid or already revoked
+):
+    payload = decode_token(token.credentials)
+
+    # Tokens issued before jti was added can't be told apart, they just run out at their exp
+    if not payload.get("jti"):
+        raise HTTPException(status_code=400, detail="This token can't be revoked, it expires on its own")
+
+    await revoke_token(db, payload["jti"], current_user.id, datetime.fromtimestamp(payload["exp"], timezone.utc))
+
+    return {"message": "Logout successful"}
+
 @router.get("/users", response_model=List[UserResponseSchema])
-def get_users(db: Session = Depends(get_db)):
-    users = db.query(UserModel).all()
+@query_budget(1)
+async def get_users(db: AsyncSession = Depends(get_db)):
+    result = await db.execute(select(UserModel))
+    users = result.scalars().all()
     return users
\ No newline at end of file
@@ -1,18 +1,129 @@
-from sqlalchemy import create_engine
+import time
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker, Session
-from config.environment import db_URI
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
+from config.environment import (
+    db_URI, async_db_URI, async_replica_db_URI, replica_read_after_write,
+    db_pool_size, db_max_overflow, db_pool_timeout, db_pool_recycle, db_pool_pre_ping, db_statement_timeout,
+)
+from services.metrics import instrument_engine, record_pool_wait
+
+
+class MeasuredQueuePool(AsyncAdaptedQueuePool):
+    """Async queue pool that reports how long each checkout waited for a connection"""
+
+    def _do_get(self):
+        started = time.perf_counter()
+        try:
+            return super()._do_get()
+        finally:
+            record_pool_wait(time.perf_counter() - started)
+
+
+def engine_options(uri, poolclass=None):
+    """Pool and timeout keyword arguments for create_engine / create_async_engine"""
+    url = make_url(uri)
+    options = {'pool_pre_ping': db_pool_pre_ping, 'pool_recycle': db_pool_recycle}
+
+    # SQLite opens a local file rather than a server connection, so pool sizing doesn't apply
+    if url.get_backend_name() == 'sqlite':
+        return options
 
-# Connect FastAPI with SQLAlchemy
+    options.update(pool_size=db_pool_size, max_overflow=db_max_overflow, pool_timeout=db_pool_timeout)
+    if poolclass:
+        options['poolclass'] = poolclass
+
+    if db_statement_timeout:
+        if url.get_driver_name() == 'asyncpg':
+            options['connect_args'] = {'server_settings': {'statement_timeout': str(db_statement_timeout)}}
+        else:
+            options['connect_args'] = {'options': f'-c statement_timeout={db_statement_timeout}'}
+
+    return options
+
+
+def enable_sqlite_foreign_keys(engine):
+    # SQLite ignores foreign keys, and so ON DELETE CASCADE, unless every connection turns them on
+    if engine.dialect.name != 'sqlite':
+        return
+
+    @event.listens_for(engine, 'connect')
+    def _foreign_keys_on(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute('PRAGMA foreign_keys=ON')
+        cursor.close()
+
+
+# Blocking engine for scripts and migrations (seed.py, test.py, alembic)
 engine = create_engine(
-    db_URI
+    db_URI,
+    **engine_options(db_URI)
 )
+enable_sqlite_foreign_keys(engine)
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Connect FastAPI with SQLAlchemy on the event loop
+async_engine = create_async_engine(
+    async_db_URI,
+    **engine_options(async_db_URI, MeasuredQueuePool)
+)
+enable_sqlite_foreign_keys(async_engine.sync_engine)
+instrument_engine(async_engine)
+
+
+class PrimarySession(Session):
+    """Sessions on the primary, so commits can be told apart from script and replica sessions"""
+
+
+# Objects stay usable after commit, since lazy refreshes can't run outside the event loop
+AsyncSessionLocal = async_sessionmaker(
+    bind=async_engine, autoflush=False, expire_on_commit=False, sync_session_class=PrimarySession
+)
+
+# Reads that can tolerate replication lag; without a replica they simply use the primary
+replica_engine = create_async_engine(
+    async_replica_db_URI,
+    **engine_options(async_replica_db_URI, MeasuredQueuePool)
+) if async_replica_db_URI else None
+
+if replica_engine:
+    enable_sqlite_foreign_keys(replica_engine.sync_engine)
+    instrument_engine(replica_engine)
+
+ReplicaSessionLocal = async_sessionmaker(
+    bind=replica_engine, autoflush=False, expire_on_commit=False
+) if replica_engine else None
+
+
+# user id -> monotonic time until which that user's reads must see the primary.
+# It lives in the worker process, so read-your-writes only holds for reads served by the worker
+# that took the write; under several workers a read elsewhere can trail by the replication lag.
+_recent_writers = {}
+
+
+@event.listens_for(PrimarySession, 'after_commit')
+def _record_write(session):
+    # authenticate() tags the request's session with the caller
+    user_id = session.info.get('user_id')
+    if user_id is not None:
+        now = time.monotonic()
+        _recent_writers[user_id] = now + replica_read_after_write
+        if len(_recent_writers) > 10000:
+            for stale_id in [key for key, until in _recent_writers.items() if until < now]:
+                del _recent_writers[stale_id]
+
+
+def read_session_factory(user_id: int):
+    """Session factory for a user's read-only request: the replica, unless they wrote recently"""
+    if ReplicaSessionLocal is None or _recent_writers.get(user_id, 0) > time.monotonic():
+        return AsyncSessionLocal
+    return ReplicaSessionLocal
+
 
-def get_db():
-    db = SessionLocal()
-    try:
+async def get_db():
+    async with AsyncSessionLocal() as db:
         yield db
-    finally:
-        db.close()
@@ -0,0 +1,112 @@
+# dependencies/business_scope.py
+
+from fastapi import Depends, HTTPException, status
+from sqlalchemy import and_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel
+from database import get_db
+from dependencies.get_current_user import get_current_user
+from dependencies.get_read_db import get_read_db, get_current_read_user
+
+
+def _check_owner(owner_id, current_user):
+    # No row means the business doesn't exist; a different owner means it isn't ours
+    if owner_id is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail='Business not found'
+        )
+
+    if owner_id != current_user.id:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail='Not authorized to access this business'
+        )
+
+
+async def _load_business_child(db: AsyncSession, current_user, model, business_id: int, child_id: int, label: str):
+    # One round trip: the business owner and the child row, outer joined so we can tell which one is missing
+    result = await db.execute(
+        select(BusinessModel.user_id, model)
+        .select_from(BusinessModel)
+        .outerjoin(model, and_(model.business_id == BusinessModel.id, model.id == child_id))
+        .filter(BusinessModel.id == business_id)
+    )
+    owner_id, child = result.first() or (None, None)
+
+    _check_owner(owner_id, current_user)
+
+    if child is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f'{label} not found'
+        )
+
+    return child
+
+
+async def _check_business_owner(db: AsyncSession, current_user, business_id: int) -> int:
+    result = await db.execute(select(BusinessModel.user_id).filter(BusinessModel.id == business_id))
+    _check_owner(result.scalar(), current_user)
+    return business_id
+
+
+# Writes check ownership on the primary, in the same session as the write
+
+async def get_owned_business_id(
+    business_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+) -> int:
+    return await _check_business_owner(db, current_user, business_id)
+
+
+async def get_owned_license(
+    business_id: int,
+    license_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+) -> LicenseModel:
+    return await _load_business_child(db, current_user, LicenseModel, business_id, license_id, 'License')
+
+
+async def get_owned_compliance_task(
+    business_id: int,
+    task_id: int,
+    db: AsyncSession = Depends(get_db),
+    current_user: UserModel = Depends(get_current_user)
+) -> ComplianceTaskModel:
+    return await _load_business_child(db, current_user, ComplianceTaskModel, business_id, task_id, 'Compliance task')
+
+
+# GET routes check ownership in their read session (the replica, when configured),
+# which FastAPI shares with the route so the check and the read see the same state
+
+async def get_readable_business_id(
+    business_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
+) -> int:
+    return await _check_business_owner(db, current_user, business_id)
+
+
+async def get_readable_license(
+    business_id: int,
+    license_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
+) -> LicenseModel:
+    return await _load_business_child(db, current_user, LicenseModel, business_id, license_id, 'License')
+
+
+async def get_readable_compliance_task(
+    business_id: int,
+    task_id: int,
+    db: AsyncSession = Depends(get_read_db),
+    current_user: UserModel = Depends(get_current_read_user)
+) -> ComplianceTaskModel:
+    return await _load_business_child(db, current_user, ComplianceTaskModel, business_id, task_id, 'Compliance task')
@@ -0,0 +1,81 @@
+# dependencies/conditional.py
+
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional
+
+from fastapi import Request, Response, status
+from sqlalchemy import func, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+async def collection_version(db: AsyncSession, request: Request, *sources, require_rows: bool = False):
+    """Weak ETag and Last-Modified for result sets, from max(updated_at) and count(*) without loading rows.
+
+    Each source is a (statement, model) pair; the statement's filters define the rows it covers.
+    With require_rows, returns None when the first source matches nothing, so single-resource
+    routes can answer 404 rather than 304 (If-None-Match: * only matches a resource that exists).
+    """
+    aggregates = []
+    for statement, model in sources:
+        aggregates.append(statement.with_only_columns(func.max(model.updated_at)).order_by(None).scalar_subquery())
+        aggregates.append(statement.with_only_columns(func.count(model.id)).order_by(None).scalar_subquery())
+
+    # All sources are folded into a single round trip
+    row = (await db.execute(select(*aggregates))).one()
+    if require_rows and not row[1]:
+        return None
+
+    newest_values = [value for value in row[0::2] if value is not None]
+    last_modified = max(newest_values) if newest_values else None
+
+    # The URL is part of the tag, so each filter combination and page gets its own
+    parts = [request.url.path, request.url.query] + [value.isoformat() if isinstance(value, datetime) else str(value) for value in row]
+    return _weak_etag(parts), last_modified
+
+
+def row_version(request: Request, row):
+    # Single rows are already loaded by their ownership check, so their own updated_at is enough
+    return _weak_etag([request.url.path, str(row.id), row.updated_at.isoformat() if row.updated_at else '']), row.updated_at
+
+
+def _weak_etag(parts) -> str:
+    return 'W/"' + hashlib.sha1('|'.join(parts).encode()).hexdigest() + '"'
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    if_none_match = request.headers.get('if-none-match')
+    if if_none_match:
+        # Weak comparison, and If-Modified-Since is ignored whenever If-None-Match is sent
+        candidates = {tag.strip().removeprefix('W/') for tag in if_none_match.split(',')}
+        return '*' in candidates or etag.removeprefix('W/') in candidates
+
+    if_modified_since = request.headers.get('if-modified-since')
+    if if_modified_since and last_modified:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return _as_utc(last_modified).replace(microsecond=0) <= _as_utc(since)
+
+    return False
+
+
+def _as_utc(value: datetime) -> datetime:
+    # Timestamps are stored as naive UTC, and so is an If-Modified-Since without a zone
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def conditional_response(request: Request, response: Response, etag: str, last_modified: Optional[datetime]):
+    """Attach validators to the response, and return a 304 to send instead when the client's copy is current"""
+    headers = {'ETag': etag, 'Cache-Control': 'private, no-cache'}
+    if last_modified:
+        headers['Last-Modified'] = format_datetime(_as_utc(last_modified), usegmt=True)
+
+    response.headers.update(headers)
+
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+
+    return None
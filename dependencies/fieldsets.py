@@ -0,0 +1,65 @@
+# dependencies/fieldsets.py
+
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy.orm import joinedload, load_only, selectinload
+
+from models.business import BusinessModel
+from models.user import UserModel
+from serializers.business import BUSINESS_FIELDS, BUSINESS_EXPANSIONS, business_schema_for
+
+# The shape returned when neither parameter is sent, so existing clients keep getting it
+DEFAULT_BUSINESS_EXPANSIONS = ('user', 'licenses')
+
+
+def _parse_list(value: str, allowed, parameter: str) -> tuple:
+    requested = {item.strip() for item in value.split(',') if item.strip()}
+    unknown = requested.difference(allowed)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Unknown {parameter} value(s): {', '.join(sorted(unknown))}"
+        )
+    # Normalized to the declared order, so equivalent requests share one schema
+    return tuple(name for name in allowed if name in requested)
+
+
+class BusinessFieldset:
+    """`fields=` and `expand=` query parameters for business responses.
+
+    Without either parameter the full business with its owner and licenses is returned. Once one is
+    sent, only the named fields (all of them if `fields` is omitted) and expansions (none if `expand`
+    is omitted) are selected, joined and serialized.
+    """
+
+    def __init__(
+        self,
+        fields: Optional[str] = Query(None, description=f"Comma-separated fields to return: {','.join(BUSINESS_FIELDS)}"),
+        expand: Optional[str] = Query(None, description=f"Comma-separated relations to nest: {','.join(BUSINESS_EXPANSIONS)}"),
+    ):
+        if fields is None and expand is None:
+            self.fields, self.expand = BUSINESS_FIELDS, DEFAULT_BUSINESS_EXPANSIONS
+        else:
+            self.fields = _parse_list(fields, BUSINESS_FIELDS, 'fields') if fields else BUSINESS_FIELDS
+            self.expand = _parse_list(expand, BUSINESS_EXPANSIONS, 'expand') if expand else ()
+
+        self.schema = business_schema_for(self.fields, self.expand)
+
+    def loader_options(self):
+        # Only the requested columns (plus the keyset pagination keys), and only the requested relations
+        columns = dict.fromkeys(('id', 'created_at', *self.fields))
+        options = [load_only(*(getattr(BusinessModel, name) for name in columns), raiseload=True)]
+
+        if 'user' in self.expand:
+            options.append(joinedload(BusinessModel.user).load_only(UserModel.username, UserModel.email))
+        # A collection join would multiply rows and break LIMIT, so collections use a second query
+        if 'licenses' in self.expand:
+            options.append(selectinload(BusinessModel.licenses))
+        if 'compliance_tasks' in self.expand:
+            options.append(selectinload(BusinessModel.compliance_tasks))
+
+        return options
+
+    def serialize(self, business) -> dict:
+        return self.schema.model_validate(business, from_attributes=True).model_dump(mode='json')
@@ -1,32 +1,99 @@
-
 # dependencies/get_current_user.py
 
+import threading
+import time
+from collections import OrderedDict
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer
-from sqlalchemy.orm import Session
+from sqlalchemy import event, select
+from sqlalchemy.ext.asyncio import AsyncSession
 from models.user import UserModel
 from database import get_db
 import jwt
-from jwt import DecodeError, ExpiredSignatureError # We import specific exceptions to handle them explicitly
-from config.environment import secret
+from jwt import DecodeError, ExpiredSignatureError, InvalidTokenError # We import specific exceptions to handle them explicitly
+from config.environment import secret, auth_stateless, auth_cache_ttl, auth_cache_size
+from services.token_revocation import revocation_list
 
 # We're using the HTTP Bearer scheme for the Authorization header
 http_bearer = HTTPBearer()
 
-# This function takes the database session and the JWT token from the request header
-def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_bearer)):
 
-    try:
-        # Decode the token using the secret key
-        payload = jwt.decode(token.credentials, secret, algorithms=["HS256"])
+class TokenPrincipal:
+    """Lightweight authenticated user built from verified token claims"""
+    __slots__ = ('id', 'username')
+
+    def __init__(self, id: int, username: str):
+        self.id = id
+        self.username = username
+
+
+class UserStatusCache:
+    """Small LRU of user id -> exists, with each entry expiring after `ttl` seconds"""
+
+    def __init__(self, ttl: int, max_size: int):
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()  # Mapper events can fire from sync scripts on other threads
+
+    def get(self, user_id: int):
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            exists, expires_at = entry
+            if expires_at < time.monotonic():
+                del self._entries[user_id]
+                return None
+            self._entries.move_to_end(user_id)
+            return exists
+
+    def set(self, user_id: int, exists: bool):
+        with self._lock:
+            self._entries[user_id] = (exists, time.monotonic() + self.ttl)
+            self._entries.move_to_end(user_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+user_status_cache = UserStatusCache(ttl=auth_cache_ttl, max_size=auth_cache_size)
+
+
+def invalidate_user(user_id: int):
+    # Remember the user as gone so their outstanding tokens are rejected without a query
+    user_status_cache.set(int(user_id), False)
+
+
+@event.listens_for(UserModel, 'after_delete')
+def _invalidate_deleted_user(mapper, connection, target):
+    invalidate_user(target.id)
+
+
+async def _user_exists(db: AsyncSession, user_id: int) -> bool:
+    exists = user_status_cache.get(user_id)
+    if exists is None:
+        result = await db.execute(select(UserModel.id).filter(UserModel.id == user_id))
+        exists = result.scalar() is not None
+        user_status_cache.set(user_id, exists)
+    return exists
 
-        # Query the database to find the user with the ID from the token's payload
-        user = db.query(UserModel).filter(UserModel.id == payload.get("sub")).first()
 
-        # If no user is found, raise an HTTP 401 Unauthorized error
-        if not user:
-            raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
-                                 detail="Invalid username or password")
+def decode_token(token: str) -> dict:
+    # Verifies the signature and exp, raising DecodeError / ExpiredSignatureError
+    return jwt.decode(token, secret, algorithms=["HS256"])
+
+
+def verify_token(token) -> tuple:
+    """Check the bearer token and return its claims with the user id they name"""
+
+    try:
+        # Decode the token using the secret key
+        payload = decode_token(token.credentials)
 
     # Handle decoding errors (invalid token)
     except DecodeError as e:
@@ -38,6 +105,53 @@ def get_current_user(db: Session = Depends(get_db), token: str = Depends(http_be
         raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
                              detail='Token has expired')
 
+    # Any other claim PyJWT rejects, e.g. a sub that isn't a string
+    except InvalidTokenError as e:
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                             detail=f'Invalid token: {str(e)}')
+
+    # Logged-out tokens are looked up in memory, so this costs no query
+    if revocation_list.is_revoked(payload.get("jti")):
+        raise HTTPException(status_code=status.HTTP_403_FORBIDDEN,
+                             detail='Token has been revoked')
+
+    # The sub claim is a string, and asyncpg won't coerce it to the integer id column
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        # A missing or non-numeric sub can't name a user, so answer as for an unknown one
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                             detail="Invalid username or password")
+
+    return payload, user_id
+
+
+async def authenticate(db: AsyncSession, token) -> UserModel:
+    """Resolve the bearer token to its user, looking them up through the given session"""
+    payload, user_id = verify_token(token)
+
+    # Lets the session remember whose writes it commits, so their next reads avoid a lagging replica
+    db.info['user_id'] = user_id
+
+    if auth_stateless:
+        # Trust the verified claims and only confirm (from cache when possible) that the user still exists
+        user = TokenPrincipal(id=user_id, username=payload.get("username"))
+        if not await _user_exists(db, user_id):
+            user = None
+    else:
+        # Query the database to find the user with the ID from the token's payload
+        result = await db.execute(select(UserModel).filter(UserModel.id == user_id))
+        user = result.scalars().first()
+
+    # If no user is found, raise an HTTP 401 Unauthorized error
+    if not user:
+        raise HTTPException(status_code=status.HTTP_401_UNAUTHORIZED,
+                             detail="Invalid username or password")
+
     # Return the user if the token is valid
     return user
 
+
+# This function takes the database session and the JWT token from the request header
+async def get_current_user(db: AsyncSession = Depends(get_db), token: str = Depends(http_bearer)):
+    return await authenticate(db, token)
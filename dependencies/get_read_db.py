@@ -0,0 +1,19 @@
+# dependencies/get_read_db.py
+
+from fastapi import Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from database import read_session_factory
+from dependencies.get_current_user import authenticate, http_bearer, verify_token
+
+
+# Session for GET endpoints: served by the read replica when one is configured,
+# except right after the same user wrote, so they always read their own writes
+async def get_read_db(token: str = Depends(http_bearer)):
+    _, user_id = verify_token(token)
+    async with read_session_factory(user_id)() as db:
+        yield db
+
+
+# The caller of a GET endpoint, looked up through the read session so the primary isn't touched
+async def get_current_read_user(db: AsyncSession = Depends(get_read_db), token: str = Depends(http_bearer)):
+    return await authenticate(db, token)
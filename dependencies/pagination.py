@@ -0,0 +1,112 @@
+# dependencies/pagination.py
+
+import base64
+import binascii
+import json
+from datetime import datetime
+from typing import Optional
+
+from fastapi import HTTPException, Query, status
+from sqlalchemy import func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+
+class PageParams:
+    """Query parameters shared by every keyset-paginated list endpoint"""
+
+    def __init__(
+        self,
+        limit: int = Query(50, ge=1, le=200, description='Maximum number of items per page'),
+        cursor: Optional[str] = Query(None, description='Opaque cursor taken from a previous next_cursor'),
+        include_total: bool = Query(False, description='Include an approximate total count'),
+    ):
+        self.limit = limit
+        self.cursor = cursor
+        self.include_total = include_total
+
+
+def encode_cursor(sort_value: datetime, *tiebreakers) -> str:
+    # The cursor is the sort key of the last row on the page, so it is opaque to clients
+    raw = json.dumps([sort_value.isoformat(), *tiebreakers]).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_cursor(cursor: str, tiebreakers=(int,)):
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        sort_value, *values = json.loads(base64.urlsafe_b64decode(padded))
+        if len(values) != len(tiebreakers):
+            raise ValueError('cursor has the wrong number of keys')
+        return (datetime.fromisoformat(sort_value), *(cast(value) for cast, value in zip(tiebreakers, values)))
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid pagination cursor'
+        )
+
+
+def encode_offset_cursor(offset: int) -> str:
+    # For result sets ordered by a computed score, where there is no stable key to seek past
+    raw = json.dumps({'offset': offset}).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip('=')
+
+
+def decode_offset_cursor(cursor: str) -> int:
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        offset = int(json.loads(base64.urlsafe_b64decode(padded))['offset'])
+    except (binascii.Error, ValueError, TypeError, KeyError):
+        offset = -1
+
+    if offset < 0:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail='Invalid pagination cursor'
+        )
+    return offset
+
+
+async def estimate_total(db: AsyncSession, statement) -> int:
+    count_statement = statement.order_by(None)
+
+    # COUNT(*) walks every matching row, so on Postgres we ask the planner for its row estimate instead
+    if db.bind.dialect.name != 'postgresql':
+        result = await db.execute(select(func.count()).select_from(count_statement.subquery()))
+        return result.scalar_one()
+
+    compiled = count_statement.compile(
+        dialect=db.bind.dialect,
+        compile_kwargs={'literal_binds': True}
+    )
+    connection = await db.connection()
+    plan = (await connection.exec_driver_sql(f'EXPLAIN (FORMAT JSON) {compiled}')).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+async def paginate(db: AsyncSession, statement, params: PageParams, sort_column, id_column, rows: bool = False):
+    # rows=True keeps the result as column tuples (for a select of columns) instead of ORM instances
+    total_estimate = await estimate_total(db, statement) if params.include_total else None
+
+    # Seek past the last row of the previous page instead of using OFFSET
+    if params.cursor:
+        sort_value, last_id = decode_cursor(params.cursor)
+        statement = statement.where(tuple_(sort_column, id_column) > (sort_value, last_id))
+
+    # Fetch one extra row to know whether another page exists
+    result = await db.execute(statement.order_by(sort_column, id_column).limit(params.limit + 1))
+    rows = result.all() if rows else result.scalars().all()
+
+    next_cursor = None
+    if len(rows) > params.limit:
+        rows = rows[:params.limit]
+        last_row = rows[-1]
+        next_cursor = encode_cursor(getattr(last_row, sort_column.key), last_row.id)
+
+    return {
+        'items': rows,
+        'next_cursor': next_cursor,
+        'total_estimate': total_estimate,
+    }
@@ -1,11 +1,52 @@
+import asyncio
+from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from controllers.users import router as UserRouter
 from controllers.businesses import router as BusinessesRouter
 from controllers.licenses import router as LicensesRouter
 from controllers.compliance_tasks import router as ComplianceTasksRouter
+from controllers.dashboard import router as DashboardRouter
+from controllers.export import router as ExportRouter
+from controllers.search import router as SearchRouter
+from controllers.timeline import router as TimelineRouter
+from controllers.metrics import router as MetricsRouter
+from services.status_sweeper import run_status_sweeper
+from services.reminders import run_reminder_scheduler
+from services.archive import run_archiver
+from services.token_revocation import revocation_list, run_revocation_refresher
+from services.metrics import MetricsMiddleware
+from database import async_engine, replica_engine
+from config.environment import status_sweep_interval, reminder_interval, archive_interval, token_revocation_refresh
 
-app = FastAPI()
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Load revoked tokens before serving, so a restarted node never accepts a logged-out token
+    await revocation_list.refresh()
+
+    # Start background jobs with the app and cancel them on shutdown
+    background_tasks = []
+    if token_revocation_refresh > 0:
+        background_tasks.append(asyncio.create_task(run_revocation_refresher(token_revocation_refresh)))
+    if status_sweep_interval > 0:
+        background_tasks.append(asyncio.create_task(run_status_sweeper(status_sweep_interval)))
+    if reminder_interval > 0:
+        background_tasks.append(asyncio.create_task(run_reminder_scheduler(reminder_interval)))
+    if archive_interval > 0:
+        background_tasks.append(asyncio.create_task(run_archiver(archive_interval)))
+
+    yield
+
+    for task in background_tasks:
+        task.cancel()
+    await asyncio.gather(*background_tasks, return_exceptions=True)
+
+    # Close pooled connections; aiosqlite's connection threads would otherwise keep the process alive
+    await async_engine.dispose()
+    if replica_engine:
+        await replica_engine.dispose()
+
+app = FastAPI(lifespan=lifespan)
 
 origins = [
     "http://127.0.0.1:5173",
@@ -20,12 +61,20 @@ app.add_middleware(
     allow_headers=["*"]
 )
 
+# Outermost, so the recorded latency covers every other middleware
+app.add_middleware(MetricsMiddleware)
+
 app.include_router(UserRouter, prefix="/api/auth")
 app.include_router(BusinessesRouter, prefix="/api", tags=["Businesses"])
 app.include_router(LicensesRouter, prefix="/api", tags=["Licenses"])
 app.include_router(ComplianceTasksRouter, prefix="/api", tags=["Compliance Tasks"])
+app.include_router(DashboardRouter, prefix="/api", tags=["Dashboard"])
+app.include_router(ExportRouter, prefix="/api", tags=["Export"])
+app.include_router(SearchRouter, prefix="/api", tags=["Search"])
+app.include_router(TimelineRouter, prefix="/api", tags=["Timeline"])
+app.include_router(MetricsRouter)
 
 @app.get('/')
-def home():
+async def home():
     return {'message': 'Welcome to CompliTrack API! Visit /docs for API documentation.'}
 
@@ -0,0 +1,47 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, Enum as SQLEnum
+from datetime import datetime, timezone
+from .base import BaseModel, UTCDateTime
+from .license import LicenseStatusEnum
+from .compliance_task import TaskStatusEnum
+
+# Cold copies of licenses and compliance tasks past the archive horizon (see services/archive.py).
+# Rows keep their original id and timestamps, so they can be listed alongside live rows;
+# the live tables use AUTOINCREMENT on SQLite so an archived id is never handed out again.
+
+class LicenseArchiveModel(BaseModel):
+    """A license moved out of the live table once it expired more than ARCHIVE_AFTER_DAYS ago"""
+    __tablename__ = "licenses_archive"
+    __table_args__ = (
+        # Matches the list endpoint's filter and page order, like ix_licenses_business_id_expiry_date
+        Index('ix_licenses_archive_business_id_expiry_date', 'business_id', 'expiry_date', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # The id it had in licenses
+    name = Column(String(255), nullable=False)
+    description = Column(Text, nullable=True)
+    issue_date = Column(UTCDateTime, nullable=False)
+    expiry_date = Column(UTCDateTime, nullable=False)
+    status = Column(SQLEnum(LicenseStatusEnum, name='license_status_enum'), nullable=False)
+    archived_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    # Archived rows still go when their business does
+    business_id = Column(Integer, ForeignKey('businesses.id', ondelete='CASCADE'), nullable=False)
+
+class ComplianceTaskArchiveModel(BaseModel):
+    """A submitted compliance task moved out of the live table once due more than ARCHIVE_AFTER_DAYS ago"""
+    __tablename__ = "compliance_tasks_archive"
+    __table_args__ = (
+        # Matches the list endpoint's filter and page order, like ix_compliance_tasks_business_id_due_date
+        Index('ix_compliance_tasks_archive_business_id_due_date', 'business_id', 'due_date', 'id'),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=False)  # The id it had in compliance_tasks
+    title = Column(String(255), nullable=False)
+    description = Column(Text, nullable=False)
+    due_date = Column(UTCDateTime, nullable=False)
+    submission_date = Column(UTCDateTime, nullable=True)
+    status = Column(SQLEnum(TaskStatusEnum, name='task_status_enum'), nullable=False)
+    archived_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+
+    # Archived rows still go when their business does
+    business_id = Column(Integer, ForeignKey('businesses.id', ondelete='CASCADE'), nullable=False)
@@ -1,12 +1,95 @@
-from sqlalchemy import Column, DateTime, Integer, func
+from datetime import datetime, timezone
+from sqlalchemy import DDL, Column, DateTime, Integer, TypeDecorator, event, func, text
 from sqlalchemy.ext.declarative import declarative_base
 
 # Create a base class for all models
 Base = declarative_base()
 
+# The trigram indexes need pg_trgm; migrations install it, this covers metadata.create_all() (seed, benchmarks)
+event.listen(Base.metadata, 'before_create', DDL('CREATE EXTENSION IF NOT EXISTS pg_trgm').execute_if(dialect='postgresql'))
+
+class UTCDateTime(TypeDecorator):
+    """DateTime column that stores timezone-aware values as naive UTC"""
+    impl = DateTime
+    cache_ok = True
+
+    # asyncpg refuses aware datetimes for TIMESTAMP WITHOUT TIME ZONE columns, so normalise them first
+    def process_bind_param(self, value, dialect):
+        if value is not None and value.tzinfo is not None:
+            value = value.astimezone(timezone.utc).replace(tzinfo=None)
+        return value
+
+# Text search configuration shared by the search indexes and the queries that must match them
+SEARCH_CONFIG = text("'english'")
+
+def search_document(*columns):
+    """tsvector over the given text columns, spelled exactly like the expression indexes on them"""
+    # Literals are rendered inline (not bound) so Postgres can match the query against the index expression
+    document = func.coalesce(columns[0], text("''"))
+    for column in columns[1:]:
+        document = document.op('||')(text("' '")).op('||')(func.coalesce(column, text("''")))
+    return func.to_tsvector(SEARCH_CONFIG, document)
+
+# SQLite searches an FTS5 table kept in sync by triggers instead
+# (record type, table, title column, column holding the owning business id)
+SEARCHABLE_TABLES = [
+    ('business', 'businesses', 'name', 'id'),
+    ('license', 'licenses', 'name', 'business_id'),
+    ('compliance_task', 'compliance_tasks', 'title', 'business_id'),
+]
+SEARCH_TRIGGERS = [f'{table}_search_{action}' for _, table, _, _ in SEARCHABLE_TABLES for action in ('insert', 'update', 'delete')]
+
+def _search_index_statements():
+    yield "DROP TABLE IF EXISTS search_index"
+    yield (
+        "CREATE VIRTUAL TABLE search_index USING fts5("
+        "record_type UNINDEXED, record_id UNINDEXED, business_id UNINDEXED, "
+        "title, description, tokenize='porter')"
+    )
+    for record_type, table, title, business_id in SEARCHABLE_TABLES:
+        insert = (
+            "INSERT INTO search_index (record_type, record_id, business_id, title, description) "
+            f"VALUES ('{record_type}', new.id, new.{business_id}, new.{title}, new.description);"
+        )
+        delete = f"DELETE FROM search_index WHERE record_type = '{record_type}' AND record_id = old.id;"
+        for action, body in (('insert', insert), ('update', f'{delete} {insert}'), ('delete', delete)):
+            yield f"DROP TRIGGER IF EXISTS {table}_search_{action}"
+            yield f"CREATE TRIGGER {table}_search_{action} AFTER {action.upper()} ON {table} BEGIN {body} END"
+        # Index the rows that existed before the table was created
+        yield (
+            "INSERT INTO search_index (record_type, record_id, business_id, title, description) "
+            f"SELECT '{record_type}', id, {business_id}, {title}, description FROM {table}"
+        )
+
+def install_search_index(connection):
+    """Build SQLite's search_index and its triggers, unless all of them are already in place"""
+    existing = {name for (name,) in connection.exec_driver_sql(
+        "SELECT name FROM sqlite_master WHERE name = 'search_index' OR type = 'trigger'"
+    )}
+    if 'search_index' in existing and existing.issuperset(SEARCH_TRIGGERS):
+        return
+    # Rebuilt from scratch: a table whose triggers are gone holds rows for ids that may since have been reused
+    for statement in _search_index_statements():
+        connection.exec_driver_sql(statement)
+
+# drop_all drops the triggers with their tables but knows nothing of the FTS5 table, so both are tied to metadata
+@event.listens_for(Base.metadata, 'after_create')
+def _create_search_index(target, connection, **kw):
+    if connection.dialect.name == 'sqlite' and all(table in target.tables for _, table, _, _ in SEARCHABLE_TABLES):
+        install_search_index(connection)
+
+@event.listens_for(Base.metadata, 'before_drop')
+def _drop_search_index(target, connection, **kw):
+    if connection.dialect.name == 'sqlite':
+        connection.exec_driver_sql("DROP TABLE IF EXISTS search_index")
+
+def _utcnow():
+    # Stamped in Python: SQLite's CURRENT_TIMESTAMP has whole seconds, too coarse for the ETags built from updated_at
+    return datetime.now(timezone.utc)
+
 class BaseModel(Base):
     __abstract__ = True  # Prevents this class from being mapped to a database table
 
     id = Column(Integer, primary_key=True, index=True)  # Unique identifier for each record
-    created_at = Column(DateTime, default=func.now())  # Timestamp for when the record was created
-    updated_at = Column(DateTime, default=func.now(), onupdate=func.now())  # Auto-updates on changes
+    created_at = Column(UTCDateTime, default=_utcnow)  # Timestamp for when the record was created
+    updated_at = Column(UTCDateTime, default=_utcnow, onupdate=_utcnow)  # Auto-updates on changes
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
-from .base import BaseModel
+from .base import BaseModel, UTCDateTime, search_document
 from enum import Enum
 from .compliance_task import ComplianceTaskModel
 
@@ -18,6 +18,12 @@ class IndustryEnum(str, Enum):
 
 class BusinessModel(BaseModel):
     __tablename__ = "businesses"
+    __table_args__ = (
+        # Indexes matching the list filters and page order (see migration 7d2f91c3a8b4)
+        Index('ix_businesses_user_id_created_at', 'user_id', 'created_at', 'id'),
+        Index('ix_businesses_user_id_industry', 'user_id', 'industry'),
+        Index('ix_businesses_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
@@ -25,12 +31,21 @@ class BusinessModel(BaseModel):
     cr_number = Column(String(50), nullable=False, unique=True)
     industry = Column(SQLEnum(IndustryEnum, name='industry_enum'), nullable=False)
     image_url = Column(Text, nullable=True)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     # Foreign key linking to users table
     user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
 
     # Relationships - these let us access related data easily!
-    user = relationship('UserModel', back_populates='businesses')
-    licenses = relationship('LicenseModel', back_populates='business', cascade='all, delete-orphan')
-    compliance_tasks = relationship('ComplianceTaskModel', back_populates='business', cascade='all, delete-orphan')
\ No newline at end of file
+    # lazy='raise': every query names what it loads, so an accidental lazy load (N+1) fails loudly
+    # passive_deletes: deleting a business leaves its licenses and tasks to the foreign keys' ON DELETE CASCADE
+    user = relationship('UserModel', back_populates='businesses', lazy='raise')
+    licenses = relationship('LicenseModel', back_populates='business', cascade='all, delete-orphan', passive_deletes=True, lazy='raise')
+    compliance_tasks = relationship('ComplianceTaskModel', back_populates='business', cascade='all, delete-orphan', passive_deletes=True, lazy='raise')
+
+# Full-text search index over name and description (see migration 3b8e5f0d6c21); SQLite uses FTS5 instead
+Index(
+    'ix_businesses_search',
+    search_document(BusinessModel.name, BusinessModel.description),
+    postgresql_using='gin'
+).ddl_if(dialect='postgresql')
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
-from .base import BaseModel
+from .base import BaseModel, UTCDateTime, search_document
 from enum import Enum
 
 class TaskStatusEnum(str, Enum):
@@ -11,18 +11,35 @@ class TaskStatusEnum(str, Enum):
 
 class ComplianceTaskModel(BaseModel):
     __tablename__ = "compliance_tasks"
+    __table_args__ = (
+        # Indexes matching the list filters and page order (see migration 7d2f91c3a8b4)
+        Index('ix_compliance_tasks_business_id_due_date', 'business_id', 'due_date', 'id'),
+        Index('ix_compliance_tasks_business_id_status_due_date', 'business_id', 'status', 'due_date'),
+        Index('ix_compliance_tasks_due_date', 'due_date'),  # Reminder windows scan dates across all businesses (see migration 5e1a7c9b2d40)
+        Index('ix_compliance_tasks_title_trgm', 'title', postgresql_using='gin', postgresql_ops={'title': 'gin_trgm_ops'}),
+        # Archived rows keep their id, so SQLite must never reuse one (Postgres sequences never do)
+        {'sqlite_autoincrement': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     title = Column(String(255), nullable=False)
     description = Column(Text, nullable=False)  # Text allows longer content than String
-    due_date = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    submission_date = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=True)
+    due_date = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    submission_date = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=True)
     status = Column(SQLEnum(TaskStatusEnum, name='task_status_enum'), nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     # Foreign key linking to businesses table
     business_id = Column(Integer, ForeignKey('businesses.id', ondelete='CASCADE'), nullable=False)
     
 
     # Relationships - these let us access related data easily!
-    business = relationship('BusinessModel', back_populates='compliance_tasks')
+    # lazy='raise': every query names what it loads, so an accidental lazy load (N+1) fails loudly
+    business = relationship('BusinessModel', back_populates='compliance_tasks', lazy='raise')
+
+# Full-text search index over title and description (see migration 3b8e5f0d6c21); SQLite uses FTS5 instead
+Index(
+    'ix_compliance_tasks_search',
+    search_document(ComplianceTaskModel.title, ComplianceTaskModel.description),
+    postgresql_using='gin'
+).ddl_if(dialect='postgresql')
@@ -1,7 +1,7 @@
-from sqlalchemy import Column, Integer, String, Text, ForeignKey, DateTime, Enum as SQLEnum
+from sqlalchemy import Column, Integer, String, Text, ForeignKey, Index, Enum as SQLEnum
 from sqlalchemy.orm import relationship
 from datetime import datetime, timezone
-from .base import BaseModel
+from .base import BaseModel, UTCDateTime, search_document
 from enum import Enum
 
 class LicenseStatusEnum(str, Enum):
@@ -11,18 +11,35 @@ class LicenseStatusEnum(str, Enum):
 
 class LicenseModel(BaseModel):
     __tablename__ = "licenses"
+    __table_args__ = (
+        # Indexes matching the list filters and page order (see migration 7d2f91c3a8b4)
+        Index('ix_licenses_business_id_expiry_date', 'business_id', 'expiry_date', 'id'),
+        Index('ix_licenses_business_id_status_expiry_date', 'business_id', 'status', 'expiry_date'),
+        Index('ix_licenses_expiry_date', 'expiry_date'),  # Reminder windows scan dates across all businesses (see migration 5e1a7c9b2d40)
+        Index('ix_licenses_name_trgm', 'name', postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'}),
+        # Archived rows keep their id, so SQLite must never reuse one (Postgres sequences never do)
+        {'sqlite_autoincrement': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     name = Column(String(255), nullable=False)
     description = Column(Text, nullable=True)  # Text allows longer content than String
-    issue_date = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
-    expiry_date = Column(DateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    issue_date = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
+    expiry_date = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc), nullable=False)
     status = Column(SQLEnum(LicenseStatusEnum, name='license_status_enum'), nullable=False)
-    created_at = Column(DateTime, default=lambda: datetime.now(timezone.utc))
+    created_at = Column(UTCDateTime, default=lambda: datetime.now(timezone.utc))
 
     # Foreign key linking to businesses table
     business_id = Column(Integer, ForeignKey('businesses.id', ondelete='CASCADE'), nullable=False)
     
 
     # Relationships - these let us access related data easily!
-    business = relationship('BusinessModel', back_populates='licenses')
+    # lazy='raise': every query names what it loads, so an accidental lazy load (N+1) fails loudly
+    business = relationship('BusinessModel', back_populates='licenses', lazy='raise')
+
+# Full-text search index over name and description (see migration 3b8e5f0d6c21); SQLite uses FTS5 instead
+Index(
+    'ix_licenses_search',
+    search_document(LicenseModel.name, LicenseModel.description),
+    postgresql_using='gin'
+).ddl_if(dialect='postgresql')
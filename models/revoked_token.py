@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index
+from .base import BaseModel, UTCDateTime
+
+class RevokedTokenModel(BaseModel):
+    """A token (by its jti claim) that was logged out or revoked before its exp"""
+    __tablename__ = "revoked_tokens"
+    __table_args__ = (
+        # Nodes refresh their in-memory revocation list by reading only the rows revoked since their last look
+        Index('ix_revoked_tokens_revoked_at', 'revoked_at'),
+        Index('ix_revoked_tokens_expires_at', 'expires_at'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    jti = Column(String(64), nullable=False, unique=True)
+    expires_at = Column(UTCDateTime, nullable=False)  # The token's exp; after it the row is no longer needed
+    revoked_at = Column(UTCDateTime, nullable=False)  # Set by the app in UTC, not the database clock
+
+    # Foreign key linking to users table
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
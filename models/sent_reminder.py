@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, UniqueConstraint
+from .base import BaseModel, UTCDateTime
+
+class SentReminderModel(BaseModel):
+    """One reminder window already delivered for a license expiry or task due date"""
+    __tablename__ = "sent_reminders"
+    __table_args__ = (
+        # Claiming a reminder is an insert against this constraint, so each one goes out once across nodes
+        UniqueConstraint('record_type', 'record_id', 'window_days', 'due_date', name='uq_sent_reminders_record_window'),
+        Index('ix_sent_reminders_due_date', 'due_date'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    record_type = Column(String(20), nullable=False)  # 'license' or 'compliance_task'
+    record_id = Column(Integer, nullable=False)
+    window_days = Column(Integer, nullable=False)
+    due_date = Column(UTCDateTime, nullable=False)  # A moved expiry or due date gets reminded again
+
+    # Foreign key linking to users table
+    user_id = Column(Integer, ForeignKey('users.id', ondelete='CASCADE'), nullable=False)
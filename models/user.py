@@ -1,3 +1,4 @@
+import uuid
 from sqlalchemy import Column, Integer, String
 from .base import BaseModel
 from passlib.context import CryptContext
@@ -5,9 +6,17 @@ from datetime import datetime, timezone, timedelta  # New import for timestamps
 import jwt
 from sqlalchemy.orm import relationship
 
+from config.environment import secret, bcrypt_rounds
+
 # Creating a password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
-from config.environment import secret
+# Pinning min/max to the configured cost makes needs_update() flag hashes made with any other cost
+pwd_context = CryptContext(
+    schemes=["bcrypt"],
+    deprecated="auto",
+    bcrypt__default_rounds=bcrypt_rounds,
+    bcrypt__min_rounds=bcrypt_rounds,
+    bcrypt__max_rounds=bcrypt_rounds,
+)
 
 class UserModel(BaseModel):
 
@@ -18,8 +27,9 @@ class UserModel(BaseModel):
     email = Column(String, nullable=False, unique=True)
     password_hash = Column(String, nullable=True)  # Add new field for storing the hashed password
 
-    # Add relationship with business
-    businesses = relationship('BusinessModel', back_populates='user', cascade='all, delete-orphan')
+    # Add relationship with business (lazy='raise' - load it explicitly)
+    # passive_deletes: the database cascades a user's deletion to their businesses without loading them
+    businesses = relationship('BusinessModel', back_populates='user', cascade='all, delete-orphan', passive_deletes=True, lazy='raise')
 
     # Method to hash and store the password
     def set_password(self, password: str):
@@ -33,7 +43,8 @@ class UserModel(BaseModel):
             "exp": datetime.now(timezone.utc) + timedelta(days=1),
             "iat": datetime.now(timezone.utc),
             "sub": str(self.id),
-            "username": self.username
+            "username": self.username,
+            "jti": uuid.uuid4().hex  # Identifies this token, so logout can revoke it alone
         }
 
         token = jwt.encode(payload, secret, algorithm="HS256")
@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session, sessionmaker
 from models.base import Base
-from data.tea_data import teas_list, comments_list
+# Imports every model, which has to happen before data.user_data builds its UserModel objects
+from benchmarks.generate import generate, BENCHMARK_PASSWORD
 from data.user_data import user_list
 from config.environment import db_URI
 from sqlalchemy import create_engine
@@ -17,19 +18,14 @@ try:
     print("Seeding the database...")
     db = SessionLocal()
 
-    # Seed teas first, as comments depend on them
-    db.add_all(teas_list)
-    db.commit()
-
-    # Seed comments after teas
-    db.add_all(comments_list)
-    db.commit()
-    db.close()
-
     db.add_all(user_list)
     db.commit()
     db.close()
 
+    # A small synthetic dataset so the businesses, licenses and tasks endpoints have data
+    counts = generate(users=10, businesses=30, licenses=150, tasks=150)
+    print(f"Generated {counts} (password '{BENCHMARK_PASSWORD}')")
+
     print("Database seeding complete! 👋")
 except Exception as e:
     print("An error occurred:", e)
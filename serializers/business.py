@@ -1,7 +1,9 @@
-from pydantic import BaseModel, Field
+from functools import lru_cache
+from pydantic import BaseModel, Field, create_model
 from typing import Optional, List
 from datetime import datetime
 from .user import UserResponseSchema
+from .compliance_task import ComplianceTaskSchema
 from models.business import IndustryEnum
 from models.license import LicenseStatusEnum
 
@@ -61,4 +63,35 @@ class BusinessSchema(BaseModel):
     licenses: List[LicenseSchema] = []
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+# Scalar fields that can be picked with ?fields=, and nested relations that can be added with ?expand=
+BUSINESS_FIELDS = ('id', 'name', 'description', 'cr_number', 'industry', 'image_url', 'created_at')
+BUSINESS_EXPANSIONS = {
+    'user': UserResponseSchema,
+    'licenses': List[LicenseSchema],
+    'compliance_tasks': List[ComplianceTaskSchema],
+}
+
+class BusinessFieldsetSchema(BaseModel):
+    """Schema for business data limited by ?fields= and ?expand=; anything not requested is left out"""
+    id: Optional[int] = None
+    name: Optional[str] = None
+    description: Optional[str] = None
+    cr_number: Optional[str] = None
+    industry: Optional[IndustryEnum] = None
+    image_url: Optional[str] = None
+    created_at: Optional[datetime] = None
+    user: Optional[UserResponseSchema] = None
+    licenses: Optional[List[LicenseSchema]] = None
+    compliance_tasks: Optional[List[ComplianceTaskSchema]] = None
+
+    class Config:
+        from_attributes = True
+
+@lru_cache(maxsize=None)
+def business_schema_for(fields: tuple, expand: tuple):
+    """Build (once per combination) a schema that reads only the requested attributes off a business"""
+    definitions = {name: (BusinessSchema.model_fields[name].annotation, ...) for name in fields}
+    definitions.update({name: (BUSINESS_EXPANSIONS[name], ...) for name in expand})
+    return create_model('BusinessFieldset', __config__={'from_attributes': True}, **definitions)
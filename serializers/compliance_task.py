@@ -1,6 +1,6 @@
 from pydantic import BaseModel, Field
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 from models.compliance_task import TaskStatusEnum
 
 class ComplianceTaskCreate(BaseModel):
@@ -10,6 +10,22 @@ class ComplianceTaskCreate(BaseModel):
     status:TaskStatusEnum=TaskStatusEnum.PENDING
     submission_date:Optional[datetime]=None
 
+class ComplianceTaskBatchCreate(BaseModel):
+    items: List[ComplianceTaskCreate]=Field(...,min_length=1,max_length=500)
+
+class ComplianceTaskBatchDelete(BaseModel):
+    ids: List[int]=Field(...,min_length=1,max_length=500)
+
+class ComplianceTaskStatusTransition(BaseModel):
+    status: TaskStatusEnum
+    submission_date: Optional[datetime]=Field(None,description="Defaults to now when moving tasks to Submitted")
+    # Pick the tasks by id, or by any combination of the filters below
+    ids: Optional[List[int]]=Field(None,min_length=1,max_length=500)
+    business_id: Optional[int]=None
+    current_status: Optional[TaskStatusEnum]=None
+    due_before: Optional[datetime]=None
+    due_after: Optional[datetime]=None
+
 class ComplianceTaskUpdate(BaseModel):
     title: Optional[str]=Field(None,min_length=1,max_length=255)
     description:Optional[str]=None
@@ -0,0 +1,18 @@
+from pydantic import BaseModel
+from typing import Dict, List, Optional
+from datetime import datetime
+from models.license import LicenseStatusEnum
+from models.compliance_task import TaskStatusEnum
+
+class BusinessDashboardSchema(BaseModel):
+    """Compliance summary for a single business"""
+    business_id: int
+    name: str
+    licenses_by_status: Dict[LicenseStatusEnum, int]
+    tasks_by_status: Dict[TaskStatusEnum, int]
+    next_license_expiry: Optional[datetime] = None  # Earliest expiry that hasn't passed yet
+    next_task_due: Optional[datetime] = None  # Earliest upcoming due date of a task not yet submitted
+
+class DashboardSchema(BaseModel):
+    """Schema for returning the dashboard of every business owned by the user"""
+    businesses: List[BusinessDashboardSchema]
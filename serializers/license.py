@@ -1,5 +1,5 @@
-from pydantic import BaseModel, Field
-from typing import Optional
+from pydantic import BaseModel, Field, model_validator
+from typing import List, Optional
 from datetime import datetime
 from models.license import LicenseStatusEnum
 
@@ -45,4 +45,21 @@ class LicenseSchema(BaseModel):
     business_id: int
 
     class Config:
-        from_attributes = True
\ No newline at end of file
+        from_attributes = True
+
+class LicenseBatchItem(LicenseCreate):
+    """A batch license; its dates are checked by the schema so errors carry the item's index like any other"""
+
+    @model_validator(mode='after')
+    def check_dates(self):
+        if self.expiry_date <= self.issue_date:
+            raise ValueError('Expiry date must be after issue date')
+        return self
+
+class LicenseBatchCreate(BaseModel):
+    """Schema for creating many licenses for one business in a single request"""
+    items: List[LicenseBatchItem] = Field(..., min_length=1, max_length=500, description="Licenses to create")
+
+class LicenseBatchDelete(BaseModel):
+    """Schema for deleting many licenses of one business in a single request"""
+    ids: List[int] = Field(..., min_length=1, max_length=500, description="IDs of the licenses to delete")
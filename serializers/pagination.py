@@ -0,0 +1,10 @@
+from pydantic import BaseModel
+from typing import Generic, List, Optional, TypeVar
+
+T = TypeVar('T')
+
+class Page(BaseModel, Generic[T]):
+    """Schema for a single page of a keyset-paginated list"""
+    items: List[T]
+    next_cursor: Optional[str] = None  # Pass back as ?cursor= to fetch the next page
+    total_estimate: Optional[int] = None  # Approximate total, only set when include_total=true
@@ -0,0 +1,46 @@
+# serializers/rows.py
+
+import json
+from datetime import datetime
+
+from sqlalchemy import select
+
+# orjson encodes datetimes and enums natively in C; the stdlib fallback produces the same JSON, only slower
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f'Object of type {type(value).__name__} is not JSON serializable')
+
+
+def dumps(body) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, default=_default, ensure_ascii=False, separators=(',', ':')).encode()
+
+
+class RowSerializer:
+    """Selects a schema's fields as plain column tuples and encodes pages of them straight to JSON.
+
+    Skips building ORM instances and validating them through the schema, so it's only for schemas
+    whose fields are all plain columns of the model.
+    """
+
+    def __init__(self, model, schema):
+        # Worked out once per endpoint rather than per request
+        self.keys = tuple(schema.model_fields)
+        self.columns = tuple(getattr(model, key) for key in self.keys)
+
+    def select(self, model=None):
+        # Another model with the same columns (e.g. an archive table) can be selected the same way
+        columns = self.columns if model is None else tuple(getattr(model, key) for key in self.keys)
+        return select(*columns)
+
+    def encode_page(self, page: dict) -> bytes:
+        keys = self.keys
+        return dumps({**page, 'items': [dict(zip(keys, row)) for row in page['items']]})
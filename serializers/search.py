@@ -0,0 +1,11 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+
+class SearchResultSchema(BaseModel):
+    """Schema for a single ranked search hit"""
+    record_type: Literal['business', 'license', 'compliance_task']
+    id: int
+    business_id: int  # The owning business, or the business itself for record_type 'business'
+    title: str  # Business or license name, or task title
+    description: Optional[str] = None
+    rank: float  # Higher is a better match; only comparable within one search
@@ -0,0 +1,13 @@
+from pydantic import BaseModel
+from typing import Literal
+from datetime import datetime
+
+class TimelineEventSchema(BaseModel):
+    """Schema for a single license expiry or compliance task due date on the timeline"""
+    event_type: Literal['license_expiry', 'task_due']
+    date: datetime  # expiry_date for licenses, due_date for tasks
+    id: int  # License or compliance task id, depending on event_type
+    title: str  # License name or task title
+    status: str
+    business_id: int
+    business_name: str
@@ -0,0 +1,119 @@
+# services/archive.py
+#
+# Keeps the live licenses and compliance_tasks tables down to the working set by moving rows
+# past the archive horizon (ARCHIVE_AFTER_DAYS after expiry_date / due_date) into
+# licenses_archive and compliance_tasks_archive, chunked by id range. List endpoints only
+# read the archives when asked with include_archived=true. Run in-process from main.py, or
+# once from the CLI:
+#
+#     python -m services.archive [--after-days 365] [--chunk-size 5000]
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, func, insert, select, union_all
+
+from database import async_engine
+# Import ALL models so their relationships resolve when run from the CLI
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from models.archive import LicenseArchiveModel, ComplianceTaskArchiveModel
+from services.response_cache import response_cache
+from config.environment import archive_after_days, archive_chunk_size
+
+logger = logging.getLogger(__name__)
+
+# (live model, archive model, date column, extra conditions for rows that are finished with)
+ARCHIVE_SOURCES = [
+    (LicenseModel, LicenseArchiveModel, LicenseModel.expiry_date, []),
+    # Late tasks that were never submitted still need action, so only submitted ones are archived
+    (ComplianceTaskModel, ComplianceTaskArchiveModel, ComplianceTaskModel.due_date,
+     [ComplianceTaskModel.status == TaskStatusEnum.SUBMITTED]),
+]
+
+
+def with_archive(live, archived):
+    """Union of a live and an archive query with the same columns, plus the columns to page the union by"""
+    combined = union_all(live, archived).subquery()
+    return select(combined), combined.c
+
+
+async def _archive_in_chunks(live, archive, conditions, chunk_size: int) -> int:
+    async with async_engine.connect() as connection:
+        lowest_id, highest_id = (await connection.execute(select(func.min(live.id), func.max(live.id)))).one()
+
+    if lowest_id is None:
+        return 0
+
+    # Everything the archive keeps: the row's data, its id and its timestamps
+    columns = [column for column in live.__table__.columns if column.key in archive.__table__.columns]
+
+    moved = 0
+    for start_id in range(lowest_id, highest_id + 1, chunk_size):
+        async with async_engine.begin() as connection:
+            # Copy exactly what was deleted, so a row updated mid-run is never archived twice or lost
+            result = await connection.execute(
+                delete(live.__table__)
+                .where(live.id >= start_id, live.id < start_id + chunk_size, *conditions)
+                .returning(*columns)
+            )
+            rows = [dict(row) for row in result.mappings()]
+            if rows:
+                await connection.execute(insert(archive.__table__), rows)
+        moved += len(rows)
+
+    return moved
+
+
+async def archive_rows(now: datetime = None, after_days: int = archive_after_days, chunk_size: int = archive_chunk_size) -> dict:
+    now = now or datetime.now(timezone.utc)
+    horizon = now - timedelta(days=after_days)
+
+    counts = {}
+    for live, archive, date_column, conditions in ARCHIVE_SOURCES:
+        counts[live.__tablename__] = await _archive_in_chunks(
+            live, archive, [date_column < horizon, *conditions], chunk_size
+        )
+
+    # Archived rows drop out of the default lists, and the move doesn't track whose they were
+    if any(counts.values()):
+        response_cache.clear()
+
+    return counts
+
+
+async def run_archiver(interval: int):
+    while True:
+        try:
+            counts = await archive_rows()
+            logger.info('Archive: %(licenses)s licenses and %(compliance_tasks)s compliance tasks archived', counts)
+        except Exception:
+            logger.exception('Archive run failed')
+
+        await asyncio.sleep(interval)
+
+
+async def _archive_once(after_days: int, chunk_size: int) -> dict:
+    try:
+        return await archive_rows(after_days=after_days, chunk_size=chunk_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Move licenses and compliance tasks past the archive horizon into the archive tables')
+    parser.add_argument('--after-days', type=int, default=archive_after_days, help='Days past expiry / due date before archiving')
+    parser.add_argument('--chunk-size', type=int, default=archive_chunk_size, help='Rows per id range')
+    args = parser.parse_args()
+
+    counts = asyncio.run(_archive_once(args.after_days, args.chunk_size))
+    print(f"Licenses archived: {counts['licenses']}")
+    print(f"Compliance tasks archived: {counts['compliance_tasks']}")
+
+
+if __name__ == "__main__":
+    main()
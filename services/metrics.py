@@ -0,0 +1,192 @@
+# services/metrics.py
+#
+# In-process request and database metrics, rendered in the Prometheus text format by
+# GET /metrics. Everything runs on the event loop thread, so recording is a few
+# dict lookups and integer increments with no locking.
+
+import logging
+import time
+from bisect import bisect_left
+from contextvars import ContextVar
+
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+# Upper bounds in seconds, roughly doubling from 5ms to 10s
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+
+class Histogram:
+    """Cumulative-bucket histogram with one series per label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names, buckets):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = buckets
+        self._series = {}  # labels -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, labels: tuple, value: float):
+        series = self._series.get(labels)
+        if series is None:
+            series = self._series[labels] = [0] * (len(self.buckets) + 2)
+        series[bisect_left(self.buckets, value)] += 1
+        series[-1] += value
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} histogram'
+        for labels, series in self._series.items():
+            label_text = _labels(self.label_names, labels)
+            cumulative = 0
+            for bound, bucket_count in zip((*self.buckets, '+Inf'), series):
+                cumulative += bucket_count
+                yield f'{self.name}_bucket{{{label_text},le="{bound}"}} {cumulative}'
+            yield f'{self.name}_sum{{{label_text}}} {series[-1]}'
+            yield f'{self.name}_count{{{label_text}}} {cumulative}'
+
+
+class Counter:
+    """Monotonic counter with one series per label tuple"""
+
+    def __init__(self, name: str, help_text: str, label_names):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self._series = {}
+
+    def inc(self, labels: tuple, amount: int = 1):
+        self._series[labels] = self._series.get(labels, 0) + amount
+
+    def render(self):
+        yield f'# HELP {self.name} {self.help_text}'
+        yield f'# TYPE {self.name} counter'
+        for labels, value in self._series.items():
+            yield f'{self.name}{{{_labels(self.label_names, labels)}}} {value}'
+
+
+def _labels(names, values) -> str:
+    return ','.join(f'{name}="{value}"' for name, value in zip(names, values))
+
+
+request_duration = Histogram(
+    'http_request_duration_seconds', 'Request latency by route', ('method', 'route'), LATENCY_BUCKETS
+)
+responses_total = Counter('http_responses_total', 'Responses by route and status code', ('method', 'route', 'status'))
+db_queries = Histogram(
+    'db_queries_per_request', 'SQL statements executed per request', ('method', 'route'), QUERY_COUNT_BUCKETS
+)
+db_time = Histogram('db_time_seconds', 'Time spent executing SQL per request', ('method', 'route'), LATENCY_BUCKETS)
+db_pool_wait = Histogram(
+    'db_pool_wait_seconds', 'Time spent waiting for a pooled connection per request', ('method', 'route'), LATENCY_BUCKETS
+)
+requests_in_flight = 0
+
+
+class RequestStats:
+    __slots__ = ('queries', 'db_time', 'pool_wait', 'dialect')
+
+    def __init__(self):
+        self.queries = 0
+        self.db_time = 0.0
+        self.pool_wait = 0.0
+        self.dialect = None
+
+
+# Set by the middleware for each request; SQLAlchemy runs engine events in the caller's context
+current_request_stats: ContextVar = ContextVar('current_request_stats', default=None)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    # Kept on the statement's own context, so a statement that raises leaves nothing behind
+    if context is not None:
+        context._query_started = time.perf_counter()
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    started = getattr(context, '_query_started', None)
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.queries += 1
+        stats.db_time += time.perf_counter() - started if started is not None else 0.0
+        stats.dialect = conn.dialect.name
+
+
+def instrument_engine(engine):
+    """Count statements and their execution time against the current request"""
+    sync_engine = getattr(engine, 'sync_engine', engine)
+    event.listen(sync_engine, 'before_cursor_execute', _before_cursor_execute)
+    event.listen(sync_engine, 'after_cursor_execute', _after_cursor_execute)
+
+
+def record_pool_wait(seconds: float):
+    stats = current_request_stats.get()
+    if stats is not None:
+        stats.pool_wait += seconds
+
+
+def budget_for(endpoint, dialect: str):
+    """Statement budget declared with @query_budget for this dialect, or None when unchecked"""
+    budgets = getattr(endpoint, 'query_budget', None)
+    if budgets is None:
+        return None
+    return budgets.get(dialect, budgets['default'])
+
+
+class MetricsMiddleware:
+    """ASGI middleware recording latency, status codes and DB usage per route template"""
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] != 'http':
+            return await self.app(scope, receive, send)
+
+        global requests_in_flight
+        status_code = 500
+        stats = RequestStats()
+        token = current_request_stats.set(stats)
+
+        async def send_with_status(message):
+            nonlocal status_code
+            if message['type'] == 'http.response.start':
+                status_code = message['status']
+            await send(message)
+
+        requests_in_flight += 1
+        started = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            elapsed = time.perf_counter() - started
+            requests_in_flight -= 1
+            current_request_stats.reset(token)
+
+            # Label by the route template, not the raw path, so ids don't create a series each
+            route = scope.get('route')
+            labels = (scope['method'], route.path if route is not None else 'unmatched')
+            request_duration.observe(labels, elapsed)
+            responses_total.inc((*labels, status_code))
+            db_queries.observe(labels, stats.queries)
+            db_time.observe(labels, stats.db_time)
+            db_pool_wait.observe(labels, stats.pool_wait)
+
+            budget = budget_for(route.endpoint, stats.dialect) if route is not None else None
+            if budget is not None and stats.queries > budget:
+                logger.warning('%s %s ran %s SQL statements, over its budget of %s', *labels, stats.queries, budget)
+
+
+def render_metrics(extra_counters=()) -> str:
+    lines = [
+        '# HELP http_requests_in_flight Requests currently being served',
+        '# TYPE http_requests_in_flight gauge',
+        f'http_requests_in_flight {requests_in_flight}',
+    ]
+    for metric in (request_duration, responses_total, db_queries, db_time, db_pool_wait):
+        lines.extend(metric.render())
+    for name, help_text, value in extra_counters:
+        lines.extend((f'# HELP {name} {help_text}', f'# TYPE {name} counter', f'{name} {value}'))
+    return '\n'.join(lines) + '\n'
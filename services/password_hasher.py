@@ -0,0 +1,44 @@
+# services/password_hasher.py
+
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException, status
+
+from models.user import pwd_context
+from config.environment import password_hash_workers, password_hash_queue_size
+
+
+class PasswordHasher:
+    """Runs bcrypt on a dedicated, bounded thread pool so it never blocks the event loop"""
+
+    def __init__(self, workers: int, queue_size: int):
+        # bcrypt releases the GIL while hashing, so threads give real parallelism here
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='bcrypt')
+        self._capacity = workers + queue_size
+        self._pending = 0
+
+    async def _run(self, fn, *args):
+        # Shed load instead of letting a login storm queue up without bound
+        if self._pending >= self._capacity:
+            raise HTTPException(
+                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+                detail='Too many concurrent login or registration attempts, please retry',
+                headers={'Retry-After': '1'}
+            )
+
+        self._pending += 1
+        try:
+            return await asyncio.get_running_loop().run_in_executor(self._executor, fn, *args)
+        finally:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        return await self._run(pwd_context.hash, password)
+
+    async def verify_and_update(self, password: str, password_hash: str):
+        # Returns (is_valid, new_hash); new_hash is set when the stored hash uses an outdated cost
+        return await self._run(pwd_context.verify_and_update, password, password_hash)
+
+
+password_hasher = PasswordHasher(workers=password_hash_workers, queue_size=password_hash_queue_size)
@@ -0,0 +1,68 @@
+# services/query_budget.py
+#
+# Per-endpoint limits on the number of SQL statements a request may run. Routes declare
+# a budget with @query_budget(n); MetricsMiddleware logs requests that exceed it, and
+# assert_query_budget() turns it into a hard failure in tests/test_query_budgets.py, which
+# sends a request to every budgeted route:
+#
+#     assert_query_budget(client, 'GET', '/api/businesses', headers=auth_headers)
+
+from contextlib import contextmanager
+
+from sqlalchemy import event
+from starlette.routing import Match
+
+from database import async_engine
+from services.metrics import budget_for
+
+
+def query_budget(max_statements: int, **dialect_budgets):
+    """Declare the most SQL statements a single request to this endpoint may run.
+
+    Keyword arguments override the budget for one dialect, with None meaning unchecked.
+    """
+    def decorate(endpoint):
+        endpoint.query_budget = {'default': max_statements, **dialect_budgets}
+        return endpoint
+    return decorate
+
+
+@contextmanager
+def count_statements(engine=async_engine):
+    """Collect the SQL of every statement the engine runs inside the block"""
+    statements = []
+    sync_engine = getattr(engine, 'sync_engine', engine)
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(sync_engine, 'before_cursor_execute', record)
+    try:
+        yield statements
+    finally:
+        event.remove(sync_engine, 'before_cursor_execute', record)
+
+
+def _route_for(app, method: str, path: str):
+    scope = {'type': 'http', 'method': method, 'path': path}
+    for route in app.routes:
+        match, _ = route.matches(scope)
+        if match == Match.FULL:
+            return route
+    raise LookupError(f'No route matches {method} {path}')
+
+
+def assert_query_budget(client, method: str, url: str, **kwargs):
+    """Send a request through a TestClient and fail if it ran more statements than its route allows"""
+    route = _route_for(client.app, method, url.split('?', 1)[0])
+    if not hasattr(route.endpoint, 'query_budget'):
+        raise AssertionError(f'{method} {route.path} has no @query_budget')
+
+    with count_statements() as statements:
+        response = client.request(method, url, **kwargs)
+
+    budget = budget_for(route.endpoint, async_engine.dialect.name)
+    assert budget is None or len(statements) <= budget, (
+        f'{method} {route.path} ran {len(statements)} statements, budget is {budget}:\n' + '\n'.join(statements)
+    )
+    return response
@@ -0,0 +1,228 @@
+# services/reminders.py
+#
+# Sends each user one digest of the licenses and compliance tasks that have entered a
+# reminder window (REMINDER_WINDOWS days before expiry_date / due_date). Every window is
+# one range scan over the date index, and delivered reminders are claimed in
+# sent_reminders first, so restarts and extra nodes never send one twice. Run in-process
+# from main.py, or once from the CLI:
+#
+#     python -m services.reminders
+
+import argparse
+import asyncio
+import importlib
+import json
+import logging
+from collections import defaultdict
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, exists, select
+from sqlalchemy.dialects import postgresql, sqlite
+
+from database import async_engine
+# Import ALL models so their relationships resolve when run from the CLI
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel, LicenseStatusEnum
+from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from models.sent_reminder import SentReminderModel
+from config.environment import reminder_windows, reminder_sink, reminder_sink_path
+
+logger = logging.getLogger(__name__)
+
+
+class LogReminderSink:
+    """Writes each digest to the application log"""
+
+    async def deliver(self, digest: dict):
+        logger.info('Reminder digest for %s: %s', digest['email'], json.dumps(digest))
+
+
+class FileReminderSink:
+    """Appends each digest as one JSON line to a local file"""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    async def deliver(self, digest: dict):
+        with open(self.path, 'a') as file:
+            file.write(json.dumps(digest) + '\n')
+
+
+def _build_sink():
+    if reminder_sink == 'log':
+        return LogReminderSink()
+    if reminder_sink == 'file':
+        return FileReminderSink(reminder_sink_path)
+    module_name, factory_name = reminder_sink.split(':')
+    return getattr(importlib.import_module(module_name), factory_name)()
+
+
+# (record type, model, date column, title column, condition for rows still worth a reminder)
+REMINDER_SOURCES = [
+    ('license', LicenseModel, LicenseModel.expiry_date, LicenseModel.name,
+     LicenseModel.status != LicenseStatusEnum.EXPIRED),
+    ('compliance_task', ComplianceTaskModel, ComplianceTaskModel.due_date, ComplianceTaskModel.title,
+     ComplianceTaskModel.status == TaskStatusEnum.PENDING),
+]
+
+
+def _window_bounds(now: datetime, windows):
+    # A date only falls in its tightest window, so one first seen 5 days out skips the 30 day reminder
+    lower = now
+    for days in sorted(windows):
+        upper = now + timedelta(days=days)
+        yield days, lower, upper
+        lower = upper
+
+
+async def _due_reminders(connection, now: datetime, windows) -> list:
+    reminders = []
+    for days, lower, upper in _window_bounds(now, windows):
+        for record_type, model, date_column, title_column, is_open in REMINDER_SOURCES:
+            already_sent = select(SentReminderModel.id).where(
+                SentReminderModel.record_type == record_type,
+                SentReminderModel.record_id == model.id,
+                SentReminderModel.window_days == days,
+                SentReminderModel.due_date == date_column,
+            )
+            result = await connection.execute(
+                select(
+                    model.id,
+                    title_column.label('title'),
+                    date_column.label('due_date'),
+                    BusinessModel.id.label('business_id'),
+                    BusinessModel.name.label('business_name'),
+                    BusinessModel.user_id,
+                )
+                .join(BusinessModel, BusinessModel.id == model.business_id)
+                .where(date_column > lower, date_column <= upper, is_open, ~exists(already_sent))
+            )
+            reminders.extend(
+                {**row, 'record_type': record_type, 'window_days': days}
+                for row in result.mappings()
+            )
+
+    return reminders
+
+
+async def _claim(connection, reminders: list) -> set:
+    # Rows another node already inserted are skipped, and whatever we insert stays locked until we commit
+    insert = postgresql.insert if connection.dialect.name == 'postgresql' else sqlite.insert
+    result = await connection.execute(
+        insert(SentReminderModel)
+        .on_conflict_do_nothing(index_elements=['record_type', 'record_id', 'window_days', 'due_date'])
+        .returning(SentReminderModel.record_type, SentReminderModel.record_id, SentReminderModel.window_days),
+        [
+            {
+                'record_type': reminder['record_type'],
+                'record_id': reminder['id'],
+                'window_days': reminder['window_days'],
+                'due_date': reminder['due_date'],
+                'user_id': reminder['user_id'],
+            }
+            for reminder in reminders
+        ],
+    )
+    return {tuple(row) for row in result}
+
+
+def _digest(user, reminders: list, now: datetime) -> dict:
+    return {
+        'user_id': user.id,
+        'username': user.username,
+        'email': user.email,
+        'generated_at': now.isoformat(),
+        'reminders': [
+            {
+                'record_type': reminder['record_type'],
+                'id': reminder['id'],
+                'title': reminder['title'],
+                'due_date': reminder['due_date'].isoformat(),
+                'days_before': reminder['window_days'],
+                'business_id': reminder['business_id'],
+                'business_name': reminder['business_name'],
+            }
+            for reminder in sorted(reminders, key=lambda reminder: reminder['due_date'])
+        ],
+    }
+
+
+async def send_reminders(now: datetime = None, windows=reminder_windows, sink=None) -> dict:
+    now = now or datetime.now(timezone.utc)
+    sink = sink or _sink
+
+    async with async_engine.connect() as connection:
+        reminders = await _due_reminders(connection, now, windows)
+
+        by_user = defaultdict(list)
+        for reminder in reminders:
+            by_user[reminder['user_id']].append(reminder)
+
+        users = {}
+        if by_user:
+            result = await connection.execute(
+                select(UserModel.id, UserModel.username, UserModel.email).where(UserModel.id.in_(by_user))
+            )
+            users = {user.id: user for user in result}
+
+    digests_sent = reminders_sent = 0
+    for user_id, user_reminders in by_user.items():
+        if user_id not in users:
+            continue
+        try:
+            # A failed delivery rolls the claims back, so the reminders go out on the next run
+            async with async_engine.begin() as connection:
+                claimed = await _claim(connection, user_reminders)
+                user_reminders = [
+                    reminder for reminder in user_reminders
+                    if (reminder['record_type'], reminder['id'], reminder['window_days']) in claimed
+                ]
+                if user_reminders:
+                    await sink.deliver(_digest(users[user_id], user_reminders, now))
+        except Exception:
+            logger.exception('Reminder digest for user %s failed', user_id)
+            continue
+
+        if user_reminders:
+            digests_sent += 1
+            reminders_sent += len(user_reminders)
+
+    # Windows only look ahead of now, so records for dates already past will never be checked again
+    async with async_engine.begin() as connection:
+        await connection.execute(delete(SentReminderModel).where(SentReminderModel.due_date < now))
+
+    return {'digests_sent': digests_sent, 'reminders_sent': reminders_sent}
+
+
+async def run_reminder_scheduler(interval: int):
+    while True:
+        try:
+            counts = await send_reminders()
+            logger.info('Reminders: %(reminders_sent)s reminders in %(digests_sent)s digests', counts)
+        except Exception:
+            logger.exception('Reminder run failed')
+
+        await asyncio.sleep(interval)
+
+
+async def _send_once() -> dict:
+    try:
+        return await send_reminders()
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    argparse.ArgumentParser(description='Send reminder digests for upcoming license expiries and task due dates').parse_args()
+
+    counts = asyncio.run(_send_once())
+    print(f"Digests sent: {counts['digests_sent']}")
+    print(f"Reminders sent: {counts['reminders_sent']}")
+
+
+_sink = _build_sink()
+
+
+if __name__ == "__main__":
+    main()
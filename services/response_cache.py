@@ -0,0 +1,122 @@
+# services/response_cache.py
+
+import importlib
+import time
+from collections import OrderedDict, namedtuple
+from itertools import count
+
+from fastapi import Request, Response
+from fastapi.responses import JSONResponse
+
+from dependencies.conditional import conditional_response
+from config.environment import response_cache_ttl, response_cache_size, response_cache_backend
+
+CacheEntry = namedtuple('CacheEntry', ['body', 'etag', 'last_modified'])
+
+
+class InMemoryCacheBackend:
+    """Process-local LRU with a per-entry TTL, used unless RESPONSE_CACHE_BACKEND points elsewhere.
+
+    A backend stores entries by key plus one generation number per user; bumping a user's
+    generation orphans all of their entries at once. Shared backends (e.g. Redis) implement
+    the same five methods so every worker sees the same generations.
+    """
+
+    def __init__(self, max_entries: int, ttl: int):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries = OrderedDict()
+        # Generations are never evicted, otherwise a reset could revive stale entries
+        self._generations = {}
+        self._next_generation = count(1)
+
+    def get(self, key):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def set(self, key, value):
+        self._entries[key] = (value, time.monotonic() + self.ttl)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get_generation(self, user_id: int) -> int:
+        return self._generations.get(user_id, 0)
+
+    def bump_generation(self, user_id: int):
+        self._generations[user_id] = next(self._next_generation)
+
+    def clear(self):
+        self._entries.clear()
+        self._generations.clear()
+
+
+class ResponseCache:
+    """Caches serialized list responses per user, route and query string"""
+
+    def __init__(self, backend, enabled: bool = True):
+        self.backend = backend
+        self.enabled = enabled
+        self.hits = 0
+        self.misses = 0
+
+    def key_for(self, user_id: int, request: Request) -> str:
+        # Taken before reading the database, so a write that lands mid-request can't be cached under the new generation
+        query = '&'.join(sorted(f'{key}={value}' for key, value in request.query_params.multi_items()))
+        return f'{user_id}:{self.backend.get_generation(user_id)}:{request.url.path}?{query}'
+
+    def get(self, key: str):
+        if not self.enabled:
+            return None
+
+        entry = self.backend.get(key)
+        if entry is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return entry
+
+    def set(self, key: str, body, etag: str, last_modified):
+        if self.enabled:
+            self.backend.set(key, CacheEntry(body, etag, last_modified))
+
+    def invalidate_user(self, user_id: int):
+        # Called by every write handler for the owner of the changed rows
+        self.backend.bump_generation(user_id)
+
+    def clear(self):
+        self.backend.clear()
+
+    def stats(self) -> dict:
+        return {'hits': self.hits, 'misses': self.misses}
+
+
+def encoded_response(request: Request, body, etag: str, last_modified):
+    # Bodies are either JSON-ready dicts or bytes already encoded by a fast path, sent as-is
+    if isinstance(body, bytes):
+        response = Response(content=body, media_type='application/json')
+    else:
+        response = JSONResponse(content=body)
+    return conditional_response(request, response, etag, last_modified) or response
+
+
+def cached_response(request: Request, entry: CacheEntry):
+    # Cached entries keep their validators, so conditional requests still get a 304
+    return encoded_response(request, entry.body, entry.etag, entry.last_modified)
+
+
+def _build_backend():
+    if response_cache_backend:
+        module_name, factory_name = response_cache_backend.split(':')
+        return getattr(importlib.import_module(module_name), factory_name)()
+    return InMemoryCacheBackend(max_entries=response_cache_size, ttl=response_cache_ttl)
+
+
+response_cache = ResponseCache(_build_backend(), enabled=response_cache_ttl > 0)
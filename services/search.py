@@ -0,0 +1,92 @@
+# services/search.py
+#
+# Ranked full-text search over businesses, licenses and compliance tasks.
+# Postgres matches against the GIN expression indexes declared on the models;
+# SQLite keeps an FTS5 table in sync with triggers, created with the schema or on first use.
+
+import asyncio
+import re
+
+from sqlalchemy import Float, Integer, String, func, literal_column, select, text, union_all
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from models.base import SEARCH_CONFIG, install_search_index, search_document
+from models.business import BusinessModel
+from models.license import LicenseModel
+from models.compliance_task import ComplianceTaskModel
+
+_fts_lock = asyncio.Lock()
+_fts_ready = False
+
+
+async def _ensure_fts_index(db: AsyncSession):
+    # metadata.create_all builds the index; this covers databases created by the migrations
+    global _fts_ready
+    if _fts_ready:
+        return
+
+    async with _fts_lock:
+        if _fts_ready:
+            return
+        async with db.bind.begin() as connection:
+            await connection.run_sync(install_search_index)
+        _fts_ready = True
+
+
+def _fts_query(q: str) -> str:
+    # Quote every word so user input can't be parsed as FTS5 query syntax; the words are ANDed
+    return ' '.join(f'"{word}"' for word in re.findall(r'\w+', q))
+
+
+def _postgres_matches(user_id: int, q: str):
+    query = func.websearch_to_tsquery(SEARCH_CONFIG, q)
+
+    def matches(record_type, model, title_column, business_id_column):
+        document = search_document(title_column, model.description)
+        statement = select(
+            literal_column(f"'{record_type}'").label('record_type'),
+            model.id.label('id'),
+            business_id_column.label('business_id'),
+            title_column.label('title'),
+            model.description.label('description'),
+            func.ts_rank(document, query).label('rank'),
+        ).filter(document.op('@@')(query), BusinessModel.user_id == user_id)
+        if model is not BusinessModel:
+            statement = statement.join(BusinessModel, BusinessModel.id == business_id_column)
+        return statement
+
+    return union_all(
+        matches('business', BusinessModel, BusinessModel.name, BusinessModel.id),
+        matches('license', LicenseModel, LicenseModel.name, LicenseModel.business_id),
+        matches('compliance_task', ComplianceTaskModel, ComplianceTaskModel.title, ComplianceTaskModel.business_id),
+    ).subquery('matches')
+
+
+def _sqlite_matches(user_id: int, q: str):
+    match = _fts_query(q)
+    # FTS5 rejects an empty MATCH, and a query without words can't match anything anyway
+    condition = "search_index MATCH :match" if match else "0"
+
+    # bm25() is lower for better matches, so negate it to rank in the same direction as ts_rank
+    statement = text(
+        "SELECT search_index.record_type AS record_type, search_index.record_id AS id, "
+        "search_index.business_id AS business_id, search_index.title AS title, "
+        "search_index.description AS description, -bm25(search_index) AS rank "
+        "FROM search_index JOIN businesses ON businesses.id = search_index.business_id "
+        f"WHERE {condition} AND businesses.user_id = :user_id"
+    ).bindparams(user_id=user_id)
+    if match:
+        statement = statement.bindparams(match=match)
+
+    return statement.columns(
+        record_type=String, id=Integer, business_id=Integer, title=String, description=String, rank=Float
+    ).subquery('matches')
+
+
+async def search_matches(db: AsyncSession, user_id: int, q: str):
+    """Subquery of (record_type, id, business_id, title, description, rank) for the user's records matching q"""
+    if db.bind.dialect.name == 'postgresql':
+        return _postgres_matches(user_id, q)
+
+    await _ensure_fts_index(db)
+    return _sqlite_matches(user_id, q)
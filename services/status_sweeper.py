@@ -0,0 +1,102 @@
+# services/status_sweeper.py
+#
+# Keeps LicenseStatusEnum.EXPIRED and TaskStatusEnum.LATE in line with the calendar using
+# set-based UPDATEs chunked by id range. Run in-process from main.py, or once from the CLI:
+#
+#     python -m services.status_sweeper [--chunk-size 5000]
+
+import argparse
+import asyncio
+import logging
+from datetime import datetime, timezone
+
+from sqlalchemy import func, select, update
+
+from database import async_engine
+# Import ALL models so their relationships resolve when run from the CLI
+from models.user import UserModel
+from models.business import BusinessModel
+from models.license import LicenseModel, LicenseStatusEnum
+from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from services.response_cache import response_cache
+from config.environment import status_sweep_chunk_size
+
+logger = logging.getLogger(__name__)
+
+
+async def _sweep_in_chunks(model, conditions, values, chunk_size: int) -> int:
+    # Walk the primary key in fixed ranges so each UPDATE locks at most chunk_size rows
+    async with async_engine.connect() as connection:
+        lowest_id, highest_id = (await connection.execute(select(func.min(model.id), func.max(model.id)))).one()
+
+    if lowest_id is None:
+        return 0
+
+    changed = 0
+    for start_id in range(lowest_id, highest_id + 1, chunk_size):
+        async with async_engine.begin() as connection:
+            result = await connection.execute(
+                update(model)
+                .where(model.id >= start_id, model.id < start_id + chunk_size, *conditions)
+                .values(**values)
+            )
+        changed += result.rowcount
+
+    return changed
+
+
+async def sweep_statuses(now: datetime = None, chunk_size: int = status_sweep_chunk_size) -> dict:
+    now = now or datetime.now(timezone.utc)
+
+    licenses_expired = await _sweep_in_chunks(
+        LicenseModel,
+        [LicenseModel.expiry_date < now, LicenseModel.status != LicenseStatusEnum.EXPIRED],
+        {'status': LicenseStatusEnum.EXPIRED},
+        chunk_size,
+    )
+
+    # Only pending tasks can become late, submitted ones stay submitted
+    tasks_late = await _sweep_in_chunks(
+        ComplianceTaskModel,
+        [ComplianceTaskModel.due_date < now, ComplianceTaskModel.status == TaskStatusEnum.PENDING],
+        {'status': TaskStatusEnum.LATE},
+        chunk_size,
+    )
+
+    # The sweep doesn't know whose rows it touched, so drop every cached list response
+    if licenses_expired or tasks_late:
+        response_cache.clear()
+
+    return {'licenses_expired': licenses_expired, 'tasks_late': tasks_late}
+
+
+async def run_status_sweeper(interval: int):
+    while True:
+        try:
+            counts = await sweep_statuses()
+            logger.info('Status sweep: %(licenses_expired)s licenses expired, %(tasks_late)s tasks marked late', counts)
+        except Exception:
+            logger.exception('Status sweep failed')
+
+        await asyncio.sleep(interval)
+
+
+async def _sweep_once(chunk_size: int) -> dict:
+    try:
+        return await sweep_statuses(chunk_size=chunk_size)
+    finally:
+        await async_engine.dispose()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Expire licenses and mark overdue compliance tasks as late')
+    parser.add_argument('--chunk-size', type=int, default=status_sweep_chunk_size, help='Rows per id range')
+    args = parser.parse_args()
+
+    counts = asyncio.run(_sweep_once(args.chunk_size))
+    print(f"Licenses expired: {counts['licenses_expired']}")
+    print(f"Compliance tasks marked late: {counts['tasks_late']}")
+
+
+if __name__ == "__main__":
+    main()
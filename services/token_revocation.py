@@ -0,0 +1,105 @@
+# services/token_revocation.py
+#
+# Logout and token revocation by jti claim. Revocations are stored durably in revoked_tokens,
+# and every node keeps an in-memory copy of the unexpired ones that get_current_user checks
+# with a dict lookup, so revocation adds no round trip per request. A background task pulls
+# rows revoked since its last look every TOKEN_REVOCATION_REFRESH seconds. A node sees its own
+# logouts at once and other nodes' within one refresh.
+
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+
+from sqlalchemy import delete, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database import async_engine
+from models.revoked_token import RevokedTokenModel
+from config.environment import token_revocation_overlap
+
+logger = logging.getLogger(__name__)
+
+PRUNE_INTERVAL = 3600  # Seconds between deletions of rows whose tokens have expired anyway
+
+
+def _utc_naive(value: datetime) -> datetime:
+    # Stored timestamps come back as naive UTC
+    return value.astimezone(timezone.utc).replace(tzinfo=None) if value.tzinfo else value
+
+
+class RevocationList:
+    """jti -> exp of revoked, not yet expired tokens, kept in step with the revoked_tokens table"""
+
+    def __init__(self, overlap: int):
+        self._revoked = {}
+        self._last_refresh = None
+        # Each refresh re-reads this far back, for slow commits and clock skew between nodes
+        self.overlap = timedelta(seconds=overlap)
+
+    def is_revoked(self, jti) -> bool:
+        return jti is not None and jti in self._revoked
+
+    def add(self, jti: str, expires_at: datetime):
+        self._revoked[jti] = _utc_naive(expires_at)
+
+    async def refresh(self, now: datetime = None) -> int:
+        now = _utc_naive(now or datetime.now(timezone.utc))
+
+        statement = select(RevokedTokenModel.jti, RevokedTokenModel.expires_at).where(RevokedTokenModel.expires_at > now)
+        if self._last_refresh is not None:
+            statement = statement.where(RevokedTokenModel.revoked_at >= self._last_refresh - self.overlap)
+
+        async with async_engine.connect() as connection:
+            rows = (await connection.execute(statement)).all()
+
+        for jti, expires_at in rows:
+            self.add(jti, expires_at)
+
+        # jwt.decode already rejects expired tokens, so their entries can go
+        for jti in [jti for jti, expires_at in self._revoked.items() if expires_at <= now]:
+            del self._revoked[jti]
+
+        self._last_refresh = now
+        return len(rows)
+
+    def clear(self):
+        self._revoked.clear()
+        self._last_refresh = None
+
+
+revocation_list = RevocationList(overlap=token_revocation_overlap)
+
+
+async def revoke_token(db: AsyncSession, jti: str, user_id: int, expires_at: datetime):
+    # Revoking twice (e.g. on two nodes before they sync) is a no-op rather than a unique violation
+    insert = postgresql.insert if db.bind.dialect.name == 'postgresql' else sqlite.insert
+    await db.execute(
+        insert(RevokedTokenModel)
+        .values(jti=jti, user_id=user_id, expires_at=expires_at, revoked_at=datetime.now(timezone.utc))
+        .on_conflict_do_nothing(index_elements=['jti'])
+    )
+    await db.commit()
+    revocation_list.add(jti, expires_at)
+
+
+async def prune_revoked_tokens(now: datetime = None) -> int:
+    now = now or datetime.now(timezone.utc)
+    async with async_engine.begin() as connection:
+        result = await connection.execute(delete(RevokedTokenModel).where(RevokedTokenModel.expires_at <= now))
+    return result.rowcount
+
+
+async def run_revocation_refresher(interval: int):
+    last_pruned = time.monotonic()
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            await revocation_list.refresh()
+            if time.monotonic() - last_pruned >= PRUNE_INTERVAL:
+                pruned = await prune_revoked_tokens()
+                last_pruned = time.monotonic()
+                logger.info('Pruned %s expired token revocations', pruned)
+        except Exception:
+            logger.exception('Token revocation refresh failed')
@@ -1,9 +1,11 @@
 from datetime import date, datetime, timezone
+from sqlalchemy import delete
 from database import SessionLocal
 from models.user import UserModel
 from models.business import BusinessModel, IndustryEnum
 from models.license import LicenseModel, LicenseStatusEnum
 from models.compliance_task import ComplianceTaskModel, TaskStatusEnum
+from dependencies.get_current_user import invalidate_user
 
 def main():
     db = SessionLocal()
@@ -60,20 +62,24 @@ def main():
             db.commit()
             db.refresh(task)
 
-        # Check the data
+        # Check the data (relationships use lazy='raise', so load them explicitly)
+        db.refresh(user, ['businesses'])
+        db.refresh(business, ['licenses', 'compliance_tasks'])
         print(f"User: {user.username}")
         print(f"Businesses: {len(user.businesses)}")
         print(f"Licenses for business: {len(business.licenses)}")
         print(f"Compliance tasks for business: {len(business.compliance_tasks)}")
 
-        # Test CASCADE - delete the user
-        db.delete(user)
+        # Test CASCADE - one DELETE for the user; the foreign keys remove their businesses, licenses and tasks
+        business_id, license_id, task_id = business.id, license.id, task.id  # The objects can't refresh once deleted
+        db.execute(delete(UserModel).where(UserModel.id == user.id))
         db.commit()
+        invalidate_user(user.id)  # A Core delete skips the after_delete hook that does this for ORM deletes
 
         # Check if license and tasks were deleted
-        remaining_business = db.query(BusinessModel).filter(BusinessModel.id == business.id).first()
-        remaining_license = db.query(LicenseModel).filter(LicenseModel.id == license.id).first()
-        remaining_task = db.query(ComplianceTaskModel).filter(ComplianceTaskModel.id == task.id).first()
+        remaining_business = db.query(BusinessModel).filter(BusinessModel.id == business_id).first()
+        remaining_license = db.query(LicenseModel).filter(LicenseModel.id == license_id).first()
+        remaining_task = db.query(ComplianceTaskModel).filter(ComplianceTaskModel.id == task_id).first()
 
         print(f"Business still exists: {remaining_business is not None}")  
         print(f"License still exists: {remaining_license is not None}")  
@@ -0,0 +1,52 @@
+import os
+import tempfile
+import uuid
+
+# Point the app at a throwaway SQLite database before anything imports config.environment
+_db_dir = tempfile.mkdtemp(prefix='complitrack-tests-')
+os.environ['DATABASE_URL'] = f"sqlite:///{os.path.join(_db_dir, 'test.db')}"
+os.environ.setdefault('JWT_SECRET', 'test-secret-that-is-long-enough-for-hs256')
+os.environ.setdefault('BCRYPT_ROUNDS', '4')
+for interval in ('STATUS_SWEEP_INTERVAL', 'REMINDER_INTERVAL', 'ARCHIVE_INTERVAL', 'TOKEN_REVOCATION_REFRESH'):
+    os.environ[interval] = '0'
+
+import pytest
+from fastapi.testclient import TestClient
+
+from database import engine
+from models.base import Base
+from main import app  # Imports every model, so create_all builds every table
+
+
+@pytest.fixture(scope='session')
+def client():
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    with TestClient(app) as test_client:
+        yield test_client
+
+
+@pytest.fixture
+def credentials(client):
+    # A fresh user per test, so tests never see each other's data
+    username = f'user-{uuid.uuid4().hex[:12]}'
+    response = client.post('/api/auth/register', json={'username': username, 'email': f'{username}@test.com', 'password': 'password123'})
+    assert response.status_code == 200, response.text
+    return {'username': username, 'password': 'password123'}
+
+
+@pytest.fixture
+def auth_headers(client, credentials):
+    response = client.post('/api/auth/login', json=credentials)
+    assert response.status_code == 200, response.text
+    return {'Authorization': f"Bearer {response.json()['token']}"}
+
+
+@pytest.fixture
+def business_id(client, auth_headers):
+    response = client.post('/api/businesses', headers=auth_headers, json={
+        'name': 'Test Business', 'cr_number': f'CR{uuid.uuid4().hex[:10]}', 'industry': 'Retail'
+    })
+    assert response.status_code == 201, response.text
+    return response.json()['id']
@@ -0,0 +1,32 @@
+from services.archive import archive_rows
+
+
+def _license(name, expiry_date):
+    return {'name': name, 'issue_date': '2019-01-01T00:00:00', 'expiry_date': expiry_date, 'status': 'Valid'}
+
+
+def test_archived_licenses_are_listed_only_on_request(client, auth_headers, business_id):
+    url = f'/api/businesses/{business_id}/licenses'
+    old = client.post(url, headers=auth_headers, json=_license('Old licence', '2020-01-01T00:00:00')).json()
+    current = client.post(url, headers=auth_headers, json=_license('Current licence', '2027-06-01T00:00:00')).json()
+
+    counts = client.portal.call(archive_rows)
+    assert counts['licenses'] >= 1
+
+    live = client.get(url, headers=auth_headers).json()['items']
+    assert [license['id'] for license in live] == [current['id']]
+
+    everything = client.get(url, headers=auth_headers, params={'include_archived': 'true'}).json()['items']
+    assert [license['id'] for license in everything] == [old['id'], current['id']]
+    assert everything[0]['name'] == 'Old licence'
+
+
+def test_new_rows_never_reuse_archived_ids(client, auth_headers, business_id):
+    url = f'/api/businesses/{business_id}/licenses'
+    client.post(url, headers=auth_headers, json=_license('Old licence', '2020-01-01T00:00:00'))
+    newest = client.post(url, headers=auth_headers, json=_license('Old licence', '2020-01-01T00:00:00')).json()
+    client.portal.call(archive_rows)
+
+    created = client.post(url, headers=auth_headers, json=_license('New licence', '2027-06-01T00:00:00')).json()
+
+    assert created['id'] > newest['id']
@@ -0,0 +1,28 @@
+import json
+
+import jwt
+import pytest
+
+from config.environment import secret
+
+
+def _signed(claims):
+    # Signed directly, since jwt.encode refuses some of the malformed claims below
+    return jwt.api_jws.encode(json.dumps(claims).encode(), secret, algorithm='HS256')
+
+
+@pytest.mark.parametrize('claims', [
+    {},                   # No sub at all
+    {'sub': 'not-a-number'},
+])
+def test_token_without_usable_sub_is_rejected(client, claims):
+    response = client.get('/api/businesses', headers={'Authorization': f'Bearer {_signed(claims)}'})
+
+    assert response.status_code == 401
+    assert response.json()['detail'] == 'Invalid username or password'
+
+
+def test_token_with_non_string_sub_is_rejected(client):
+    response = client.get('/api/businesses', headers={'Authorization': f"Bearer {_signed({'sub': 5})}"})
+
+    assert response.status_code == 403
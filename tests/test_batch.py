@@ -0,0 +1,61 @@
+import pytest
+
+
+def _license(**fields):
+    return {'name': 'Trade licence', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2027-06-01T00:00:00', 'status': 'Valid', **fields}
+
+
+def _task(**fields):
+    return {'title': 'VAT return', 'description': 'Quarterly', 'due_date': '2027-03-01T00:00:00', **fields}
+
+
+@pytest.mark.parametrize('resource, items', [
+    ('licenses', [_license(), _license(), _license(expiry_date='2024-01-01T00:00:00')]),
+    ('licenses', [_license(), _license(), _license(name='')]),
+    ('compliance-tasks', [_task(), _task(), _task(title='')]),
+])
+def test_invalid_items_are_reported_by_index(client, auth_headers, business_id, resource, items):
+    response = client.post(f'/api/businesses/{business_id}/{resource}:batch', headers=auth_headers, json={'items': items})
+
+    assert response.status_code == 422, response.text
+    assert [error['loc'][:3] for error in response.json()['detail']] == [['body', 'items', 2]]
+
+    # Nothing from a rejected batch is inserted
+    assert client.get(f'/api/businesses/{business_id}/{resource}', headers=auth_headers).json()['items'] == []
+
+
+@pytest.mark.parametrize('resource, build, key', [
+    ('licenses', lambda i: _license(name=f'Licence {i}'), 'name'),
+    ('compliance-tasks', lambda i: _task(title=f'Task {i}'), 'title'),
+])
+def test_batch_create_returns_rows_in_request_order(client, auth_headers, business_id, resource, build, key):
+    response = client.post(f'/api/businesses/{business_id}/{resource}:batch', headers=auth_headers, json={'items': [build(i) for i in range(5)]})
+
+    assert response.status_code == 201, response.text
+    created = response.json()
+    assert [row[key] for row in created] == [build(i)[key] for i in range(5)]
+    assert all(row['business_id'] == business_id for row in created)
+    assert len({row['id'] for row in created}) == 5
+
+
+@pytest.mark.parametrize('resource, item', [('licenses', _license()), ('compliance-tasks', _task())])
+def test_batch_delete(client, auth_headers, business_id, resource, item):
+    url = f'/api/businesses/{business_id}/{resource}'
+    ids = [row['id'] for row in client.post(f'{url}:batch', headers=auth_headers, json={'items': [item] * 3}).json()]
+
+    response = client.post(f'{url}:batch-delete', headers=auth_headers, json={'ids': ids[:2]})
+
+    assert response.status_code == 200, response.text
+    assert [row['id'] for row in client.get(url, headers=auth_headers).json()['items']] == ids[2:]
+
+
+@pytest.mark.parametrize('resource, item', [('licenses', _license()), ('compliance-tasks', _task())])
+def test_batch_delete_with_unknown_ids_deletes_nothing(client, auth_headers, business_id, resource, item):
+    url = f'/api/businesses/{business_id}/{resource}'
+    ids = [row['id'] for row in client.post(f'{url}:batch', headers=auth_headers, json={'items': [item] * 2}).json()]
+
+    response = client.post(f'{url}:batch-delete', headers=auth_headers, json={'ids': ids + [999999]})
+
+    assert response.status_code == 404, response.text
+    assert [error['id'] for error in response.json()['detail']] == [999999]
+    assert len(client.get(url, headers=auth_headers).json()['items']) == 2
@@ -0,0 +1,50 @@
+def _task(client, auth_headers, business_id, **fields):
+    response = client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'VAT return', 'description': 'Quarterly', 'due_date': '2027-03-01T00:00:00', **fields
+    })
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_submitting_keeps_existing_submission_dates(client, auth_headers, business_id):
+    submitted = _task(client, auth_headers, business_id, status='Submitted', submission_date='2025-01-01T00:00:00')
+    pending = _task(client, auth_headers, business_id)
+
+    response = client.post('/api/compliance-tasks:batch-status', headers=auth_headers, json={
+        'status': 'Submitted', 'ids': [submitted['id'], pending['id']]
+    })
+
+    assert response.status_code == 200, response.text
+    dates = {task['id']: task['submission_date'] for task in response.json()}
+    assert dates[submitted['id']].startswith('2025-01-01T00:00:00')
+    assert dates[pending['id']] is not None and not dates[pending['id']].startswith('2025-01-01')
+
+
+def test_filters_select_the_tasks(client, auth_headers, business_id):
+    early = _task(client, auth_headers, business_id, due_date='2026-01-01T00:00:00')
+    late = _task(client, auth_headers, business_id, due_date='2028-01-01T00:00:00')
+
+    response = client.post('/api/compliance-tasks:batch-status', headers=auth_headers, json={
+        'status': 'Late', 'business_id': business_id, 'current_status': 'Pending', 'due_before': '2027-01-01T00:00:00'
+    })
+
+    assert response.status_code == 200, response.text
+    assert [task['id'] for task in response.json()] == [early['id']]
+    statuses = {task['id']: task['status'] for task in client.get(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers).json()['items']}
+    assert statuses == {early['id']: 'Late', late['id']: 'Pending'}
+
+
+def test_without_ids_or_filters_is_rejected(client, auth_headers):
+    response = client.post('/api/compliance-tasks:batch-status', headers=auth_headers, json={'status': 'Late'})
+
+    assert response.status_code == 400, response.text
+
+
+def test_unknown_or_foreign_ids_change_nothing(client, auth_headers, business_id):
+    task = _task(client, auth_headers, business_id)
+
+    response = client.post('/api/compliance-tasks:batch-status', headers=auth_headers, json={'status': 'Late', 'ids': [task['id'], 999999]})
+
+    assert response.status_code == 404, response.text
+    assert [error['id'] for error in response.json()['detail']] == [999999]
+    assert client.get(f"/api/businesses/{business_id}/compliance-tasks/{task['id']}", headers=auth_headers).json()['status'] == 'Pending'
@@ -0,0 +1,58 @@
+import pytest
+
+
+@pytest.mark.parametrize('path', ['/api/businesses/{id}', '/api/businesses'])
+def test_writes_within_one_second_change_the_etag(client, auth_headers, business_id, path):
+    url = path.format(id=business_id)
+    etags = []
+    for description in ('first', 'second'):
+        response = client.put(f'/api/businesses/{business_id}', headers=auth_headers, json={'description': description})
+        assert response.status_code == 200, response.text
+
+        response = client.get(url, headers={**auth_headers, **({'If-None-Match': etags[-1]} if etags else {})})
+        assert response.status_code == 200, response.text
+        etags.append(response.headers['ETag'])
+
+    assert etags[0] != etags[1]
+
+
+@pytest.mark.parametrize('path', [
+    '/api/businesses/{id}', '/api/businesses', '/api/businesses/{id}/licenses', '/api/businesses/{id}/compliance-tasks',
+])
+def test_matching_etag_gets_304(client, auth_headers, business_id, path):
+    url = path.format(id=business_id)
+    first = client.get(url, headers=auth_headers)
+    assert first.status_code == 200, first.text
+
+    response = client.get(url, headers={**auth_headers, 'If-None-Match': first.headers['ETag']})
+
+    assert response.status_code == 304
+    assert response.headers['ETag'] == first.headers['ETag']
+    assert not response.content
+
+
+def test_write_to_a_child_changes_the_list_etag(client, auth_headers, business_id):
+    url = f'/api/businesses/{business_id}/licenses'
+    etag = client.get(url, headers=auth_headers).headers['ETag']
+
+    client.post(url, headers=auth_headers, json={
+        'name': 'Trade licence', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2027-06-01T00:00:00', 'status': 'Valid'
+    })
+    response = client.get(url, headers={**auth_headers, 'If-None-Match': etag})
+
+    assert response.status_code == 200, response.text
+    assert len(response.json()['items']) == 1
+
+
+def test_if_modified_since(client, auth_headers, business_id):
+    url = f'/api/businesses/{business_id}'
+    last_modified = client.get(url, headers=auth_headers).headers['Last-Modified']
+
+    assert client.get(url, headers={**auth_headers, 'If-Modified-Since': last_modified}).status_code == 304
+    assert client.get(url, headers={**auth_headers, 'If-Modified-Since': 'Mon, 01 Jan 2001 00:00:00 GMT'}).status_code == 200
+
+
+def test_wildcard_does_not_match_a_missing_resource(client, auth_headers):
+    response = client.get('/api/businesses/999999', headers={**auth_headers, 'If-None-Match': '*'})
+
+    assert response.status_code == 404
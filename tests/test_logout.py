@@ -0,0 +1,17 @@
+def test_logged_out_token_is_rejected(client, credentials, auth_headers):
+    response = client.post('/api/auth/logout', headers=auth_headers)
+    assert response.status_code == 200, response.text
+
+    response = client.get('/api/businesses', headers=auth_headers)
+    assert response.status_code == 403
+    assert response.json()['detail'] == 'Token has been revoked'
+
+    # Only that token is revoked, a fresh login still works
+    token = client.post('/api/auth/login', json=credentials).json()['token']
+    assert client.get('/api/businesses', headers={'Authorization': f'Bearer {token}'}).status_code == 200
+
+
+def test_logout_twice_is_rejected(client, auth_headers):
+    client.post('/api/auth/logout', headers=auth_headers)
+
+    assert client.post('/api/auth/logout', headers=auth_headers).status_code == 403
@@ -0,0 +1,26 @@
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import OperationalError
+
+from services.metrics import RequestStats, current_request_stats, instrument_engine
+
+
+def test_failed_statements_leave_no_timing_state():
+    engine = create_engine('sqlite://')
+    instrument_engine(engine)
+    stats = RequestStats()
+    token = current_request_stats.set(stats)
+    try:
+        with engine.connect() as connection:
+            for _ in range(3):
+                with pytest.raises(OperationalError):
+                    connection.execute(text('SELECT * FROM missing_table'))
+            connection.execute(text('SELECT 1'))
+
+            assert 'query_started' not in connection.info
+    finally:
+        current_request_stats.reset(token)
+
+    # Only the statement that completed is counted, and its time isn't measured from a failed one
+    assert stats.queries == 1
+    assert 0 <= stats.db_time < 1
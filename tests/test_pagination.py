@@ -0,0 +1,63 @@
+import uuid
+
+import pytest
+
+
+def _licenses(client, auth_headers, business_id):
+    # Repeated expiry dates, so the id tiebreaker decides the order within them
+    expiries = ['2027-01-01', '2027-01-01', '2027-01-01', '2027-02-01', '2027-03-01']
+    client.post(f'/api/businesses/{business_id}/licenses:batch', headers=auth_headers, json={'items': [
+        {'name': f'Licence {i}', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': f'{expiry}T00:00:00', 'status': 'Valid'}
+        for i, expiry in enumerate(expiries)
+    ]})
+    return f'/api/businesses/{business_id}/licenses'
+
+
+def _tasks(client, auth_headers, business_id):
+    dues = ['2027-01-15', '2027-01-15', '2027-02-15', '2027-02-15', '2027-03-15']
+    client.post(f'/api/businesses/{business_id}/compliance-tasks:batch', headers=auth_headers, json={'items': [
+        {'title': f'Task {i}', 'description': 'Filing', 'due_date': f'{due}T00:00:00'}
+        for i, due in enumerate(dues)
+    ]})
+    return f'/api/businesses/{business_id}/compliance-tasks'
+
+
+def _businesses(client, auth_headers, business_id):
+    for i in range(4):
+        client.post('/api/businesses', headers=auth_headers, json={'name': f'Branch {i}', 'cr_number': f'CR{uuid.uuid4().hex[:10]}', 'industry': 'Retail'})
+    return '/api/businesses'
+
+
+@pytest.mark.parametrize('build', [_licenses, _tasks, _businesses])
+def test_pages_cover_every_row_once_in_order(client, auth_headers, business_id, build):
+    url = build(client, auth_headers, business_id)
+    everything = [item['id'] for item in client.get(url, headers=auth_headers).json()['items']]
+    assert len(everything) == 5
+
+    paged, cursor = [], None
+    while True:
+        response = client.get(url, headers=auth_headers, params={'limit': 2, **({'cursor': cursor} if cursor else {})})
+        assert response.status_code == 200, response.text
+        page = response.json()
+        assert len(page['items']) <= 2
+        paged += [item['id'] for item in page['items']]
+        cursor = page['next_cursor']
+        if not cursor:
+            break
+
+    assert paged == everything
+
+
+def test_total_estimate_is_opt_in(client, auth_headers, business_id):
+    url = _licenses(client, auth_headers, business_id)
+
+    assert client.get(url, headers=auth_headers).json()['total_estimate'] is None
+    assert client.get(url, headers=auth_headers, params={'include_total': 'true'}).json()['total_estimate'] == 5
+
+
+@pytest.mark.parametrize('cursor', ['not-a-cursor', 'WzFd'])  # Garbage, and a valid encoding of [1]
+def test_invalid_cursor_is_rejected(client, auth_headers, business_id, cursor):
+    response = client.get(f'/api/businesses/{business_id}/licenses', headers=auth_headers, params={'cursor': cursor})
+
+    assert response.status_code == 400, response.text
+    assert response.json()['detail'] == 'Invalid pagination cursor'
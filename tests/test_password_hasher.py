@@ -0,0 +1,36 @@
+import asyncio
+
+import pytest
+from fastapi import HTTPException
+
+from services.password_hasher import PasswordHasher
+
+
+def test_hash_and_verify():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, queue_size=0)
+        password_hash = await hasher.hash('password123')
+        return password_hash, await hasher.verify_and_update('password123', password_hash), await hasher.verify_and_update('wrong', password_hash)
+
+    password_hash, valid, invalid = asyncio.run(scenario())
+
+    assert password_hash.startswith('$2')
+    assert valid == (True, None)  # Already at the configured cost, so no new hash
+    assert invalid == (False, None)
+
+
+def test_sheds_load_past_capacity():
+    async def scenario():
+        hasher = PasswordHasher(workers=1, queue_size=0)
+        first = asyncio.ensure_future(hasher.hash('password123'))
+        await asyncio.sleep(0)  # Let the first hash take the only slot
+        try:
+            await hasher.hash('password123')
+        finally:
+            await first
+
+    with pytest.raises(HTTPException) as error:
+        asyncio.run(scenario())
+
+    assert error.value.status_code == 503
+    assert error.value.headers == {'Retry-After': '1'}
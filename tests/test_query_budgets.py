@@ -0,0 +1,92 @@
+# Every route with @query_budget, sent through assert_query_budget so an N+1 regression fails here.
+# The business has several licenses and tasks, so a per-row query would show up as extra statements.
+
+import uuid
+
+import pytest
+
+from main import app
+from services.query_budget import assert_query_budget
+
+ROWS = 3
+
+
+def _license(i):
+    return {'name': f'Licence {i}', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': f'2027-0{i + 1}-01T00:00:00', 'status': 'Valid'}
+
+
+def _task(i):
+    return {'title': f'Task {i}', 'description': 'Filing', 'due_date': f'2027-0{i + 1}-15T00:00:00'}
+
+
+@pytest.fixture
+def records(client, auth_headers, business_id):
+    licenses = client.post(f'/api/businesses/{business_id}/licenses:batch', headers=auth_headers,
+                           json={'items': [_license(i) for i in range(ROWS)]}).json()
+    tasks = client.post(f'/api/businesses/{business_id}/compliance-tasks:batch', headers=auth_headers,
+                        json={'items': [_task(i) for i in range(ROWS)]}).json()
+    return {
+        'business_id': business_id,
+        'license_ids': [license['id'] for license in licenses],
+        'task_ids': [task['id'] for task in tasks],
+    }
+
+
+def _new_username():
+    return f'user-{uuid.uuid4().hex[:12]}'
+
+
+# (method, route path, function of the test records -> (url, request kwargs))
+CASES = [
+    ('POST', '/api/auth/register', lambda r: ('/api/auth/register', {'json': {'username': (name := _new_username()), 'email': f'{name}@test.com', 'password': 'password123'}})),
+    ('POST', '/api/auth/login', lambda r: ('/api/auth/login', {'json': r['credentials']})),
+    ('POST', '/api/auth/logout', lambda r: ('/api/auth/logout', {})),
+    ('GET', '/api/auth/users', lambda r: ('/api/auth/users', {})),
+    ('GET', '/metrics', lambda r: ('/metrics', {})),
+
+    ('POST', '/api/businesses', lambda r: ('/api/businesses', {'json': {'name': 'Another', 'cr_number': f'CR{uuid.uuid4().hex[:10]}', 'industry': 'Retail'}})),
+    ('GET', '/api/businesses', lambda r: ('/api/businesses', {})),
+    ('GET', '/api/businesses/{business_id}', lambda r: (f"/api/businesses/{r['business_id']}?expand=user,licenses,compliance_tasks", {})),
+    ('PUT', '/api/businesses/{business_id}', lambda r: (f"/api/businesses/{r['business_id']}", {'json': {'description': 'Updated'}})),
+    ('DELETE', '/api/businesses/{business_id}', lambda r: (f"/api/businesses/{r['business_id']}", {})),
+
+    ('POST', '/api/businesses/{business_id}/licenses', lambda r: (f"/api/businesses/{r['business_id']}/licenses", {'json': _license(5)})),
+    ('POST', '/api/businesses/{business_id}/licenses:batch', lambda r: (f"/api/businesses/{r['business_id']}/licenses:batch", {'json': {'items': [_license(i) for i in range(ROWS)]}})),
+    ('GET', '/api/businesses/{business_id}/licenses', lambda r: (f"/api/businesses/{r['business_id']}/licenses?include_total=true", {})),
+    ('GET', '/api/businesses/{business_id}/licenses/{license_id}', lambda r: (f"/api/businesses/{r['business_id']}/licenses/{r['license_ids'][0]}", {})),
+    ('PUT', '/api/businesses/{business_id}/licenses/{license_id}', lambda r: (f"/api/businesses/{r['business_id']}/licenses/{r['license_ids'][0]}", {'json': _license(4)})),
+    ('DELETE', '/api/businesses/{business_id}/licenses/{license_id}', lambda r: (f"/api/businesses/{r['business_id']}/licenses/{r['license_ids'][0]}", {})),
+    ('POST', '/api/businesses/{business_id}/licenses:batch-delete', lambda r: (f"/api/businesses/{r['business_id']}/licenses:batch-delete", {'json': {'ids': r['license_ids']}})),
+
+    ('POST', '/api/businesses/{business_id}/compliance-tasks', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks", {'json': _task(5)})),
+    ('POST', '/api/businesses/{business_id}/compliance-tasks:batch', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks:batch", {'json': {'items': [_task(i) for i in range(ROWS)]}})),
+    ('GET', '/api/businesses/{business_id}/compliance-tasks', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks?include_total=true", {})),
+    ('GET', '/api/businesses/{business_id}/compliance-tasks/{task_id}', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks/{r['task_ids'][0]}", {})),
+    ('PUT', '/api/businesses/{business_id}/compliance-tasks/{task_id}', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks/{r['task_ids'][0]}", {'json': {'title': 'Renamed'}})),
+    ('DELETE', '/api/businesses/{business_id}/compliance-tasks/{task_id}', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks/{r['task_ids'][0]}", {})),
+    ('POST', '/api/businesses/{business_id}/compliance-tasks:batch-delete', lambda r: (f"/api/businesses/{r['business_id']}/compliance-tasks:batch-delete", {'json': {'ids': r['task_ids']}})),
+    ('POST', '/api/compliance-tasks:batch-status', lambda r: ('/api/compliance-tasks:batch-status', {'json': {'ids': r['task_ids'], 'status': 'Submitted'}})),
+
+    ('GET', '/api/dashboard', lambda r: ('/api/dashboard', {})),
+    ('GET', '/api/export', lambda r: ('/api/export?format=csv', {})),
+    ('GET', '/api/search', lambda r: ('/api/search?q=licence', {})),
+    ('GET', '/api/timeline', lambda r: ('/api/timeline?from=2026-01-01T00:00:00&include_total=true', {})),
+]
+
+
+def test_every_budgeted_route_is_covered():
+    budgeted = {
+        (method, route.path)
+        for route in app.routes if hasattr(getattr(route, 'endpoint', None), 'query_budget')
+        for method in route.methods - {'HEAD'}
+    }
+    assert budgeted == {(method, path) for method, path, _ in CASES}
+
+
+@pytest.mark.parametrize('method, path, build', CASES, ids=[f'{method} {path}' for method, path, _ in CASES])
+def test_route_stays_within_budget(client, credentials, auth_headers, records, method, path, build):
+    url, kwargs = build({**records, 'credentials': credentials})
+
+    response = assert_query_budget(client, method, url, headers=auth_headers, **kwargs)
+
+    assert response.status_code < 400, response.text
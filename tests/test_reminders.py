@@ -0,0 +1,55 @@
+from datetime import datetime, timedelta, timezone
+
+from services.reminders import send_reminders
+
+
+class CollectingSink:
+    def __init__(self):
+        self.digests = []
+
+    async def deliver(self, digest: dict):
+        self.digests.append(digest)
+
+
+def _in_days(days: int) -> str:
+    return (datetime.now(timezone.utc) + timedelta(days=days)).replace(tzinfo=None).isoformat()
+
+
+def _digests_for(client, username, sink):
+    client.portal.call(lambda: send_reminders(windows=[1, 7], sink=sink))
+    return [digest for digest in sink.digests if digest['username'] == username]
+
+
+def test_one_digest_per_user_and_no_repeats(client, credentials, auth_headers, business_id):
+    client.post(f'/api/businesses/{business_id}/licenses', headers=auth_headers, json={
+        'name': 'Trade licence', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': _in_days(3), 'status': 'Valid'
+    })
+    client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'VAT return', 'description': 'Quarterly', 'due_date': _in_days(5)
+    })
+    # Outside every window, and submitted tasks need no reminder
+    client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'Annual audit', 'description': 'Yearly', 'due_date': _in_days(60)
+    })
+    client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'Payroll filing', 'description': 'Monthly', 'due_date': _in_days(2), 'status': 'Submitted'
+    })
+
+    digests = _digests_for(client, credentials['username'], CollectingSink())
+
+    assert len(digests) == 1
+    assert [(reminder['title'], reminder['days_before']) for reminder in digests[0]['reminders']] == [('Trade licence', 7), ('VAT return', 7)]
+    assert _digests_for(client, credentials['username'], CollectingSink()) == []
+
+
+def test_failed_delivery_is_retried(client, credentials, auth_headers, business_id):
+    client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'VAT return', 'description': 'Quarterly', 'due_date': _in_days(3)
+    })
+
+    class FailingSink(CollectingSink):
+        async def deliver(self, digest: dict):
+            raise RuntimeError('mail server down')
+
+    assert _digests_for(client, credentials['username'], FailingSink()) == []
+    assert len(_digests_for(client, credentials['username'], CollectingSink())) == 1
@@ -0,0 +1,53 @@
+import uuid
+
+import pytest
+
+from services.response_cache import response_cache
+
+
+def _license(name='Trade licence'):
+    return {'name': name, 'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2027-06-01T00:00:00', 'status': 'Valid'}
+
+
+def _hits_for(client, url, headers):
+    hits = response_cache.hits
+    response = client.get(url, headers=headers)
+    assert response.status_code == 200, response.text
+    return response_cache.hits - hits, response.json()
+
+
+def test_repeated_list_is_served_from_cache(client, auth_headers, business_id):
+    url = f'/api/businesses/{business_id}/licenses'
+
+    assert _hits_for(client, url, auth_headers)[0] == 0
+    assert _hits_for(client, url, auth_headers)[0] == 1
+
+
+@pytest.mark.parametrize('write', [
+    lambda client, headers, business_id, license_id: client.post(f'/api/businesses/{business_id}/licenses', headers=headers, json=_license('Second')),
+    lambda client, headers, business_id, license_id: client.put(f'/api/businesses/{business_id}/licenses/{license_id}', headers=headers, json=_license('Renamed')),
+    lambda client, headers, business_id, license_id: client.delete(f'/api/businesses/{business_id}/licenses/{license_id}', headers=headers),
+])
+def test_writes_invalidate_the_owners_lists(client, auth_headers, business_id, write):
+    url = f'/api/businesses/{business_id}/licenses'
+    license_id = client.post(url, headers=auth_headers, json=_license()).json()['id']
+    _, before = _hits_for(client, url, auth_headers)
+
+    response = write(client, auth_headers, business_id, license_id)
+    assert response.status_code < 300, response.text
+    hits, after = _hits_for(client, url, auth_headers)
+
+    assert hits == 0
+    assert after != before
+
+
+def test_other_users_writes_keep_the_cache(client, auth_headers, business_id):
+    url = f'/api/businesses/{business_id}/licenses'
+    _hits_for(client, url, auth_headers)
+
+    username = f'user-{uuid.uuid4().hex[:12]}'
+    client.post('/api/auth/register', json={'username': username, 'email': f'{username}@test.com', 'password': 'password123'})
+    token = client.post('/api/auth/login', json={'username': username, 'password': 'password123'}).json()['token']
+    client.post('/api/businesses', headers={'Authorization': f'Bearer {token}'}, json={'name': 'Other', 'cr_number': f'CR{uuid.uuid4().hex[:10]}', 'industry': 'Retail'})
+
+    assert _hits_for(client, url, auth_headers)[0] == 1
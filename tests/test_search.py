@@ -0,0 +1,44 @@
+import uuid
+
+
+def test_search_finds_records_of_every_type(client, auth_headers, business_id):
+    word = f'zq{uuid.uuid4().hex[:8]}'
+    client.post(f'/api/businesses/{business_id}/licenses', headers=auth_headers, json={
+        'name': f'Fire {word} certificate', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2027-06-01T00:00:00', 'status': 'Valid'
+    })
+    client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'Inspection', 'description': f'Book the {word} inspection', 'due_date': '2027-03-01T00:00:00'
+    })
+    client.put(f'/api/businesses/{business_id}', headers=auth_headers, json={'description': f'Sells {word}'})
+
+    response = client.get('/api/search', headers=auth_headers, params={'q': word})
+
+    assert response.status_code == 200, response.text
+    assert sorted(item['record_type'] for item in response.json()['items']) == ['business', 'compliance_task', 'license']
+    assert all(item['business_id'] == business_id for item in response.json()['items'])
+
+
+def test_search_follows_updates_and_deletes(client, auth_headers, business_id):
+    old_word, new_word = f'zq{uuid.uuid4().hex[:8]}', f'zq{uuid.uuid4().hex[:8]}'
+    url = f'/api/businesses/{business_id}/licenses'
+    body = {'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2027-06-01T00:00:00', 'status': 'Valid'}
+    license_id = client.post(url, headers=auth_headers, json={'name': old_word, **body}).json()['id']
+
+    client.put(f'{url}/{license_id}', headers=auth_headers, json={'name': new_word, **body})
+    assert client.get('/api/search', headers=auth_headers, params={'q': old_word}).json()['items'] == []
+    assert len(client.get('/api/search', headers=auth_headers, params={'q': new_word}).json()['items']) == 1
+
+    client.delete(f'{url}/{license_id}', headers=auth_headers)
+    assert client.get('/api/search', headers=auth_headers, params={'q': new_word}).json()['items'] == []
+
+
+def test_search_is_scoped_to_the_user(client, auth_headers, business_id):
+    word = f'zq{uuid.uuid4().hex[:8]}'
+    client.put(f'/api/businesses/{business_id}', headers=auth_headers, json={'description': word})
+
+    username = f'user-{uuid.uuid4().hex[:12]}'
+    client.post('/api/auth/register', json={'username': username, 'email': f'{username}@test.com', 'password': 'password123'})
+    token = client.post('/api/auth/login', json={'username': username, 'password': 'password123'}).json()['token']
+
+    response = client.get('/api/search', headers={'Authorization': f'Bearer {token}'}, params={'q': word})
+    assert response.json()['items'] == []
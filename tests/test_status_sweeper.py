@@ -0,0 +1,30 @@
+from services.status_sweeper import sweep_statuses
+
+
+def test_sweep_expires_licenses_and_marks_pending_tasks_late(client, auth_headers, business_id):
+    licenses_url = f'/api/businesses/{business_id}/licenses'
+    tasks_url = f'/api/businesses/{business_id}/compliance-tasks'
+    expired = client.post(licenses_url, headers=auth_headers, json={
+        'name': 'Lapsed licence', 'issue_date': '2024-01-01T00:00:00', 'expiry_date': '2025-06-01T00:00:00', 'status': 'Valid'
+    }).json()
+    valid = client.post(licenses_url, headers=auth_headers, json={
+        'name': 'Trade licence', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2030-06-01T00:00:00', 'status': 'Valid'
+    }).json()
+    overdue = client.post(tasks_url, headers=auth_headers, json={'title': 'Overdue', 'description': 'x', 'due_date': '2025-06-01T00:00:00'}).json()
+    submitted = client.post(tasks_url, headers=auth_headers, json={
+        'title': 'Filed', 'description': 'x', 'due_date': '2025-06-01T00:00:00', 'status': 'Submitted'
+    }).json()
+    upcoming = client.post(tasks_url, headers=auth_headers, json={'title': 'Upcoming', 'description': 'x', 'due_date': '2030-06-01T00:00:00'}).json()
+    # Cached before the sweep, so the sweep has to drop it
+    client.get(licenses_url, headers=auth_headers)
+
+    counts = client.portal.call(lambda: sweep_statuses(chunk_size=2))
+
+    assert counts['licenses_expired'] >= 1 and counts['tasks_late'] >= 1
+    licenses = {license['id']: license['status'] for license in client.get(licenses_url, headers=auth_headers).json()['items']}
+    tasks = {task['id']: task['status'] for task in client.get(tasks_url, headers=auth_headers).json()['items']}
+    assert licenses == {expired['id']: 'Expired', valid['id']: 'Valid'}
+    assert tasks == {overdue['id']: 'Late', submitted['id']: 'Submitted', upcoming['id']: 'Pending'}
+
+    # Nothing left to change on a second run
+    assert client.portal.call(sweep_statuses) == {'licenses_expired': 0, 'tasks_late': 0}
@@ -0,0 +1,44 @@
+import pytest
+
+
+@pytest.fixture
+def events(client, auth_headers, business_id):
+    client.post(f'/api/businesses/{business_id}/licenses', headers=auth_headers, json={
+        'name': 'Trade licence', 'issue_date': '2025-01-01T00:00:00', 'expiry_date': '2027-06-01T00:00:00', 'status': 'Valid'
+    })
+    client.post(f'/api/businesses/{business_id}/compliance-tasks', headers=auth_headers, json={
+        'title': 'VAT return', 'description': 'Quarterly', 'due_date': '2027-03-01T00:00:00'
+    })
+
+
+@pytest.mark.parametrize('params', [
+    {'to': '2028-01-01T00:00:00'},                                 # Naive to, default (aware) from
+    {'from': '2027-01-01T00:00:00', 'to': '2028-01-01T00:00:00Z'},  # Naive from, aware to
+    {'from': '2027-01-01T00:00:00+03:00', 'to': '2028-01-01T00:00:00'},  # Aware from, naive to
+    {'from': '2027-01-01T00:00:00', 'to': '2028-01-01T00:00:00'},   # Both naive
+])
+def test_naive_and_aware_bounds(client, auth_headers, events, params):
+    response = client.get('/api/timeline', headers=auth_headers, params=params)
+
+    assert response.status_code == 200, response.text
+    assert [item['event_type'] for item in response.json()['items']] == ['task_due', 'license_expiry']
+
+
+def test_naive_bounds_are_utc(client, auth_headers, events):
+    # The task is due 2027-03-01T00:00 UTC, and 02:00+03:00 is 23:00 UTC the day before
+    response = client.get('/api/timeline', headers=auth_headers, params={
+        'from': '2027-01-01T00:00:00', 'to': '2027-03-01T02:00:00+03:00'
+    })
+
+    assert response.status_code == 200, response.text
+    assert response.json()['items'] == []
+
+
+def test_to_must_follow_from_across_offsets(client, auth_headers):
+    # The same instant written naive (UTC) and with an offset
+    response = client.get('/api/timeline', headers=auth_headers, params={
+        'from': '2027-01-01T00:00:00', 'to': '2027-01-01T03:00:00+03:00'
+    })
+
+    assert response.status_code == 400
+    assert response.json()['detail'] == 'to must be after from'